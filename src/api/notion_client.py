@@ -1,9 +1,46 @@
 # src/api/notion_client.py
 
+import logging
 from pathlib import Path
-from notion_client import APIResponseError
-from dateutil import parser as date_parser
-from src.utils.config import notion_client, logger, BASE_DOCKER_PATH, BASE_LOCAL_PATH
+from src.utils.text_processing import parse_application_deadline
+from src.core.artifacts import artifact_url
+from src.utils.circuit_breaker import circuit_breaker
+from src.utils.config import notion_client, BASE_DOCKER_PATH, BASE_LOCAL_PATH, ARTIFACT_BASE_URL
+from src.utils.deadline import check_deadline
+
+logger = logging.getLogger(__name__)
+
+
+def is_notion_outage(error: BaseException) -> bool:
+    """Return True for Notion server errors, timeouts and connection failures, but not for bad requests."""
+    status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status >= 500
+    return type(error).__name__ == 'RequestTimeoutError' or type(error).__module__.startswith('httpx')
+
+
+def _notion_call(method, **kwargs):
+    """
+    Call a Notion client method under the request deadline and the 'notion' circuit breaker.
+
+    Each HTTP request the method sends (retries included) is given NOTION_TIMEOUT or
+    the time left before the deadline, whichever is shorter, by the client's request
+    hook (see `deadline_request_hook`).
+
+    Args:
+        method: The bound client method, e.g. `notion_client.pages.update`.
+        **kwargs: Arguments for the method.
+
+    Returns:
+        The method's response.
+
+    Raises:
+        DeadlineExceeded: If the request deadline has already passed.
+        CircuitOpenError: If Notion has been failing and its breaker is open.
+    """
+    check_deadline()
+    with circuit_breaker('notion').guard(is_notion_outage):
+        return method(**kwargs)
 
 
 def docker_to_local_path(docker_path: str,
@@ -32,7 +69,8 @@ def update_notion_database(page_id, job_details, folder_path, doc_path, pdf_path
     """
     Updates a Notion database page with job details and local file paths.
     This version uses pathlib for cross-platform path handling and converts
-    Docker paths to local paths in a more robust way.
+    Docker paths to local paths in a more robust way. When ARTIFACT_BASE_URL is
+    set, the Word and PDF links point at the server's /artifacts downloads instead.
 
     Args:
         page_id (str): The ID of the Notion page to update.
@@ -55,6 +93,10 @@ def update_notion_database(page_id, job_details, folder_path, doc_path, pdf_path
     folder_uri = local_folder_path.resolve().as_uri()
     doc_uri = local_doc_path.resolve().as_uri()
     pdf_uri = local_pdf_path.resolve().as_uri()
+    if ARTIFACT_BASE_URL:
+        # Download links served by the webhook server work from any machine
+        doc_uri = artifact_url(ARTIFACT_BASE_URL, page_id, 'docx')
+        pdf_uri = artifact_url(ARTIFACT_BASE_URL, page_id, 'pdf')
 
     logger.info(f"Setting Job URL in Notion to: {job_details['Job URL']}")
 
@@ -109,28 +151,30 @@ def update_notion_database(page_id, job_details, folder_path, doc_path, pdf_path
     # Handle optional Application Deadline field
     application_deadline = job_details.get("Application Deadline", "N/A")
     if application_deadline != "N/A":
-        try:
-            deadline_date = date_parser.parse(application_deadline).date()
+        deadline_date = parse_application_deadline(application_deadline)
+        if deadline_date:
             properties["Application Deadline"] = {
                 "type": "date",
                 "date": {"start": deadline_date.isoformat()}
             }
-        except ValueError:
-            print(
-                f"Warning: Could not parse Application Deadline as date: {application_deadline}. "
+        else:
+            logger.warning(
+                f"Could not parse Application Deadline as date: {application_deadline}. "
                 "Omitting this field."
             )
     else:
-        print("Application Deadline not provided or set to 'N/A'. Omitting this field.")
+        logger.debug("Application Deadline not provided or set to 'N/A'. Omitting this field.")
+
+    from notion_client import APIResponseError
 
     # Attempt to update the Notion page with the constructed properties
     try:
-        notion_client.pages.update(page_id=page_id, properties=properties)
+        _notion_call(notion_client.pages.update, page_id=page_id, properties=properties)
     except APIResponseError as e:
-        print(f"Notion API Error: {e.code} - {e.message}")
+        logger.error(f"Notion API Error: {e.code} - {e.message}")
         raise
     except Exception as e:
-        print(f"Error updating Notion: {str(e)}")
+        logger.error(f"Error updating Notion: {str(e)}")
         raise
 
 def is_page_archived(page_id):
@@ -146,9 +190,11 @@ def is_page_archived(page_id):
     Raises:
         Exception: If the page is not found or another API error occurs.
     """
+    from notion_client import APIResponseError
+
     try:
         # Attempt to retrieve the page details from Notion using the page ID
-        page = notion_client.pages.retrieve(page_id=page_id)
+        page = _notion_call(notion_client.pages.retrieve, page_id=page_id)
         # Return the 'archived' status of the page, defaulting to False if not found
         return page.get('archived', False)
     except APIResponseError as e:
@@ -167,12 +213,93 @@ def unarchive_page(page_id):
     Raises:
         Exception: If there is a permission error or another API error occurs.
     """
+    from notion_client import APIResponseError
+
     try:
         # Attempt to update the page's 'archived' status to False (unarchive)
-        notion_client.pages.update(page_id=page_id, archived=False)
+        _notion_call(notion_client.pages.update, page_id=page_id, archived=False)
     except APIResponseError as e:
         # Handle permission errors specifically
         if e.code == 'permission_error':
             raise Exception(f"You don't have permission to unarchive page {page_id}")
         else:
-            raise
\ No newline at end of file
+            raise
+
+def query_changed_pages(database_id, since=None, page_size=100):
+    """
+    Yield pages of a Notion database edited at or after a timestamp, oldest first.
+
+    Pages that already have a generated PDF are filtered out by the query, so
+    the pipeline's own updates to a row do not make it come back as changed.
+    Results are fetched `page_size` rows at a time using Notion's cursor
+    pagination.
+
+    Args:
+        database_id (str): The ID of the Notion jobs database.
+        since (str, optional): ISO 8601 timestamp; only pages with a
+            last_edited_time on or after it are returned. None returns all pages.
+        page_size (int): Rows per request (Notion allows at most 100).
+
+    Yields:
+        dict: Notion page objects, in ascending last_edited_time order.
+
+    Raises:
+        APIResponseError: If there is an error response from the Notion API.
+    """
+    conditions = [{"property": "PDF Document", "url": {"is_empty": True}}]
+    if since:
+        conditions.append({"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}})
+    query = {
+        "database_id": database_id,
+        "filter": {"and": conditions},
+        "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+        "page_size": page_size,
+    }
+    while True:
+        response = _notion_call(notion_client.databases.query, **query)
+        yield from response.get("results", [])
+        if not response.get("has_more"):
+            return
+        query["start_cursor"] = response["next_cursor"]
+
+def get_page_job_url(page):
+    """
+    Return the job posting URL stored in a Notion page's "Job URL" property.
+
+    Args:
+        page (dict): A Notion page object.
+
+    Returns:
+        str: The URL, or '' if the property is missing or empty.
+    """
+    return (page.get("properties", {}).get("Job URL") or {}).get("url") or ""
+
+
+def get_page_priority(page):
+    """
+    Return the value of a Notion page's "Priority" property.
+
+    Args:
+        page (dict): A Notion page object.
+
+    Returns:
+        The select option name (e.g. 'High'), the number, or None if unset.
+    """
+    prop = page.get("properties", {}).get("Priority") or {}
+    if prop.get("type") == "number":
+        return prop.get("number")
+    return (prop.get("select") or {}).get("name")
+
+
+def get_page_deadline(page):
+    """
+    Return the date in a Notion page's "Application Deadline" property.
+
+    Args:
+        page (dict): A Notion page object.
+
+    Returns:
+        datetime.date: The deadline, or None if the property is missing or empty.
+    """
+    prop = page.get("properties", {}).get("Application Deadline") or {}
+    return parse_application_deadline((prop.get("date") or {}).get("start"))
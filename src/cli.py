@@ -0,0 +1,189 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from typing import Optional
+from src.core.job_store import JobStore
+from src.core.model_server import ModelServer, parse_address
+from src.core.pipeline import DEFAULT_CONCURRENCY, STAGES, CheckpointLog, parse_job_lines, run_pipeline
+from src.core.poller import CursorStore, poll_once, run_poller
+from src.utils.config import (
+    configure_logging, tokenizer, model, JOB_STORE_PATH, NOTION_DATABASE_ID, POLL_INTERVAL,
+    MODEL_SERVER_ADDRESS, MODEL_SERVER_AUTHKEY, MODEL_BATCH_SIZE, MODEL_BATCH_WAIT_MS
+)
+
+logger = logging.getLogger(__name__)
+
+# Socket the model server listens on when neither --address nor MODEL_SERVER_ADDRESS is given
+DEFAULT_MODEL_SOCKET = os.path.join(tempfile.gettempdir(), 'jobglider-model.sock')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the command-line interface."""
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description='JobGlider command-line tools.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    bulk = subparsers.add_parser(
+        'bulk',
+        help='Process many job postings through the full pipeline.',
+        description='Read "<url> [<notion page id>]" lines and run extract, generate, '
+                    'save and Notion update for each, resuming from a checkpoint log.',
+    )
+    bulk.add_argument('input', nargs='?', default='-',
+                      help='File of job lines, or "-" (the default) to read standard input.')
+    bulk.add_argument('--checkpoint', default='bulk_checkpoint.jsonl',
+                      help='Checkpoint log used to resume an interrupted run (default: %(default)s).')
+    add_worker_arguments(bulk)
+
+    poll = subparsers.add_parser(
+        'poll',
+        help='Process new or changed rows of the Notion jobs database.',
+        description='Query the Notion jobs database for rows edited since the saved cursor '
+                    'and run them through the pipeline in batches.',
+    )
+    poll.add_argument('--database-id', default=NOTION_DATABASE_ID,
+                      help='Notion jobs database ID (default: $NOTION_DATABASE_ID).')
+    poll.add_argument('--cursor-file', default='notion_cursor.json',
+                      help='File holding the durable poll cursor (default: %(default)s).')
+    poll.add_argument('--checkpoint', default='poll_checkpoint.jsonl',
+                      help='Pipeline checkpoint log (default: %(default)s).')
+    poll.add_argument('--batch-size', type=int, default=20,
+                      help='Rows sent to the pipeline at a time (default: %(default)s).')
+    poll.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                      help='Seconds between polls (default: %(default)s).')
+    poll.add_argument('--once', action='store_true', help='Poll once and exit.')
+    add_worker_arguments(poll)
+
+    serve_model = subparsers.add_parser(
+        'serve-model',
+        help='Serve the local model to every worker process from one process.',
+        description='Load the local tokenizer and model once and answer questions from web and '
+                    'pipeline workers over a local socket, batching concurrent requests.',
+    )
+    serve_model.add_argument('--address', default=MODEL_SERVER_ADDRESS or DEFAULT_MODEL_SOCKET,
+                             help='Unix socket path or host:port to listen on (default: $MODEL_SERVER_ADDRESS, '
+                                  'else %(default)s).')
+    serve_model.add_argument('--batch-size', type=int, default=MODEL_BATCH_SIZE,
+                             help='Most questions answered in one forward pass (default: %(default)s).')
+    serve_model.add_argument('--batch-wait-ms', type=float, default=MODEL_BATCH_WAIT_MS,
+                             help='Milliseconds to wait for a batch to fill (default: %(default)s).')
+    return parser
+
+
+def add_worker_arguments(parser: argparse.ArgumentParser):
+    """Add the job store option and a --<stage>-workers option for every pipeline stage."""
+    parser.add_argument('--job-store', default=JOB_STORE_PATH,
+                        help='SQLite store of processed postings, reused across runs (default: $JOB_STORE_PATH).')
+    parser.add_argument('--no-job-store', action='store_true',
+                        help='Neither reuse nor record work in the job store.')
+    for stage in STAGES:
+        parser.add_argument(f'--{stage}-workers', type=int, default=DEFAULT_CONCURRENCY[stage],
+                            help=f'Parallel workers for the {stage} stage (default: %(default)s).')
+
+
+def stage_concurrency(args) -> dict:
+    """Return the per-stage worker counts from parsed arguments."""
+    return {stage: getattr(args, f'{stage}_workers') for stage in STAGES}
+
+
+def open_job_store(args) -> Optional[JobStore]:
+    """Return the job store selected by the parsed arguments, or None if disabled."""
+    return None if args.no_job_store else JobStore(args.job_store)
+
+
+def run_bulk(args) -> int:
+    """
+    Run the bulk command.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code; 1 if any job failed.
+    """
+    if args.input == '-':
+        jobs = parse_job_lines(sys.stdin)
+    else:
+        with open(args.input, encoding='utf-8') as f:
+            jobs = parse_job_lines(f)
+
+    concurrency = stage_concurrency(args)
+    logger.info(f"Processing {len(jobs)} jobs with concurrency {concurrency}")
+    results = run_pipeline(jobs, concurrency, CheckpointLog(args.checkpoint), open_job_store(args))
+
+    failed = [job for job in results if job.error]
+    print(f"Completed {len(results) - len(failed)} of {len(results)} jobs.")
+    for job in failed:
+        print(f"FAILED {job.key}: {job.error}")
+    return 1 if failed else 0
+
+
+def run_poll(args) -> int:
+    """
+    Run the poll command.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code; with --once, 1 if any job failed.
+    """
+    if not args.database_id:
+        print("A Notion database ID is required (--database-id or NOTION_DATABASE_ID).", file=sys.stderr)
+        return 2
+    options = {
+        'batch_size': args.batch_size,
+        'concurrency': stage_concurrency(args),
+        'checkpoint': CheckpointLog(args.checkpoint),
+        'store': open_job_store(args),
+    }
+    cursor = CursorStore(args.cursor_file)
+    if not args.once:
+        run_poller(args.database_id, cursor, args.interval, **options)
+        return 0
+    results = poll_once(args.database_id, cursor, **options)
+    failed = [job for job in results if job.error]
+    print(f"Completed {len(results) - len(failed)} of {len(results)} jobs.")
+    return 1 if failed else 0
+
+
+def run_serve_model(args) -> int:
+    """
+    Run the serve-model command until interrupted.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        int: The process exit code.
+    """
+    if tokenizer is None or model is None:
+        print("The local model is not available in this environment.", file=sys.stderr)
+        return 2
+    server = ModelServer(parse_address(args.address), tokenizer, model, max_batch=args.batch_size,
+                         max_wait=args.batch_wait_ms / 1000, authkey=MODEL_SERVER_AUTHKEY.encode() or None)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def main(argv=None) -> int:
+    """Entry point for `python -m src.cli`."""
+    args = build_parser().parse_args(argv)
+    configure_logging()
+    if args.command == 'bulk':
+        return run_bulk(args)
+    if args.command == 'poll':
+        return run_poll(args)
+    if args.command == 'serve-model':
+        return run_serve_model(args)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
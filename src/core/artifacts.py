@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from src.utils.config import ARTIFACT_CACHE_BYTES
+
+# Downloadable artifact kinds: file name in the cover letter folder and MIME type
+ARTIFACT_KINDS = {
+    'pdf': ('cover_letter.pdf', 'application/pdf'),
+    'docx': ('cover_letter.docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    'tex': ('cover_letter.tex', 'application/x-tex'),
+    'details': ('job_details.txt', 'text/plain'),
+}
+
+
+class Artifact(NamedTuple):
+    """One rendered file, ready to serve."""
+    data: bytes
+    etag: str
+    filename: str
+    mimetype: str
+
+
+def make_artifact(kind: str, data: bytes) -> Artifact:
+    """
+    Wrap an artifact's bytes with the metadata needed to serve it.
+
+    Args:
+        kind (str): One of ARTIFACT_KINDS.
+        data (bytes): The file contents.
+
+    Returns:
+        Artifact: The artifact, with a content hash as its ETag.
+    """
+    filename, mimetype = ARTIFACT_KINDS[kind]
+    return Artifact(data, hashlib.sha256(data).hexdigest(), filename, mimetype)
+
+
+class ArtifactCache:
+    """
+    Thread-safe, size-bounded LRU cache of rendered artifacts keyed by job.
+
+    Jobs are evicted least-recently-used first once the cached bytes exceed
+    `max_bytes`; evicted artifacts can still be read from the published folder.
+    """
+
+    def __init__(self, max_bytes: int = ARTIFACT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._size = 0
+
+    def put(self, job_id: str, files: Dict[str, bytes]):
+        """
+        Cache a job's rendered files.
+
+        Args:
+            job_id (str): The job identifier (its Notion page ID).
+            files (Dict[str, bytes]): File contents keyed by file name, as
+                                      returned by `render_cover_letter_documents`.
+        """
+        artifacts = {
+            kind: make_artifact(kind, files[filename])
+            for kind, (filename, _) in ARTIFACT_KINDS.items() if filename in files
+        }
+        size = sum(len(artifact.data) for artifact in artifacts.values())
+        with self._lock:
+            if job_id in self._jobs:
+                self._size -= self._jobs.pop(job_id)[1]
+            self._jobs[job_id] = (artifacts, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._jobs) > 1:
+                _, (_, evicted_size) = self._jobs.popitem(last=False)
+                self._size -= evicted_size
+
+    def get(self, job_id: str, kind: str) -> Optional[Artifact]:
+        """Return a cached artifact and mark its job as recently used, or None."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return None
+            self._jobs.move_to_end(job_id)
+            return entry[0].get(kind)
+
+    def clear(self):
+        """Drop every cached job."""
+        with self._lock:
+            self._jobs.clear()
+            self._size = 0
+
+
+def load_artifact(folder_path: str, kind: str) -> Optional[Artifact]:
+    """
+    Read an artifact from a published cover letter folder.
+
+    Args:
+        folder_path (str): The cover letter folder.
+        kind (str): One of ARTIFACT_KINDS.
+
+    Returns:
+        Optional[Artifact]: The artifact, or None if the file does not exist.
+    """
+    path = os.path.join(folder_path, ARTIFACT_KINDS[kind][0])
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        return make_artifact(kind, f.read())
+
+
+def artifact_url(base_url: str, job_id: str, kind: str) -> str:
+    """Return the download URL of a job's artifact under the server's base URL."""
+    return f"{base_url.rstrip('/')}/artifacts/{job_id}/{kind}"
+
+
+# Process-wide cache filled by the webhook server
+artifact_cache = ArtifactCache()
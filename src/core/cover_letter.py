@@ -1,8 +1,18 @@
-import json
-from datetime import datetime
-from src.utils.config import openai_client, logger
+import logging
+import re
+from src.utils.config import openai_client, COVER_LETTER_MODEL_TIERS, CANDIDATE_PROFILE_PATH
+from src.core.model_router import route_completion
+from src.core.prompts import build_cover_letter_messages
 
-def generate_cover_letter(job_details):
+logger = logging.getLogger(__name__)
+
+# Longest letter accepted from a cheaper model tier before escalating
+MAX_COVER_LETTER_WORDS = 450
+
+# Unfilled template placeholders, e.g. "[Your Name]" or "[Company Name]"
+PLACEHOLDER_PATTERN = re.compile(r'\[[A-Z][A-Za-z ]*\]')
+
+def generate_cover_letter(job_details, profile_path=CANDIDATE_PROFILE_PATH):
     """
     Generate a concise and professional cover letter based on the provided job details.
 
@@ -10,57 +20,43 @@ def generate_cover_letter(job_details):
         job_details (dict): A dictionary containing job-related information such as 
                             'Job Title', 'Company', 'Location', 'Experience Level', 
                             'Application Deadline', and 'Salary Range'.
+        profile_path (str): The candidate profile to write the letter for.
 
     Returns:
         str: A string representing the generated cover letter.
     """
-    # Add these print statements at the beginning of the function
-    print("Debug: job_details passed to generate_cover_letter:")
-    print(json.dumps(job_details, indent=2))
-    logger.info(f"Debug: job_details passed to generate_cover_letter: {json.dumps(job_details, indent=2)}")
-
-    current_date = datetime.now().strftime('%B %d, %Y')
-    
-    prompt = f"""
-    Generate a very concise and professional cover letter for the following job:
-
-    Job Title: {job_details.get('Job Title', 'Unknown Position')}
-    Company: {job_details.get('Company', 'Unknown Company')}
-    Location: {job_details.get('Location', 'N/A')}
-    Experience Level: {job_details.get('Experience Level', 'N/A')}
-    Application Deadline: {job_details.get('Application Deadline', 'N/A')}
-    Salary Range: {job_details.get('Salary Range', 'N/A')}
-
-    Candidate's information:
-    Dr. David Leather is an Assistant Professor of Real Estate and Finance at Chapman University's Argyros School of Business and Economics. He holds a Ph.D. in Economics from the University of North Carolina at Chapel Hill, with concentrations in Macroeconomics and Finance. His research interests include Real Estate, Asset Pricing, Monetary Policy, and Macroeconomics. Dr. Leather has strong technical skills in programming, econometrics, and financial modeling, and has published research on land use uncertainty, real estate prices, and housing affordability.
-
-    Guidelines:
-    1. Do not include a saultation or header. Start with the body.
-    2. Maintain a business professional tone throughout the letter.
-    3. Highlight the candidate's relevant experience and skills that match the job requirements.
-    4. Keep the letter concise, focusing on the most important qualifications.
-    5. Demonstrate enthusiasm for the position and the company.
-    6. Conclude with a call to action, expressing interest in an interview.
-    7. Use varied sentence structures and avoid repetitive phrasing to create a more engaging letter.
-    8. Be as concise as possible, while maintaining relevant details.
-    9. Use the phrase "conducted extensive research" instead of "published" when referring to research.
+    logger.info(f"Generating cover letter for {job_details.get('Job Title')} at {job_details.get('Company')}")
+    logger.debug("Cover letter job details", extra={'job_details': job_details})
+
+    def parse(response):
+        # Extract the cover letter text from the response and clean it
+        cover_letter = response.choices[0].message.content.strip()
+        # Remove any extraneous text or formatting
+        return cover_letter.split("```")[0].strip()
+
+    return route_completion(
+        openai_client, 'cover_letter', COVER_LETTER_MODEL_TIERS,
+        messages=build_cover_letter_messages(job_details, profile_path),
+        parse=parse,
+        validate=is_acceptable_cover_letter,
+        max_tokens=4000
+    )
 
-    The cover letter should be 1-3 short paragraphs total.
+def is_acceptable_cover_letter(cover_letter):
     """
+    Check whether a generated cover letter is good enough to skip a stronger model.
 
-    response = openai_client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a professional cover letter writer with expertise in academic and business writing."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=4000
-    )
+    A letter passes when it is non-empty, at most three paragraphs and
+    MAX_COVER_LETTER_WORDS words, and contains no unfilled template
+    placeholders such as "[Company Name]".
 
-    # Extract the cover letter text from the response and clean it
-    cover_letter = response.choices[0].message.content.strip()
-    
-    # Remove any extraneous text or formatting
-    cover_letter = cover_letter.split("```")[0].strip()
+    Args:
+        cover_letter (str): The generated cover letter text.
 
-    return cover_letter
\ No newline at end of file
+    Returns:
+        bool: True if the letter is acceptable.
+    """
+    if not cover_letter or PLACEHOLDER_PATTERN.search(cover_letter):
+        return False
+    paragraphs = [p for p in cover_letter.split('\n\n') if p.strip()]
+    return len(paragraphs) <= 3 and len(cover_letter.split()) <= MAX_COVER_LETTER_WORDS
@@ -1,25 +1,50 @@
 # src/core/document_handler.py
+import io
+import logging
 import os
+import shutil
+import tempfile
 from datetime import datetime
-from docx import Document
-from jinja2 import Environment, FileSystemLoader
 from src.utils.text_processing import escape_latex
-from PyPDF2 import PdfReader
 import subprocess
-from src.utils.config import BASE_DOCKER_PATH, COVER_LETTERS_DIR, logger
+from src.utils.config import (
+    BASE_DOCKER_PATH, COVER_LETTERS_DIR, CANDIDATE_PROFILE_PATH, ARTIFACT_SCRATCH_DIR, COVER_LETTER_TEMPLATE
+)
+from src.core.draft_renderer import render_draft_pdf
+from src.core.document_templates import get_document_template, new_word_document
+from src.core.latex_compiler import latex_compiler
+from src.core.prompts import load_candidate_profile
+from src.utils.metrics import metrics
 
-def save_cover_letter_documents(job_details, cover_letter):
+logger = logging.getLogger(__name__)
+
+# Candidate profile fields used in the awesome-cv letterhead
+LETTERHEAD_FIELDS = ['first_name', 'last_name', 'position', 'address', 'phone', 'email', 'website', 'github', 'linkedin']
+
+# Files copied to the synced cover letter folder; xelatex's .aux/.log/.out stay in scratch
+PUBLISHED_ARTIFACTS = ['cover_letter.docx', 'cover_letter.tex', 'cover_letter.pdf', 'job_details.txt']
+
+def save_cover_letter_documents(job_details, cover_letter, profile_path=CANDIDATE_PROFILE_PATH, artifacts=None,
+                                template_name=COVER_LETTER_TEMPLATE, draft=False):
     """
     Save the cover letter and job details in multiple formats and locations.
 
     This function creates a directory named after the company, job title, and current timestamp.
     It saves the cover letter as a Word document, a LaTeX document, and a PDF. It also saves
     the job details in a text file within the created directory.
+    The documents are rendered in memory (see `render_cover_letter_documents`) and only the
+    finished PUBLISHED_ARTIFACTS are moved into COVER_LETTERS_DIR (see `publish_artifacts`),
+    so the synced folder never sees LaTeX intermediates or half-written files.
 
     Args:
         job_details (dict): A dictionary containing job-related information such as 'Company',
                             'Job Title', and 'Location'.
         cover_letter (str): The content of the cover letter to be saved.
+        profile_path (str): The candidate profile providing the letterhead fields.
+        artifacts (Optional[dict]): If given, filled with the rendered files' bytes by
+                                    file name, so callers can serve them from memory.
+        template_name (str): The cover letter template (see `document_templates`).
+        draft (bool): Render a quick draft PDF without LaTeX (see `render_cover_letter_documents`).
 
     Returns:
         tuple: A tuple containing the paths to the created directory, Word document, and PDF.
@@ -28,73 +53,97 @@ def save_cover_letter_documents(job_details, cover_letter):
     job_title = job_details.get('Job Title', 'Unknown Position').replace(' ', '_')
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     folder_name = f"{company_name}_{job_title}_{timestamp}"
-   
-    docker_folder_path = os.path.join(COVER_LETTERS_DIR, folder_name)
-    os.makedirs(docker_folder_path, exist_ok=True)  
-   
-    logger.info(f"Creating folder: {docker_folder_path}")
+
+    rendered = render_cover_letter_documents(job_details, cover_letter, profile_path, template_name, draft)
+    if artifacts is not None:
+        artifacts.update(rendered)
+    docker_folder_path = publish_artifacts(rendered, os.path.join(COVER_LETTERS_DIR, folder_name))
+
     doc_path = os.path.join(docker_folder_path, "cover_letter.docx")
-    tex_path = os.path.join(docker_folder_path, "cover_letter.tex")
     pdf_path = os.path.join(docker_folder_path, "cover_letter.pdf")
+    return docker_folder_path, doc_path, pdf_path
+
+def render_cover_letter_documents(job_details, cover_letter, profile_path=CANDIDATE_PROFILE_PATH,
+                                  template_name=COVER_LETTER_TEMPLATE, draft=False):
+    """
+    Render the cover letter documents and return their contents in memory.
+
+    xelatex needs a working directory, so the files are built in a scratch directory
+    under ARTIFACT_SCRATCH_DIR (tmpfs when available), read back and the directory removed.
+    A draft skips LaTeX: the PDF is laid out in memory by `render_draft_pdf` with the same
+    letterhead fields, in milliseconds, and no .tex is produced.
+
+    Args:
+        job_details (dict): The job details.
+        cover_letter (str): The cover letter text.
+        profile_path (str): The candidate profile providing the letterhead fields.
+        template_name (str): The cover letter template (see `document_templates`).
+        draft (bool): Render a draft PDF without LaTeX.
+
+    Returns:
+        Dict[str, bytes]: The contents of each of the PUBLISHED_ARTIFACTS that was produced,
+                          keyed by file name.
+    """
+    template = get_document_template(template_name)
+    if draft:
+        return _render_draft_documents(job_details, cover_letter, profile_path, template)
+    build_dir = tempfile.mkdtemp(prefix="cover_letter_", dir=ARTIFACT_SCRATCH_DIR)
+    try:
+        _build_cover_letter_documents(build_dir, job_details, cover_letter, profile_path, template)
+        rendered = {}
+        for name in PUBLISHED_ARTIFACTS:
+            path = os.path.join(build_dir, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    rendered[name] = f.read()
+        return rendered
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+def _build_cover_letter_documents(docker_folder_path, job_details, cover_letter, profile_path, template):
+    """
+    Write the Word document, LaTeX source, PDF and job details into a build directory.
+
+    Args:
+        docker_folder_path (str): The (scratch) directory to build in.
+        job_details (dict): The job details.
+        cover_letter (str): The cover letter text.
+        profile_path (str): The candidate profile providing the letterhead fields.
+        template (DocumentTemplate): The compiled cover letter template.
+
+    Returns:
+        str: The build directory.
+    """
+    logger.info(f"Building documents in: {docker_folder_path}")
+    doc_path = os.path.join(docker_folder_path, "cover_letter.docx")
+    tex_path = os.path.join(docker_folder_path, "cover_letter.tex")
     
     # Save as Word document
-    doc = Document()
+    doc = new_word_document(template)
     doc.add_paragraph(cover_letter)
     doc.save(doc_path)
    
     logger.info(f"Saved Word document: {doc_path}")
     
-    # Create LaTeX document using Jinja2 template
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'templates', 'latex')
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template('awesome_cv_cover_letter_template.tex')
-   
-    logger.info(f"Loaded LaTeX template: awesome_cv_cover_letter_template.tex")
+    # Create LaTeX document using the compiled Jinja2 template
+    logger.info(f"Using cover letter template: {template.name}")
     
-    context = {
-        'first_name': escape_latex('David'),
-        'last_name': escape_latex('Leather'),
-        'position': escape_latex('Assistant Professor of Real Estate and Finance'),
-        'address': escape_latex('1 University Drive, Orange, CA 92866'),
-        'phone': escape_latex('(+1) 508-648-6628'),
-        'email': escape_latex('david.a.leather@gmail.com'),
-        'website': escape_latex('www.daveleather.com'),
-        'github': escape_latex('dleather'),
-        'linkedin': escape_latex('dleather'),
-        'recipient': escape_latex('Hiring Committee'),
-        'date': escape_latex(datetime.now().strftime('%B %d, %Y')),
-        'job_title': escape_latex(f"Job Application for {job_details.get('Job Title', 'N/A')}"),
-        'opening': escape_latex('Dear Hiring Committee,'),
-        'cover_letter_content': escape_latex(cover_letter)
-    }
-
-    # Only add company_address if both Company and Location are available
-    company = job_details.get('Company', '').strip()
-    location = job_details.get('Location', '').strip()
-    if company and location:
-        context['company_address'] = escape_latex(f"{company}\\\\{location}")
-    elif company:
-        context['company_address'] = escape_latex(company)
-    elif location:
-        context['company_address'] = escape_latex(location)
+    fields = cover_letter_fields(job_details, cover_letter, profile_path)
+    company_address_lines = fields.pop('company_address_lines')
+    context = {field: escape_latex(value) for field, value in fields.items()}
+    # Only add company_address if Company or Location is available
+    if company_address_lines:
+        context['company_address'] = escape_latex("\\\\".join(company_address_lines))
     
-    logger.info(f"Defined content")
-    rendered_tex = template.render(context)
-   
-    logger.info(f"Rendered context")
+    rendered_tex = template.latex.render(context)
+
     with open(tex_path, 'w') as f:
         f.write(rendered_tex)
     
-    # Compile LaTeX to PDF
+    # Compile LaTeX to PDF on the shared worker pool; the template directory supplies its document class
     try:
-        result = subprocess.run(
-            ['xelatex', '-output-directory', docker_folder_path, tex_path],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        logger.info(f"LaTeX compilation output:\n{result.stdout}")
+        result = latex_compiler.compile(tex_path, docker_folder_path, texinputs=template.directory)
+        logger.debug("LaTeX compilation output", extra={'stdout': result.stdout})
     except subprocess.CalledProcessError as e:
         logger.error(f"LaTeX compilation error:\nStdout: {e.stdout}\nStderr: {e.stderr}")
         raise
@@ -102,12 +151,100 @@ def save_cover_letter_documents(job_details, cover_letter):
     # Save job details
     job_details_path = os.path.join(docker_folder_path, "job_details.txt")
     with open(job_details_path, 'w') as f:
-        for key, value in job_details.items():
-            f.write(f"{key}: {escape_latex(str(value))}\n")
+        f.write(_job_details_text(job_details))
    
     logger.info(f"Saved job details: {job_details_path}")
     
-    return docker_folder_path, doc_path, pdf_path
+    return docker_folder_path
+
+def cover_letter_fields(job_details, cover_letter, profile_path=CANDIDATE_PROFILE_PATH):
+    """
+    Return the letterhead and letter fields shared by the LaTeX and draft renderers.
+
+    Args:
+        job_details (dict): The job details.
+        cover_letter (str): The cover letter text.
+        profile_path (str): The candidate profile providing the letterhead fields.
+
+    Returns:
+        dict: The LETTERHEAD_FIELDS plus recipient, date, job_title, opening,
+              cover_letter_content and company_address_lines, all unescaped.
+    """
+    profile = load_candidate_profile(profile_path)
+    fields = {field: profile[field] for field in LETTERHEAD_FIELDS}
+    company = job_details.get('Company', '').strip()
+    location = job_details.get('Location', '').strip()
+    fields.update({
+        'recipient': 'Hiring Committee',
+        'date': datetime.now().strftime('%B %d, %Y'),
+        'job_title': f"Job Application for {job_details.get('Job Title', 'N/A')}",
+        'opening': 'Dear Hiring Committee,',
+        'cover_letter_content': cover_letter,
+        'company_address_lines': [line for line in (company, location) if line],
+    })
+    return fields
+
+def _render_draft_documents(job_details, cover_letter, profile_path, template):
+    """
+    Render a draft entirely in memory: Word document, pure-Python PDF and job details.
+
+    Args:
+        job_details (dict): The job details.
+        cover_letter (str): The cover letter text.
+        profile_path (str): The candidate profile providing the letterhead fields.
+        template (DocumentTemplate): The template supplying the Word base document.
+
+    Returns:
+        Dict[str, bytes]: The documents keyed by file name.
+    """
+    doc = new_word_document(template)
+    doc.add_paragraph(cover_letter)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    with metrics.timer('documents.draft_pdf'):
+        pdf = render_draft_pdf(cover_letter_fields(job_details, cover_letter, profile_path))
+    return {
+        'cover_letter.docx': buffer.getvalue(),
+        'cover_letter.pdf': pdf,
+        'job_details.txt': _job_details_text(job_details).encode('utf-8'),
+    }
+
+def _job_details_text(job_details):
+    """Return the job details as the `Key: value` lines of job_details.txt."""
+    return ''.join(f"{key}: {escape_latex(str(value))}\n" for key, value in job_details.items())
+
+def publish_artifacts(artifacts, folder_path):
+    """
+    Write rendered artifacts into the synced output folder in one step.
+
+    The files are written into a hidden staging directory next to the destination,
+    which is then renamed into place, so sync clients only ever see a complete
+    folder. If the destination already exists, a numeric suffix is added.
+
+    Args:
+        artifacts (Dict[str, bytes]): File contents keyed by file name.
+        folder_path (str): The destination folder.
+
+    Returns:
+        str: The folder the artifacts were published to.
+    """
+    parent, name = os.path.split(folder_path)
+    os.makedirs(parent, exist_ok=True)
+    staging_path = tempfile.mkdtemp(prefix=f".{name}.", suffix='.partial', dir=parent)
+    try:
+        for artifact, content in artifacts.items():
+            with open(os.path.join(staging_path, artifact), 'wb') as f:
+                f.write(content)
+        destination, attempt = folder_path, 1
+        while os.path.exists(destination):
+            attempt += 1
+            destination = f"{folder_path}_{attempt}"
+        os.rename(staging_path, destination)
+    except BaseException:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise
+    logger.info(f"Published {name} to {destination}")
+    return destination
 
 def is_one_page_pdf(pdf_path):
     """
@@ -119,5 +256,7 @@ def is_one_page_pdf(pdf_path):
     Returns:
         bool: True if the PDF contains exactly one page, False otherwise.
     """
+    from PyPDF2 import PdfReader
+
     reader = PdfReader(pdf_path)
     return len(reader.pages) == 1
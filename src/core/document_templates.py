@@ -0,0 +1,101 @@
+import glob
+import io
+import os
+import threading
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from src.utils.config import TEMPLATES_DIR, TEMPLATE_CACHE_DIR, COVER_LETTER_TEMPLATE
+
+LATEX_TEMPLATE_DIR = os.path.join(TEMPLATES_DIR, 'latex')
+
+# A named template is a directory under templates/latex holding one of these
+# (plus any .cls/.sty it needs) and, optionally, a Word base document
+LATEX_TEMPLATE_PATTERN = '*cover_letter_template.tex'
+DOCX_TEMPLATE_NAME = 'cover_letter_template.docx'
+
+
+class DocumentTemplate(NamedTuple):
+    """A named cover letter style: its LaTeX template and optional Word base document."""
+    name: str
+    directory: str
+    latex: object
+    docx_path: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def _latex_environment() -> Environment:
+    """
+    Return the Jinja2 environment for LaTeX templates, created once per process.
+
+    Compiled templates are kept in memory and in a bytecode cache on disk, so a
+    new process skips parsing too. With auto_reload, an edited template file is
+    recompiled on its next use; unchanged ones cost only a modification-time check.
+    """
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(LATEX_TEMPLATE_DIR),
+        bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+        auto_reload=True,
+        cache_size=50,
+    )
+
+
+def available_templates() -> List[str]:
+    """Return the names of the cover letter templates under templates/latex."""
+    return sorted(
+        os.path.basename(os.path.dirname(path))
+        for path in glob.glob(os.path.join(LATEX_TEMPLATE_DIR, '*', LATEX_TEMPLATE_PATTERN))
+    )
+
+
+def get_document_template(name: str = COVER_LETTER_TEMPLATE) -> DocumentTemplate:
+    """
+    Return a named cover letter template, compiled.
+
+    Args:
+        name (str): The template directory name under templates/latex, e.g. 'awesome-cv'.
+
+    Returns:
+        DocumentTemplate: The template.
+
+    Raises:
+        ValueError: If there is no template with that name.
+    """
+    directory = os.path.join(LATEX_TEMPLATE_DIR, name)
+    matches = sorted(glob.glob(os.path.join(directory, LATEX_TEMPLATE_PATTERN)))
+    if not matches:
+        raise ValueError(f"Unknown cover letter template {name!r}; available: {', '.join(available_templates())}")
+    # Jinja template names always use forward slashes
+    latex = _latex_environment().get_template(f"{name}/{os.path.basename(matches[0])}")
+    docx_path = os.path.join(directory, DOCX_TEMPLATE_NAME)
+    return DocumentTemplate(name, directory, latex, docx_path if os.path.isfile(docx_path) else None)
+
+
+_docx_lock = threading.Lock()
+_docx_bases = {}
+
+
+def new_word_document(template: DocumentTemplate):
+    """
+    Return a new Word document based on the template's base document, if it has one.
+
+    The base document's bytes are read once and re-read only when the file changes.
+
+    Args:
+        template (DocumentTemplate): The template.
+
+    Returns:
+        docx.document.Document: A fresh document to add the letter to.
+    """
+    from docx import Document
+
+    if template.docx_path is None:
+        return Document()
+    mtime = os.path.getmtime(template.docx_path)
+    with _docx_lock:
+        cached = _docx_bases.get(template.docx_path)
+        if cached is None or cached[0] != mtime:
+            with open(template.docx_path, 'rb') as f:
+                cached = _docx_bases[template.docx_path] = (mtime, f.read())
+    return Document(io.BytesIO(cached[1]))
@@ -0,0 +1,122 @@
+# awesome-cv's accent and text colours (awesome-red, darktext, graytext)
+ACCENT_COLOR = (0xDC, 0x35, 0x22)
+TEXT_COLOR = (0x41, 0x41, 0x41)
+GRAY_COLOR = (0x5D, 0x5D, 0x5D)
+
+# Typographic characters models like to produce, mapped into the core fonts' Latin-1 range
+LATIN1_REPLACEMENTS = {
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"', '\u2013': '-', '\u2014': '-',
+    '\u2026': '...', '\u2022': '-', '\u2009': ' ', '\u200b': '',
+}
+
+
+def to_latin1(text: str) -> str:
+    """
+    Map text into Latin-1, the character set of the PDF core fonts.
+
+    Common typographic punctuation is replaced by its ASCII equivalent and any
+    other character outside Latin-1 by '?'.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The text, encodable as Latin-1.
+    """
+    for character, replacement in LATIN1_REPLACEMENTS.items():
+        text = text.replace(character, replacement)
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+def render_draft_pdf(fields: dict) -> bytes:
+    """
+    Lay out a cover letter as a PDF without LaTeX.
+
+    Follows the awesome-cv letter layout (centred name and position, social
+    line, recipient block, date, title, body and closing) using the PDF core
+    fonts, so nothing has to be installed or embedded. Intended for drafts;
+    final documents go through xelatex.
+
+    Args:
+        fields (dict): The unescaped letter fields from `cover_letter_fields`.
+
+    Returns:
+        bytes: The PDF document.
+    """
+    from fpdf import FPDF
+
+    fields = {key: [to_latin1(line) for line in value] if isinstance(value, list) else to_latin1(value)
+              for key, value in fields.items()}
+    pdf = FPDF(format='A4', unit='mm')
+    pdf.set_margins(14, 8, 14)
+    pdf.set_auto_page_break(True, margin=18)
+    pdf.add_page()
+    width = pdf.epw
+
+    # Header: first name light, last name bold, then position and contact details
+    pdf.set_font('Helvetica', '', 28)
+    first = f"{fields['first_name']} "
+    first_width = pdf.get_string_width(first)
+    pdf.set_font('Helvetica', 'B', 28)
+    last_width = pdf.get_string_width(fields['last_name'])
+    pdf.set_x(pdf.l_margin + (width - first_width - last_width) / 2)
+    pdf.set_text_color(*GRAY_COLOR)
+    pdf.set_font('Helvetica', '', 28)
+    pdf.cell(first_width, 12, first)
+    pdf.set_text_color(*TEXT_COLOR)
+    pdf.set_font('Helvetica', 'B', 28)
+    pdf.cell(last_width, 12, fields['last_name'], new_x='LMARGIN', new_y='NEXT')
+
+    pdf.set_font('Helvetica', '', 8)
+    pdf.set_text_color(*ACCENT_COLOR)
+    pdf.cell(width, 5, fields['position'].upper(), align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.set_text_color(*GRAY_COLOR)
+    pdf.set_font('Helvetica', 'I', 8)
+    pdf.cell(width, 4, fields['address'], align='C', new_x='LMARGIN', new_y='NEXT')
+    social = '  |  '.join(
+        value for value in (fields['phone'], fields['email'], fields['website'],
+                            fields['github'] and f"github.com/{fields['github']}",
+                            fields['linkedin'] and f"linkedin.com/in/{fields['linkedin']}") if value
+    )
+    pdf.set_font('Helvetica', '', 8)
+    pdf.cell(width, 4, social, align='C', new_x='LMARGIN', new_y='NEXT')
+    pdf.ln(8)
+
+    # Recipient and date
+    pdf.set_text_color(*TEXT_COLOR)
+    pdf.set_font('Helvetica', 'B', 10)
+    top = pdf.get_y()
+    pdf.cell(width / 2, 5, fields['recipient'], new_x='LMARGIN', new_y='NEXT')
+    pdf.set_font('Helvetica', '', 9)
+    pdf.set_text_color(*GRAY_COLOR)
+    for line in fields['company_address_lines']:
+        pdf.cell(width / 2, 4.5, line, new_x='LMARGIN', new_y='NEXT')
+    after_recipient = pdf.get_y()
+    pdf.set_xy(pdf.l_margin + width / 2, top)
+    pdf.set_font('Helvetica', 'I', 9)
+    pdf.cell(width / 2, 5, fields['date'], align='R')
+    pdf.set_y(after_recipient + 6)
+
+    # Title, opening, body and closing
+    pdf.set_text_color(*ACCENT_COLOR)
+    pdf.set_font('Helvetica', 'B', 11)
+    pdf.cell(width, 6, fields['job_title'], new_x='LMARGIN', new_y='NEXT')
+    pdf.ln(3)
+    pdf.set_text_color(*TEXT_COLOR)
+    pdf.set_font('Helvetica', '', 10)
+    pdf.cell(width, 5, fields['opening'], new_x='LMARGIN', new_y='NEXT')
+    pdf.ln(2)
+    for paragraph in fields['cover_letter_content'].split('\n'):
+        if paragraph.strip():
+            pdf.multi_cell(width, 5, paragraph.strip(), align='J', new_x='LMARGIN', new_y='NEXT')
+            pdf.ln(2.5)
+    pdf.ln(3)
+    pdf.cell(width, 5, 'Sincerely,', new_x='LMARGIN', new_y='NEXT')
+    pdf.ln(6)
+    pdf.set_font('Helvetica', 'B', 10)
+    pdf.cell(width, 5, f"{fields['first_name']} {fields['last_name']}", new_x='LMARGIN', new_y='NEXT')
+    pdf.ln(4)
+    pdf.set_font('Helvetica', 'I', 8)
+    pdf.set_text_color(*GRAY_COLOR)
+    pdf.cell(width, 4, 'Attached: Curriculum Vitae', new_x='LMARGIN', new_y='NEXT')
+    return bytes(pdf.output())
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+import requests
+from src.utils.circuit_breaker import circuit_breaker
+from src.utils.config import (
+    FETCH_TIMEOUT, FETCH_HEDGE_DELAY, POSTING_MAX_BYTES, POSTING_MAX_PDF_BYTES
+)
+from src.utils.deadline import call_timeout, check_deadline
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Recent response times kept per host, and how many are needed before they set the hedge delay
+LATENCY_HISTORY = 20
+MIN_LATENCY_SAMPLES = 5
+
+# Bytes read from the network at a time when streaming a posting
+CHUNK_BYTES = 64 * 1024
+
+
+class PostingTooLargeError(ValueError):
+    """Raised when a posting that cannot be read in part (a PDF) is over its size limit."""
+
+
+class Download(NamedTuple):
+    """A posting body read by `HedgedFetcher.download`."""
+    content: bytes
+    kind: str  # 'pdf' or 'html'
+    status_code: int
+    truncated: bool
+
+
+def sniff_kind(content_type: Optional[str], head: bytes) -> str:
+    """
+    Decide how to read a posting from its Content-Type header and first bytes.
+
+    The PDF signature wins over the header, as servers often send PDFs as
+    application/octet-stream. Everything else is parsed as HTML, which also
+    copes with plain text.
+
+    Args:
+        content_type (Optional[str]): The Content-Type header, if any.
+        head (bytes): The start of the body.
+
+    Returns:
+        str: 'pdf' or 'html'.
+    """
+    if head.lstrip()[:5] == b'%PDF-':
+        return 'pdf'
+    if content_type and content_type.split(';')[0].strip().lower() == 'application/pdf':
+        return 'pdf'
+    return 'html'
+
+
+def _close_response(future):
+    """Release the connection of a hedged request that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def is_fetch_failure(error: BaseException) -> bool:
+    """Return True for errors that mean a posting host is down rather than the request being bad."""
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class HedgedFetcher:
+    """
+    Fetch job posting pages with hedged requests and per-host circuit breakers.
+
+    If a host has not answered after its hedge delay, a second identical
+    request is sent and whichever response arrives first is used. The hedge
+    delay is FETCH_HEDGE_DELAY, or the host's recent 90th percentile response
+    time if that is longer, so only its slowest requests are duplicated. Each
+    request is bounded by FETCH_TIMEOUT and the current request deadline, and
+    a host that keeps timing out or refusing connections is skipped while its
+    breaker ('fetch.<host>') is open. `download` streams a posting's body
+    under a size limit and reports whether it is a PDF or HTML.
+    """
+
+    def __init__(self, timeout: float = FETCH_TIMEOUT, hedge_delay: float = FETCH_HEDGE_DELAY, workers: int = 16):
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = {}
+
+    def hedge_delay_for(self, host: str) -> float:
+        """Return how long to wait for a host before sending a hedged request."""
+        with self._lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return self.hedge_delay
+        return max(self.hedge_delay, samples[int(0.9 * (len(samples) - 1))])
+
+    def _record_latency(self, host: str, seconds: float):
+        with self._lock:
+            self._latencies.setdefault(host, deque(maxlen=LATENCY_HISTORY)).append(seconds)
+
+    def get(self, url: str, headers: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """
+        GET a URL, hedging if the first request is slow.
+
+        Args:
+            url (str): The URL.
+            headers (Optional[dict]): Request headers.
+            stream (bool): Return once the headers arrive and leave the body to be read
+                from the response; the hedge then only covers the time to first byte.
+
+        Returns:
+            requests.Response: The first response received.
+
+        Raises:
+            requests.RequestException: If every request failed or timed out.
+            CircuitOpenError: If the host's circuit breaker is open.
+            DeadlineExceeded: If the request deadline has already passed.
+        """
+        host = urlsplit(url).hostname or url
+        timeout = call_timeout(self.timeout)
+        with circuit_breaker(f'fetch.{host}').guard(is_fetch_failure):
+            started = time.monotonic()
+            futures = [self._executor.submit(requests.get, url, headers=headers, timeout=timeout, stream=stream)]
+            winner = None
+            try:
+                hedge_delay = self.hedge_delay_for(host)
+                done, _ = wait(futures, timeout=min(hedge_delay, timeout))
+                if not done and hedge_delay < timeout:
+                    logger.info(f"Hedging slow fetch of {url}")
+                    metrics.increment('fetch.hedged')
+                    futures.append(self._executor.submit(requests.get, url, headers=headers, timeout=timeout,
+                                                         stream=stream))
+                pending = set(futures)
+                error = None
+                while pending:
+                    remaining = timeout - (time.monotonic() - started)
+                    done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+                    if not done:
+                        break
+                    for future in done:
+                        if future.exception() is None:
+                            self._record_latency(host, time.monotonic() - started)
+                            winner = future
+                            return future.result()
+                        error = future.exception()
+                if error is not None:
+                    raise error
+                raise requests.Timeout(f"No response from {host} within {timeout:.1f}s")
+            finally:
+                # Responses that lost the race, or arrive after we gave up, are closed when they come in
+                for future in futures:
+                    if future is not winner:
+                        future.add_done_callback(_close_response)
+
+    def download(self, url: str, headers: Optional[dict] = None, max_bytes: int = POSTING_MAX_BYTES,
+                 max_pdf_bytes: int = POSTING_MAX_PDF_BYTES) -> Download:
+        """
+        Stream a posting's body, stopping at a size limit chosen by its kind.
+
+        The kind is sniffed from the Content-Type header and the first chunk
+        (see `sniff_kind`). HTML is read up to `max_bytes` and the rest is
+        dropped; a PDF is only readable whole, so one over `max_pdf_bytes` is
+        an error. Limits apply to the decoded body, so a compressed response
+        cannot expand past them. Cut-short pages are counted under
+        'fetch.truncated'.
+
+        Args:
+            url (str): The posting URL.
+            headers (Optional[dict]): Request headers.
+            max_bytes (int): Most bytes read from an HTML or text posting.
+            max_pdf_bytes (int): Largest PDF posting accepted.
+
+        Returns:
+            Download: The body read, its kind, the HTTP status and whether it was cut short.
+
+        Raises:
+            PostingTooLargeError: If a PDF posting is over `max_pdf_bytes`.
+            DeadlineExceeded: If the request deadline passes while the body is being read.
+            requests.RequestException: If the request fails (see `get`).
+        """
+        response = self.get(url, headers=headers, stream=True)
+        try:
+            chunks = response.iter_content(chunk_size=CHUNK_BYTES)
+            head = next(chunks, b'')
+            kind = sniff_kind(response.headers.get('Content-Type'), head)
+            limit = max_pdf_bytes if kind == 'pdf' else max_bytes
+            body = bytearray(head)
+            for chunk in chunks:
+                # Timeouts apply per socket read, so a host sending slowly is stopped by the deadline instead
+                check_deadline()
+                body += chunk
+                if len(body) > limit:
+                    break
+        finally:
+            response.close()
+        truncated = len(body) > limit
+        if truncated:
+            metrics.increment('fetch.truncated')
+            if kind == 'pdf':
+                raise PostingTooLargeError(f"PDF posting at {url} is larger than {limit} bytes")
+            logger.warning(f"Posting at {url} is larger than {limit} bytes; reading only the first {limit}")
+            del body[limit:]
+        return Download(bytes(body), kind, response.status_code, truncated)
+
+
+# Process-wide fetcher for job posting pages
+posting_fetcher = HedgedFetcher()
@@ -0,0 +1,147 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Tuple
+from src.core.site_extractors import extract_site_job_details
+from src.core.structured_data import extract_open_graph, extract_structured_job_details
+from src.utils.config import HTML_PARSE_WORKERS, HTML_PARSE_OFFLOAD_BYTES
+from src.utils.deadline import DeadlineExceeded, time_remaining
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ParsedPage = Tuple[Dict[str, str], Dict[str, str], str]
+
+
+def clean_text(text: str) -> str:
+    """
+    Tidy text taken from a page: strip each line, split runs of double spaces into lines, drop blank lines.
+
+    Args:
+        text (str): The raw page text.
+
+    Returns:
+        str: Newline-separated non-empty lines.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+def parse_html_page(url: str, content: bytes) -> ParsedPage:
+    """
+    Parse a posting's HTML into structured job details, OpenGraph fields and cleaned text.
+
+    Structured data lives in <script> tags, so it is read before they are
+    stripped for the text. Known job boards fill any gaps in it with their
+    site-specific selector rules.
+
+    Args:
+        url (str): The posting URL, used to pick the site extractor.
+        content (bytes): The HTML.
+
+    Returns:
+        ParsedPage: Job details from schema.org data and the site extractor,
+            OpenGraph fields, and the cleaned page text.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+
+    job_details = extract_structured_job_details(soup)
+    for field, value in extract_site_job_details(url, soup).items():
+        job_details.setdefault(field, value)
+    open_graph = extract_open_graph(soup)
+
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return job_details, open_graph, clean_text(soup.get_text())
+
+
+def _parse_in_worker(url: str, content: bytes) -> Tuple[ParsedPage, dict]:
+    """Parse a page in a worker process, returning the metrics it recorded so the parent can keep them."""
+    metrics.reset()
+    return parse_html_page(url, content), metrics.snapshot()
+
+
+class HtmlParsePool:
+    """
+    Parse large HTML pages in worker processes so they do not hold the GIL.
+
+    BeautifulSoup parsing is pure Python, so a multi-megabyte page keeps every
+    other thread (e.g. concurrent webhook requests) waiting. Pages of at least
+    `offload_bytes` are sent as raw bytes to a pool of `workers` processes,
+    which return the parsed fields and text; smaller pages are parsed inline,
+    where the round trip would cost more than the parse. With `workers` 0
+    every page is parsed inline.
+
+    Workers are started on first use with the 'spawn' method, as forking a
+    process that is running other threads can copy held locks into the child.
+    Metrics recorded in a worker (such as site extractor stats) are merged back
+    into the parent's. The wait for a worker is bounded by the request
+    deadline, and if a worker dies the page is parsed inline and the pool is
+    restarted on the next offload. Pages parsed each way are counted under
+    'html_parse.inline' and 'html_parse.offloaded'.
+    """
+
+    def __init__(self, workers: int = HTML_PARSE_WORKERS, offload_bytes: int = HTML_PARSE_OFFLOAD_BYTES):
+        self.workers = workers
+        self.offload_bytes = offload_bytes
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def parse(self, url: str, content: bytes) -> ParsedPage:
+        """
+        Parse a page, in a worker process if it is large enough (see `parse_html_page`).
+
+        Args:
+            url (str): The posting URL.
+            content (bytes): The HTML.
+
+        Returns:
+            ParsedPage: Job details, OpenGraph fields and cleaned text.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes while the page is being parsed.
+        """
+        if self.workers <= 0 or len(content) < self.offload_bytes:
+            metrics.increment('html_parse.inline')
+            return parse_html_page(url, content)
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_parse_in_worker, url, content)
+            parsed, snapshot = future.result(timeout=time_remaining())
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Request deadline exceeded while parsing {url}")
+        except BrokenProcessPool:
+            logger.warning(f"HTML parse worker died; parsing {url} inline")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            metrics.increment('html_parse.inline')
+            return parse_html_page(url, content)
+        metrics.merge(snapshot)
+        metrics.increment('html_parse.offloaded')
+        return parsed
+
+    def close(self):
+        """Stop the worker processes, if any were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+# Process-wide pool used by every page parse
+html_parse_pool = HtmlParsePool()
@@ -0,0 +1,218 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Tuple
+from src.core.fetcher import posting_fetcher
+from src.core.html_parse import html_parse_pool
+from src.core.pdf_text import extract_pdf_text
+from src.core.prompt_builder import count_tokens, split_sections
+from src.utils.config import JOB_PAGE_CACHE_SIZE, JOB_PAGE_CACHE_SECONDS
+from src.utils.deadline import DeadlineExceeded, time_remaining
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Sent with every posting request; some job boards refuse clients that do not look like a browser
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Page text tokens given to the question answering model, which reads at most 384 tokens with the question
+QA_CONTEXT_TOKENS = 300
+
+WORD = re.compile(r'\w+')
+
+
+class JobPage:
+    """
+    A job posting downloaded once and parsed once, shared by everything that reads it.
+
+    The body is parsed on first use (HTML with `html_parse_pool`, PDFs with
+    `extract_pdf_text`) and then dropped, so a cached page keeps only its text
+    and the fields found in it. Parsing is locked, so threads sharing a page
+    parse it once.
+
+    Attributes:
+        url (str): The posting URL.
+        kind (str): 'html' or 'pdf' (see `fetcher.sniff_kind`).
+        status_code (int): The HTTP status of the download.
+    """
+
+    def __init__(self, url: str, content: bytes, kind: str = 'html', status_code: int = 200):
+        self.url = url
+        self.kind = kind
+        self.status_code = status_code
+        self._content = content
+        self._lock = threading.Lock()
+        self._parsed = None
+        self._sections = None
+
+    @classmethod
+    def fetch(cls, url: str) -> 'JobPage':
+        """
+        Download a posting (see `HedgedFetcher.download`).
+
+        Args:
+            url (str): The posting URL.
+
+        Returns:
+            JobPage: The page, not yet parsed.
+        """
+        download = posting_fetcher.download(url, headers=REQUEST_HEADERS)
+        return cls(url, download.content, download.kind, download.status_code)
+
+    def _parse(self) -> Tuple[Dict[str, str], Dict[str, str], str]:
+        with self._lock:
+            if self._parsed is None:
+                with metrics.timer(f'job_page.parse.{self.kind}'):
+                    if self.kind == 'pdf':
+                        # PDFs carry no structured data
+                        self._parsed = {}, {}, extract_pdf_text(self._content)
+                    else:
+                        self._parsed = html_parse_pool.parse(self.url, self._content)
+                self._content = None
+            return self._parsed
+
+    @property
+    def structured_details(self) -> Dict[str, str]:
+        """Job details found without the model: schema.org data, then the site extractor. A copy."""
+        return dict(self._parse()[0])
+
+    @property
+    def open_graph(self) -> Dict[str, str]:
+        """OpenGraph fields of the page. A copy."""
+        return dict(self._parse()[1])
+
+    @property
+    def text(self) -> str:
+        """The cleaned page text, one line per block."""
+        return self._parse()[2]
+
+    @property
+    def lines(self) -> List[str]:
+        """The lines of `text`."""
+        return self.text.splitlines()
+
+    @property
+    def sections(self) -> List[Tuple[int, int]]:
+        """Character spans of the heading-delimited sections of `text` (see `split_sections`)."""
+        if self._sections is None:
+            self._sections = split_sections(self.text)
+        return self._sections
+
+    def context_for(self, question: str, token_budget: int = QA_CONTEXT_TOKENS) -> str:
+        """
+        Pick the sections of the page most likely to answer a question.
+
+        Sections are ranked by how many of the question's words they contain
+        (the first section wins ties, as it usually names the job) and added
+        until the token budget is spent, then returned in page order.
+
+        Args:
+            question (str): The question.
+            token_budget (int): The most tokens of page text to return.
+
+        Returns:
+            str: The selected text.
+        """
+        text = self.text
+        if count_tokens(text) <= token_budget:
+            return text
+        words = set(WORD.findall(question.lower()))
+        ranked = sorted(
+            self.sections,
+            key=lambda span: -len(words.intersection(WORD.findall(text[span[0]:span[1]].lower()))),
+        )
+        chosen = []
+        remaining = token_budget
+        for start, end in ranked:
+            if remaining <= 0:
+                break
+            tokens = count_tokens(text[start:end])
+            if tokens > remaining:
+                end = start + remaining * (end - start) // tokens
+                tokens = remaining
+            chosen.append((start, end))
+            remaining -= tokens
+        return '\n'.join(text[start:end] for start, end in sorted(chosen))
+
+
+class JobPageCache:
+    """
+    Thread-safe LRU cache of fetched job pages keyed by URL.
+
+    Pages expire after `ttl` seconds, so a posting that changes is fetched
+    afresh on the next run. Error pages are not cached. Concurrent requests
+    for a URL that is not cached share a single fetch: the first caller
+    downloads the page and the others wait for it (up to their request
+    deadline). Hits and misses are counted under 'job_page.hits' and
+    'job_page.misses'.
+    """
+
+    def __init__(self, max_entries: int = JOB_PAGE_CACHE_SIZE, ttl: float = JOB_PAGE_CACHE_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()
+        # URL -> Future of the page while its first caller is fetching it
+        self._loading: Dict[str, Future] = {}
+
+    def get(self, url: str) -> JobPage:
+        """
+        Return the page for a URL, fetching it unless a fresh copy is cached.
+
+        Args:
+            url (str): The posting URL.
+
+        Returns:
+            JobPage: The page.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes while waiting for another caller's fetch.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pages.get(url)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._pages.move_to_end(url)
+                metrics.increment('job_page.hits')
+                return entry[0]
+            loading = self._loading.get(url)
+            if loading is None:
+                self._loading[url] = Future()
+        if loading is not None:
+            metrics.increment('job_page.hits')
+            try:
+                return loading.result(timeout=time_remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"Request deadline exceeded while waiting for {url} to be fetched")
+
+        metrics.increment('job_page.misses')
+        try:
+            page = JobPage.fetch(url)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(url).set_exception(e)
+            raise
+        with self._lock:
+            if page.status_code < 400 and self.max_entries > 0:
+                self._pages[url] = (page, now)
+                self._pages.move_to_end(url)
+                while len(self._pages) > self.max_entries:
+                    self._pages.popitem(last=False)
+            else:
+                logger.debug(f"Not caching {url} (status {page.status_code})")
+            self._loading.pop(url).set_result(page)
+        return page
+
+    def clear(self):
+        """Forget every cached page."""
+        with self._lock:
+            self._pages.clear()
+
+
+# Process-wide cache of posting pages
+job_page_cache = JobPageCache()
@@ -1,102 +1,239 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict
-import torch
-from src.utils.config import openai_client, logger, model, tokenizer
-from src.utils.text_processing import expand_job_title_acronyms, clean_job_title
+import logging
+import re
+from typing import Dict, Union
+from pydantic import ValidationError
+from src.utils.config import (
+    openai_client, model, tokenizer, EXTRACTION_TOKEN_BUDGET, EXTRACTION_MODE, EXTRACTION_MODEL_TIERS
+)
+from src.core.job_page import JobPage, job_page_cache
+from src.core.model_router import route_completion
+from src.core.model_server import model_client
+from src.core.prompt_builder import (
+    JOB_DETAIL_FIELDS, REQUIRED_JOB_DETAIL_FIELDS, build_extraction_prompt, openai_tokenizer, output_token_limit
+)
+from src.core.schemas import job_details_response_format, parse_job_details_json
+from src.utils.metrics import metrics
+from src.utils.text_processing import expand_job_title_acronyms, clean_job_title, parse_application_deadline
 
-def extract_job_details(url):
+logger = logging.getLogger(__name__)
+
+# Company names that mean the model did not find the employer
+IMPLAUSIBLE_COMPANIES = {
+    'unknown', 'unknown company', 'n/a', 'na', 'none', 'not specified', 'company', 'confidential',
+    'linkedin', 'indeed', 'glassdoor', 'ziprecruiter', 'higheredjobs', 'academicjobsonline',
+}
+
+# Application deadlines that are real answers without being dates; matched as whole words at the start
+OPEN_DEADLINE_PHRASES = (
+    'open until filled', 'open until the position is filled', 'open until position is filled',
+    'until filled', 'until the position is filled', 'rolling', 'ongoing', 'asap', 'as soon as possible',
+    'immediately', 'review of applications begins', 'applications reviewed', 'no deadline', 'not specified',
+)
+_OPEN_DEADLINE_PATTERN = re.compile(r'(?:' + '|'.join(map(re.escape, OPEN_DEADLINE_PHRASES)) + r')\b')
+
+def extract_job_details(url, find_duplicate=None):
     """
     Extract job details from a given job posting URL.
 
-    This function sends a GET request to the specified URL, processes the HTML content
-    to remove unnecessary elements, and extracts relevant job information using an AI model.
+    This function loads the posting through the shared page cache (see `JobPage`) and
+    first reads any schema.org JobPosting data (JSON-LD or microdata) embedded in the
+    page, then applies the site extractor registered for the URL's host. If that fills the required fields the AI model
+    is skipped; otherwise the HTML content is cleaned and the model is
+    asked only for the fields that are still missing. PDF postings have no
+    structured data, so their text (see `extract_pdf_text`) goes to the model.
+    If `find_duplicate` is given it is called with the cleaned page text; job details it
+    returns (those of a near-duplicate posting processed before) are reused as they are.
     The extracted details include the job title, company, location, experience level, 
     application deadline, and salary range. The function ensures that all required fields 
     are present in the returned dictionary, even if some information is not available.
 
     Args:
         url (str): The URL of the job posting to extract details from.
+        find_duplicate (Optional[Callable[[str], Optional[dict]]]): Lookup of prior job
+            details by page text, called after the text is cleaned.
 
     Returns:
         dict: A dictionary containing the extracted job details with keys such as 'Job Title',
               'Company', 'Location', 'Experience Level', 'Application Deadline', 'Salary Range',
               and 'Job URL'.
+
+    Raises:
+        ValueError: If the posting request returned an HTTP error status.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    response = requests.get(url, headers=headers)
+    page = job_page_cache.get(url)
+    if page.status_code >= 400:
+        raise ValueError(f"Job posting request failed with status code {page.status_code}")
+    job_details = page.structured_details
+    open_graph = page.open_graph
+    text = page.text
+
+    duplicate_details = find_duplicate(text) if find_duplicate is not None else None
+    if duplicate_details:
+        logger.info(f"Reusing job details of a near-duplicate posting: {url}")
+        return dict(duplicate_details, **{'Job URL': url})
+
+    missing_fields = [field for field in JOB_DETAIL_FIELDS if not job_details.get(field)]
+    if any(field in missing_fields for field in REQUIRED_JOB_DETAIL_FIELDS):
+        metrics.increment('structured_data.partial' if job_details else 'structured_data.miss')
+        llm_details = _extract_with_llm(url, text, missing_fields)
+        job_details.update({field: llm_details.get(field, '') for field in missing_fields})
+    else:
+        metrics.increment('structured_data.hit')
+        logger.info(f"Filled job details from structured data and site rules without the model: {url}")
+    metrics.increment('structured_data.lookups')
+
+    # OpenGraph tags only fill what neither structured data nor the model found
+    for field, value in open_graph.items():
+        if not job_details.get(field):
+            job_details[field] = value
    
-    soup = BeautifulSoup(response.content, 'html.parser')
+    job_details['Job URL'] = url
    
-    for script in soup(["script", "style"]):
-        script.decompose()
+    # Clean the job title
+    if 'Job Title' in job_details and job_details['Job Title']:
+        job_details['Job Title'] = expand_job_title_acronyms(clean_job_title(job_details['Job Title']))
    
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = '\n'.join(chunk for chunk in chunks if chunk)
-    limited_text = text[:14000]
-    prompt = f"""
-    Extract the following information from the job posting at {url}:
-    1. Job Title
-    2. Company
-    3. Location
-    4. Experience Level Required
-    5. Application Deadline
-    6. Salary Range (if available)
-    Here's the content of the webpage:
-    {limited_text}
-    Provide the information in the following format:
-    Job Title: [extracted job title]
-    Company: [extracted company name]
-    Location: [extracted location]
-    Experience Level: [extracted experience level]
-    Application Deadline: [extracted deadline]
-    Salary Range: [extracted salary range or "Not specified" if not found]
-    Ensure each piece of information is on a separate line and follows the exact format specified above.
-    Do not include any additional text, explanations, or formatting.
-    Only include the requested information as provided in the job description. No fake companies.
-    """
-    response = openai_client.chat.completions.create(
-        model="gpt-4o",
+    # Ensure all required fields are present
+    for field in JOB_DETAIL_FIELDS:
+        if field not in job_details:
+            job_details[field] = ''
+    
+    return job_details
+
+def structured_data_hit_rate():
+    """
+    Return the share of extracted postings that skipped the model entirely.
+
+    A posting counts as a hit when schema.org data and the site extractor together
+    filled every required field.
+
+    Returns:
+        float: Postings fully filled from structured data divided by all postings
+               extracted in this process (0.0 before the first extraction).
+    """
+    return metrics.ratio('structured_data.hit', 'structured_data.lookups')
+
+def _extract_with_llm(url, text, fields):
+    """
+    Ask the model for the given job detail fields from the cleaned page text.
+
+    The request is routed through the EXTRACTION_MODEL_TIERS, escalating to a
+    stronger model only when `is_plausible_extraction` rejects an answer.
+
+    In the default "structured" extraction mode the answer is constrained to a
+    JSON schema and validated in one step; in "lines" mode (or if a structured
+    answer fails validation) the legacy `Key: value` line format is parsed.
+
+    The page text is cut to EXTRACTION_TOKEN_BUDGET tokens of the first tier's
+    tiktoken encoding, or estimated from its length if tiktoken is unavailable.
+
+    Args:
+        url (str): The URL of the job posting.
+        text (str): The cleaned page text.
+        fields (list): The job detail fields to extract.
+
+    Returns:
+        dict: The extracted fields, with "Not specified" answers mapped to ''.
+    """
+    structured = EXTRACTION_MODE == 'structured'
+    # Count with the OpenAI model's own encoding; the local QA model's tokenizer splits text differently
+    prompt = build_extraction_prompt(url, text, EXTRACTION_TOKEN_BUDGET, fields=fields,
+                                     tokenizer=openai_tokenizer(EXTRACTION_MODEL_TIERS[0]), structured=structured)
+    request = {}
+    if structured:
+        request['response_format'] = job_details_response_format(fields)
+
+    def parse(response):
+        extracted_text = response.choices[0].message.content.strip()
+        if structured:
+            try:
+                job_details = parse_job_details_json(extracted_text, fields)
+            except ValidationError as e:
+                logger.warning(f"Structured extraction did not match schema, parsing as lines: {e}")
+                job_details = parse_job_details_lines(extracted_text)
+        else:
+            job_details = parse_job_details_lines(extracted_text)
+        return {key: '' if value == 'Not specified' else value for key, value in job_details.items()}
+
+    return route_completion(
+        openai_client, 'extraction', EXTRACTION_MODEL_TIERS,
         messages=[
             {"role": "system", "content": "You are a helpful assistant that extracts job details from web pages."},
             {"role": "user", "content": prompt}
         ],
-        max_tokens=4000
+        parse=parse,
+        validate=lambda job_details: is_plausible_extraction(job_details, fields),
+        max_tokens=output_token_limit(fields),
+        **request
     )
-    extracted_text = response.choices[0].message.content.strip()
-   
+
+def is_plausible_extraction(job_details, fields):
+    """
+    Check whether a model's extraction is good enough to skip a stronger model.
+
+    An extraction passes when every requested required field is filled, any
+    application deadline given parses as a date or is a known open-ended
+    phrase such as "Open until filled" or "Rolling", and the company is not a
+    placeholder or the name of a job board.
+
+    Args:
+        job_details (dict): The extracted fields.
+        fields (list): The fields that were requested.
+
+    Returns:
+        bool: True if the extraction is acceptable.
+    """
+    if any(not job_details.get(field) for field in REQUIRED_JOB_DETAIL_FIELDS if field in fields):
+        return False
+    deadline = job_details.get('Application Deadline', '')
+    if deadline and parse_application_deadline(deadline) is None and not is_open_deadline(deadline):
+        return False
+    company = job_details.get('Company', '')
+    if 'Company' in fields and (len(company) < 2 or company.lower() in IMPLAUSIBLE_COMPANIES):
+        return False
+    return True
+
+def is_open_deadline(deadline):
+    """
+    Return True if an application deadline is an open-ended phrase rather than a date.
+
+    Only whole phrases count, so "Open until March 1" or "Opening date
+    2024-11-01" are not open-ended; they must parse as dates instead.
+
+    Args:
+        deadline (str): The extracted deadline, e.g. "Open until filled" or "Rolling basis".
+
+    Returns:
+        bool: True if the text starts with one of OPEN_DEADLINE_PHRASES.
+    """
+    text = ' '.join(str(deadline).lower().split())
+    return _OPEN_DEADLINE_PATTERN.match(text) is not None
+
+def parse_job_details_lines(extracted_text):
+    """
+    Parse a `Key: value` per line model answer into a job details dictionary.
+
+    Args:
+        extracted_text (str): The raw text returned by the model.
+
+    Returns:
+        dict: The parsed fields, keyed by the text before the first colon.
+    """
     job_details = {}
     for line in extracted_text.split('\n'):
         if ':' in line:
             key, value = line.split(':', 1)
-            job_details[key.strip()] = value.strip() if value.strip() != 'Not specified' else ''
-   
-    job_details['Job URL'] = url
-   
-    # Clean the job title
-    if 'Job Title' in job_details and job_details['Job Title']:
-        job_details['Job Title'] = expand_job_title_acronyms(clean_job_title(job_details['Job Title']))
-   
-    # Ensure all required fields are present
-    required_fields = ['Job Title', 'Company', 'Location', 'Experience Level', 'Application Deadline', 'Salary Range']
-    for field in required_fields:
-        if field not in job_details:
-            job_details[field] = ''
-    
+            job_details[key.strip()] = value.strip()
     return job_details
 
 def fetch_job_posting_text(url: str) -> str:
     """
     Fetch and clean the text content of a job posting from a given URL.
 
-    This function sends a GET request to the specified URL, retrieves the HTML content,
-    and processes it to remove script and style elements. It then extracts and cleans
-    the text content, removing unnecessary whitespace and formatting, and returns the
-    cleaned text.
+    The page is loaded through the shared page cache (see `JobPage`), so a posting
+    already fetched for extraction is not downloaded or parsed again. HTML is
+    stripped of script and style elements and its text cleaned of unnecessary
+    whitespace and formatting; PDF postings are read with `extract_pdf_text`.
 
     Args:
         url (str): The URL of the job posting to fetch.
@@ -105,38 +242,21 @@ def fetch_job_posting_text(url: str) -> str:
         str: The cleaned text content of the job posting. If an error occurs during
              the fetching process, an empty string is returned.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
     try:
         logger.info(f"Fetching job posting from URL: {url}")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        logger.info(f"Successfully fetched job posting. Status code: {response.status_code}")
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text
-        text = soup.get_text()
-        
-        # Break into lines and remove leading and trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
+        page = job_page_cache.get(url)
+        if page.status_code >= 400:
+            raise ValueError(f"Job posting request failed with status code {page.status_code}")
+        logger.info(f"Successfully fetched job posting. Status code: {page.status_code}")
+
+        text = page.text
         logger.info(f"Extracted text (first 500 chars): {text[:500]}...")
         return text
     except Exception as e:
         logger.error(f"Error fetching job posting: {str(e)}", exc_info=True)
         return ""
 
-def answer_question(question: str, context: str) -> Dict[str, float]:
+def answer_question(question: str, context: Union[str, JobPage]) -> Dict[str, float]:
     """
     Generate an answer to a given question based on the provided context using a pre-trained language model.
 
@@ -146,7 +266,9 @@ def answer_question(question: str, context: str) -> Dict[str, float]:
 
     Args:
         question (str): The question for which an answer is sought.
-        context (str): The context or passage of text within which the answer is to be found.
+        context (Union[str, JobPage]): The context or passage of text within which the answer is
+                                       to be found, or a posting page, in which case the sections
+                                       best matching the question are used (see `JobPage.context_for`).
 
     Returns:
         Dict[str, float]: A dictionary containing the predicted answer and its confidence score.
@@ -156,9 +278,17 @@ def answer_question(question: str, context: str) -> Dict[str, float]:
                             derived from the model's logits.
 
     Note:
-        The function assumes that the tokenizer and model are pre-initialized and available in the
-        global scope. It also assumes the use of PyTorch for tensor operations.
+        When MODEL_SERVER_ADDRESS is set the question is sent to the shared model server
+        (see `src.core.model_server`); otherwise this process's own tokenizer and model are
+        used, loaded on first use. It also assumes the use of PyTorch for tensor operations.
     """
+    if isinstance(context, JobPage):
+        context = context.context_for(question)
+    if model_client is not None:
+        return model_client.answer(question, context)
+
+    import torch
+
     inputs = tokenizer(question, context, return_tensors="pt", max_length=384, truncation=True)
     
     with torch.no_grad():
@@ -170,8 +300,8 @@ def answer_question(question: str, context: str) -> Dict[str, float]:
     
     confidence = torch.max(outputs.start_logits) + torch.max(outputs.end_logits)
     
-    print(f"Raw answer: {answer}")
-    print(f"Answer start: {answer_start}, Answer end: {answer_end}")
+    logger.debug(f"Raw answer: {answer}")
+    logger.debug(f"Answer start: {answer_start}, Answer end: {answer_end}")
     
     # Remove special tokens from the answer
     answer = answer.replace("<s>", "").replace("</s>", "").strip()
@@ -0,0 +1,238 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from src.utils.fingerprint import estimate_similarity, lsh_buckets
+
+# Query parameters that only track where a click came from, not which job it is
+TRACKING_PARAMETERS = {
+    'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'gh_src', 'lever-source', 'lever-origin',
+    'source', 'src', 'ref', 'refid', 'referrer', 'trk', 'trkinfo', 'trackingid', 'originalsubdomain',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    normalized_url TEXT NOT NULL UNIQUE,
+    page_id TEXT,
+    company TEXT,
+    title TEXT,
+    job_details TEXT,
+    cover_letter TEXT,
+    folder_path TEXT,
+    doc_path TEXT,
+    pdf_path TEXT,
+    signature TEXT,
+    stage TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_page_id ON postings (page_id);
+CREATE INDEX IF NOT EXISTS idx_postings_company_title ON postings (company COLLATE NOCASE, title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_postings_status ON postings (status, stage);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    posting_id INTEGER NOT NULL REFERENCES postings (id),
+    PRIMARY KEY (band, bucket, posting_id)
+) WITHOUT ROWID;
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a job posting URL so reposts of the same link compare equal.
+
+    Lower-cases the scheme and host, drops a leading 'www.', the fragment,
+    trailing slashes and tracking query parameters (utm_*, gh_src, trk, ...),
+    and sorts the remaining parameters.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMETERS
+    )
+    return urlunsplit((parts.scheme.lower() or 'https', host, parts.path.rstrip('/'), urlencode(query), ''))
+
+
+class JobStore:
+    """
+    Embedded SQLite store of processed job postings.
+
+    Each posting row holds the URL (unique by normalized form), Notion page
+    ID, extracted details, generated letter, artifact paths and the last
+    pipeline stage with its status. Indexes on normalized URL, page ID and
+    company/title make lookups logarithmic in the number of postings.
+    Postings' MinHash signatures are banded into an LSH bucket table, so
+    near-duplicates are found without comparing against every posting.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(SCHEMA)
+            columns = {row['name'] for row in self._connection.execute('PRAGMA table_info(postings)')}
+            if 'signature' not in columns:
+                # Stores created before near-duplicate detection
+                self._connection.execute('ALTER TABLE postings ADD COLUMN signature TEXT')
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _row_to_dict(self, row) -> Optional[dict]:
+        """Return a row as a dict with job_details and signature decoded, or None."""
+        if row is None:
+            return None
+        record = dict(row)
+        for column in ('job_details', 'signature'):
+            record[column] = json.loads(record[column]) if record[column] else None
+        return record
+
+    def _query_one(self, sql: str, params: tuple) -> Optional[dict]:
+        with self._lock:
+            return self._row_to_dict(self._connection.execute(sql, params).fetchone())
+
+    def find_by_url(self, url: str) -> Optional[dict]:
+        """Return the posting stored for a URL (compared in normalized form), if any."""
+        return self._query_one('SELECT * FROM postings WHERE normalized_url = ?', (normalize_url(url),))
+
+    def find_by_page_id(self, page_id: str) -> Optional[dict]:
+        """Return the most recently updated posting for a Notion page, if any."""
+        return self._query_one(
+            'SELECT * FROM postings WHERE page_id = ? ORDER BY updated_at DESC LIMIT 1', (page_id,))
+
+    def find_by_company_title(self, company: str, title: str) -> List[dict]:
+        """Return all postings with the given company and job title (case-insensitive)."""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT * FROM postings WHERE company = ? COLLATE NOCASE AND title = ? COLLATE NOCASE '
+                'ORDER BY updated_at DESC', (company, title)).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def find(self, url: str, page_id: Optional[str] = None) -> Optional[dict]:
+        """Return the posting for a URL, falling back to the Notion page ID."""
+        record = self.find_by_url(url)
+        if record is None and page_id:
+            record = self.find_by_page_id(page_id)
+        return record
+
+    def record_stage(self, url: str, stage: str, status: str = 'ok', error: Optional[str] = None,
+                     page_id: Optional[str] = None, job_details: Optional[dict] = None,
+                     signature: Optional[List[int]] = None, **fields):
+        """
+        Insert or update a posting after a pipeline stage.
+
+        Only the values given are written; existing values are kept otherwise.
+
+        Args:
+            url (str): The job posting URL.
+            stage (str): The pipeline stage that finished or failed.
+            status (str): 'ok' or 'failed'.
+            error (Optional[str]): The error message for a failed stage.
+            page_id (Optional[str]): The Notion page ID.
+            job_details (Optional[dict]): The extracted job details.
+            signature (Optional[List[int]]): The MinHash signature of the page text.
+            **fields: Any of cover_letter, folder_path, doc_path, pdf_path.
+        """
+        now = datetime.now().isoformat()
+        values = {'url': url, 'stage': stage, 'status': status, 'error': error, 'updated_at': now}
+        if page_id:
+            values['page_id'] = page_id
+        if job_details is not None:
+            values.update(job_details=json.dumps(job_details),
+                          company=job_details.get('Company') or None,
+                          title=job_details.get('Job Title') or None)
+        if signature is not None:
+            values['signature'] = json.dumps(signature)
+        values.update({key: value for key, value in fields.items()
+                       if key in ('cover_letter', 'folder_path', 'doc_path', 'pdf_path') and value is not None})
+
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in values)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO postings (normalized_url, created_at, {columns}) VALUES (?, ?, {placeholders}) "
+                f"ON CONFLICT (normalized_url) DO UPDATE SET {updates}",
+                (normalize_url(url), now, *values.values()),
+            )
+            if signature is not None:
+                posting_id = self._connection.execute(
+                    'SELECT id FROM postings WHERE normalized_url = ?', (normalize_url(url),)).fetchone()[0]
+                self._connection.execute('DELETE FROM lsh_buckets WHERE posting_id = ?', (posting_id,))
+                self._connection.executemany(
+                    'INSERT OR IGNORE INTO lsh_buckets (band, bucket, posting_id) VALUES (?, ?, ?)',
+                    [(band, bucket, posting_id) for band, bucket in lsh_buckets(signature)])
+
+    def find_similar(self, signature: List[int], threshold: float,
+                     exclude_url: Optional[str] = None) -> Optional[dict]:
+        """
+        Return the stored posting most similar to a signature, if similar enough.
+
+        Candidates are the postings sharing an LSH bucket with the signature;
+        their estimated similarity is then checked against the threshold.
+
+        Args:
+            signature (List[int]): The MinHash signature of a page's text.
+            threshold (float): The minimum estimated Jaccard similarity.
+            exclude_url (Optional[str]): A URL whose own posting is not a match.
+
+        Returns:
+            Optional[dict]: The best matching posting with its 'similarity' added,
+                            or None if no posting reaches the threshold.
+        """
+        excluded = normalize_url(exclude_url) if exclude_url else None
+        buckets = lsh_buckets(signature)
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT * FROM postings WHERE id IN (SELECT posting_id FROM lsh_buckets WHERE '
+                + ' OR '.join('(band = ? AND bucket = ?)' for _ in buckets) + ')',
+                [value for pair in buckets for value in pair],
+            ).fetchall()
+        best = None
+        for row in rows:
+            record = self._row_to_dict(row)
+            if record['normalized_url'] == excluded or not record['signature']:
+                continue
+            record['similarity'] = estimate_similarity(signature, record['signature'])
+            if record['similarity'] >= threshold and (best is None or record['similarity'] > best['similarity']):
+                best = record
+        return best
+
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Return the number of postings per "<stage>:<status>", for reporting.
+
+        Returns:
+            Dict[str, int]: e.g. {'notion:ok': 120, 'extract:failed': 3}.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT stage, status, COUNT(*) FROM postings GROUP BY stage, status').fetchall()
+        return {f"{stage}:{status}": count for stage, status, count in rows}
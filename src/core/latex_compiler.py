@@ -0,0 +1,136 @@
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from src.utils.config import (
+    LATEX_WORKERS, LATEX_QUEUE_SIZE, LATEX_TIMEOUT, LATEX_MEMORY_LIMIT_MB
+)
+from src.utils.deadline import DeadlineExceeded, check_deadline, time_remaining
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LatexQueueFullError(RuntimeError):
+    """Raised when every compile worker is busy and the wait queue is full."""
+
+
+def limited_command(command: List[str], timeout: float, memory_limit_mb: int) -> List[str]:
+    """
+    Wrap a command with `prlimit` caps on address space and CPU time, if available.
+
+    Args:
+        command (List[str]): The command to run.
+        timeout (float): Wall-clock timeout in seconds; also used as the CPU time cap.
+        memory_limit_mb (int): Address space cap in MiB; 0 disables the caps.
+
+    Returns:
+        List[str]: The wrapped command, or the command itself where prlimit is missing.
+    """
+    prlimit = shutil.which('prlimit')
+    if not memory_limit_mb or prlimit is None:
+        return command
+    return [prlimit, f'--as={memory_limit_mb * 1024 * 1024}', f'--cpu={max(1, int(timeout))}', '--', *command]
+
+
+class LatexCompiler:
+    """
+    Fixed-size pool of xelatex workers with a bounded wait queue.
+
+    At most `workers` compiles run at once; up to `queue_size` more wait for a
+    free worker and any beyond that are rejected at once with
+    LatexQueueFullError rather than piling up. Each compile runs in its own
+    build directory with shell escape disabled, a wall-clock timeout and,
+    where `prlimit` is available, memory and CPU limits. The timeout runs from
+    the start of the compile, and is cut short by the caller's request
+    deadline, which also counts time spent queued. Queue
+    wait and compile time are recorded under 'latex.queue_wait' and
+    'latex.compile'.
+    """
+
+    def __init__(self, workers: int = LATEX_WORKERS, queue_size: int = LATEX_QUEUE_SIZE,
+                 timeout: float = LATEX_TIMEOUT, memory_limit_mb: int = LATEX_MEMORY_LIMIT_MB):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._slots = threading.BoundedSemaphore(self.workers + max(0, queue_size))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='xelatex')
+
+    def compile(self, tex_path: str, output_dir: str, texinputs: Optional[str] = None) -> subprocess.CompletedProcess:
+        """
+        Compile a .tex file to PDF on the worker pool, waiting for the result.
+
+        Args:
+            tex_path (str): The LaTeX source, inside `output_dir`.
+            output_dir (str): The job's own build directory, also the working directory.
+            texinputs (Optional[str]): A directory searched for classes and styles
+                                       before the TeX defaults.
+
+        Returns:
+            subprocess.CompletedProcess: The finished xelatex run.
+
+        Raises:
+            LatexQueueFullError: If the pool and its queue are full.
+            subprocess.CalledProcessError: If xelatex fails.
+            subprocess.TimeoutExpired: If xelatex runs longer than the timeout (it is killed).
+            DeadlineExceeded: If the request deadline passes before xelatex starts.
+        """
+        # The deadline is per thread, so the worker gets the cut-off time rather than the deadline itself
+        check_deadline()
+        remaining = time_remaining()
+        until = None if remaining is None else time.monotonic() + remaining
+        if not self._slots.acquire(blocking=False):
+            metrics.increment('latex.rejected')
+            raise LatexQueueFullError(
+                f"LaTeX compile queue is full ({self.workers} running, all queue slots taken)")
+        submitted = time.perf_counter()
+        try:
+            future = self._executor.submit(self._run, tex_path, output_dir, texinputs, submitted, until)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def _run(self, tex_path: str, output_dir: str, texinputs: Optional[str], submitted: float,
+             until: Optional[float]):
+        """Run xelatex for one job on a worker thread, for at most the timeout and never past monotonic time `until`."""
+        metrics.observe('latex.queue_wait', time.perf_counter() - submitted)
+        # The compile's own timeout starts now; only the request deadline counts time spent queued
+        timeout = self.timeout if until is None else min(self.timeout, until - time.monotonic())
+        if timeout <= 0:
+            metrics.increment('latex.timeouts')
+            raise DeadlineExceeded(f"Request deadline passed while {tex_path} was queued for LaTeX")
+        env = dict(os.environ)
+        if texinputs:
+            env['TEXINPUTS'] = f"{texinputs}{os.pathsep}"
+        command = limited_command(
+            ['xelatex', '-interaction=nonstopmode', '-halt-on-error', '-no-shell-escape',
+             '-output-directory', output_dir, tex_path],
+            timeout, self.memory_limit_mb,
+        )
+        try:
+            with metrics.timer('latex.compile'):
+                return subprocess.run(
+                    command,
+                    cwd=output_dir,
+                    env=env,
+                    timeout=timeout,
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True
+                )
+        except subprocess.TimeoutExpired:
+            metrics.increment('latex.timeouts')
+            logger.error(f"LaTeX compilation of {tex_path} timed out after {timeout:.0f}s")
+            raise
+        except Exception:
+            metrics.increment('latex.failed')
+            raise
+
+
+# Process-wide compiler shared by every document render
+latex_compiler = LatexCompiler()
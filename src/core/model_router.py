@@ -0,0 +1,104 @@
+import logging
+import time
+from typing import Any, Callable, Dict, Sequence
+from src.core.rate_governor import RateLimitedError, openai_governor
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.deadline import DeadlineExceeded
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Errors that a stronger tier cannot fix: the request is out of time or the API is refusing calls
+NO_ESCALATION_ERRORS = (DeadlineExceeded, CircuitOpenError, RateLimitedError)
+
+
+def route_completion(client, task: str, tiers: Sequence[str], messages: list,
+                     parse: Callable[[Any], Any], validate: Callable[[Any], bool], **kwargs) -> Any:
+    """
+    Run a chat completion on the cheapest model tier that produces an acceptable answer.
+
+    Tiers are tried in order. Each response is parsed and validated; a tier that
+    raises, or whose answer fails validation, escalates to the next tier. The
+    last tier's answer is returned even if it fails validation, since there is
+    nothing stronger to escalate to; its errors propagate to the caller. A
+    passed deadline, an open circuit breaker or exhausted rate-limit retries
+    are raised at once, as another tier would only fail the same way.
+
+    Per-tier latency, call, rejection and error counts and per-task escalation
+    counts are recorded in the metrics registry under `model_router.<task>`.
+    Every call goes through the process-wide `openai_governor`, which queues
+    it within the account's rate limits and retries rate-limited requests.
+
+    Args:
+        client: The OpenAI client.
+        task (str): A short name for the call site, e.g. 'extraction'.
+        tiers (Sequence[str]): Model names, cheapest and fastest first.
+        messages (list): The chat messages to send.
+        parse (Callable[[Any], Any]): Turns a completion response into a result.
+        validate (Callable[[Any], bool]): Returns True if a parsed result is acceptable.
+        **kwargs: Extra arguments for `chat.completions.create` (e.g. max_tokens).
+
+    Returns:
+        Any: The parsed result from the first tier that passed validation.
+    """
+    metrics.increment(f'model_router.{task}.requests')
+    for index, tier in enumerate(tiers):
+        is_last = index == len(tiers) - 1
+        metrics.increment(f'model_router.{task}.{tier}.calls')
+        start = time.perf_counter()
+        try:
+            response = openai_governor.create(client, model=tier, messages=messages, **kwargs)
+            result = parse(response)
+        except NO_ESCALATION_ERRORS:
+            metrics.increment(f'model_router.{task}.{tier}.errors')
+            raise
+        except Exception as e:
+            metrics.increment(f'model_router.{task}.{tier}.errors')
+            if is_last:
+                raise
+            logger.warning(f"{task} on {tier} failed, escalating: {e}")
+            metrics.increment(f'model_router.{task}.escalations')
+            continue
+        finally:
+            metrics.observe(f'model_router.{task}.{tier}', time.perf_counter() - start)
+
+        if validate(result):
+            return result
+        metrics.increment(f'model_router.{task}.{tier}.rejected')
+        if is_last:
+            logger.warning(f"{task} answer from {tier} failed validation; no stronger tier to try")
+            return result
+        logger.info(f"{task} answer from {tier} failed validation, escalating")
+        metrics.increment(f'model_router.{task}.escalations')
+
+
+def routing_stats(task: str, tiers: Sequence[str]) -> Dict[str, Any]:
+    """
+    Return latency and escalation statistics for a routed task.
+
+    Args:
+        task (str): The task name passed to `route_completion`.
+        tiers (Sequence[str]): The tiers to report on.
+
+    Returns:
+        Dict[str, Any]: The number of requests, the escalation rate (escalations
+                        per request) and, for each tier, its calls, errors,
+                        rejections and mean latency in seconds.
+    """
+    snapshot = metrics.snapshot()
+    counters = snapshot['counters']
+    requests = counters.get(f'model_router.{task}.requests', 0)
+    escalations = counters.get(f'model_router.{task}.escalations', 0)
+    return {
+        'requests': requests,
+        'escalation_rate': escalations / requests if requests else 0.0,
+        'tiers': {
+            tier: {
+                'calls': counters.get(f'model_router.{task}.{tier}.calls', 0),
+                'errors': counters.get(f'model_router.{task}.{tier}.errors', 0),
+                'rejected': counters.get(f'model_router.{task}.{tier}.rejected', 0),
+                'mean_seconds': snapshot['timings'].get(f'model_router.{task}.{tier}', {}).get('mean', 0.0),
+            }
+            for tier in tiers
+        },
+    }
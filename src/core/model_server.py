@@ -0,0 +1,258 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional, Tuple, Union
+from src.utils.config import (
+    MODEL_SERVER_ADDRESS, MODEL_SERVER_AUTHKEY, MODEL_BATCH_SIZE, MODEL_BATCH_WAIT_MS, MODEL_SERVER_TIMEOUT
+)
+from src.utils.deadline import call_timeout, check_deadline
+from src.utils.lazy import LazyObject
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Address = Union[str, Tuple[str, int]]
+
+
+class ModelServerError(RuntimeError):
+    """Raised when the model server cannot be reached or fails to answer."""
+
+
+def parse_address(value: str) -> Address:
+    """
+    Parse a model server address.
+
+    Args:
+        value (str): A Unix socket path, or "host:port" for TCP.
+
+    Returns:
+        Address: The socket path, or a (host, port) tuple.
+    """
+    host, _, port = value.rpartition(':')
+    if host and port.isdigit() and os.sep not in value:
+        return host, int(port)
+    return value
+
+
+def answer_batch(questions: List[str], contexts: List[str], tokenizer, model) -> List[Dict[str, float]]:
+    """
+    Answer several questions in one forward pass of the local model.
+
+    The batched form of `job_parser.answer_question`: each question/context
+    pair is padded into a single tensor batch and its answer span and
+    confidence are read from that pair's row of the output logits.
+
+    Args:
+        questions (List[str]): The questions.
+        contexts (List[str]): The passage to answer each question from.
+        tokenizer: The Hugging Face tokenizer.
+        model: The model.
+
+    Returns:
+        List[Dict[str, float]]: An {"answer", "confidence"} dictionary per question, in order.
+    """
+    import torch
+
+    inputs = tokenizer(questions, contexts, return_tensors="pt", max_length=384, truncation=True, padding=True)
+    with torch.no_grad():
+        outputs = model(**inputs)
+
+    results = []
+    for i in range(len(questions)):
+        answer_start = torch.argmax(outputs.start_logits[i])
+        answer_end = torch.argmax(outputs.end_logits[i]) + 1
+        answer = tokenizer.decode(inputs["input_ids"][i][answer_start:answer_end])
+        confidence = torch.max(outputs.start_logits[i]) + torch.max(outputs.end_logits[i])
+        results.append({
+            "answer": answer.replace("<s>", "").replace("</s>", "").strip(),
+            "confidence": float(confidence.item()),
+        })
+    return results
+
+
+class ModelServer:
+    """
+    Sidecar process that owns the local tokenizer and model.
+
+    Web workers send (question, context) pairs over a local socket instead of
+    loading the model themselves. Each connection is served on its own thread;
+    a single batching thread collects pending questions from all of them, up to
+    `max_batch` at a time or until the oldest has waited `max_wait` seconds,
+    and answers the batch in one forward pass. Batch sizes and timings are
+    recorded under 'model_server.*'.
+    """
+
+    def __init__(self, address: Address, tokenizer, model, max_batch: int = MODEL_BATCH_SIZE,
+                 max_wait: float = MODEL_BATCH_WAIT_MS / 1000, authkey: Optional[bytes] = None):
+        if isinstance(address, tuple) and not authkey:
+            raise ValueError("A TCP model server address needs MODEL_SERVER_AUTHKEY")
+        self.address = address
+        self.tokenizer = tokenizer
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.authkey = authkey
+        self._pending = queue.Queue()
+        self._listener = None
+        self._closed = threading.Event()
+        self._batcher = threading.Thread(target=self._batch_loop, name='model-batcher', daemon=True)
+        self._batcher.start()
+
+    def submit(self, question: str, context: str) -> Future:
+        """Queue a question for the next batch and return a future for its answer."""
+        future = Future()
+        self._pending.put((question, context, future))
+        return future
+
+    def _next_batch(self) -> list:
+        """Block for one pending question, then gather more until the batch is full or max_wait passes."""
+        batch = [self._pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while batch[-1] is not None and len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if batch:
+                self._answer(batch)
+            if stop:
+                return
+
+    def _answer(self, batch: list):
+        metrics.increment('model_server.batches')
+        metrics.increment('model_server.questions', len(batch))
+        try:
+            with metrics.timer('model_server.batch'):
+                answers = answer_batch([q for q, _, _ in batch], [c for _, c, _ in batch], self.tokenizer, self.model)
+        except Exception as e:
+            logger.error(f"Model batch of {len(batch)} failed: {e}", exc_info=True)
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), answer in zip(batch, answers):
+            future.set_result(answer)
+
+    def serve_forever(self):
+        """Load the model, then accept worker connections until `close` is called."""
+        for dependency in (self.tokenizer, self.model):
+            if isinstance(dependency, LazyObject):
+                dependency.resolve()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)  # left behind by a previous run
+        self._listener = Listener(self.address, authkey=self.authkey)
+        logger.info(f"Model server listening on {self.address}")
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed.is_set():
+                    break
+                logger.warning("Model server failed to accept a connection", exc_info=True)
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), name='model-conn', daemon=True).start()
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    question, context = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send({'answer': self.submit(question, context).result()})
+                except Exception as e:
+                    conn.send({'error': f"{type(e).__name__}: {e}"})
+
+    def close(self):
+        """Stop accepting connections and finish the questions already queued."""
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+        self._pending.put(None)
+        self._batcher.join()
+
+
+class ModelClient:
+    """
+    Connection from a worker process to the model server.
+
+    Each thread keeps its own connection, opened on first use and reopened
+    once if the server was restarted in between. Each answer is awaited for
+    at most `timeout` seconds or until the request deadline, whichever is
+    sooner.
+    """
+
+    def __init__(self, address: Address, authkey: Optional[bytes] = None, timeout: float = MODEL_SERVER_TIMEOUT):
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def answer(self, question: str, context: str) -> Dict[str, float]:
+        """
+        Answer a question through the model server, as `job_parser.answer_question` would.
+
+        Args:
+            question (str): The question.
+            context (str): The passage to answer it from.
+
+        Returns:
+            Dict[str, float]: The "answer" and its "confidence".
+
+        Raises:
+            ModelServerError: If the server is unreachable, times out or fails.
+            DeadlineExceeded: If the request deadline passes before the answer arrives.
+        """
+        for attempt in range(2):
+            timeout = call_timeout(self.timeout)
+            conn = self._connection()
+            try:
+                conn.send((question, context))
+                if not conn.poll(timeout):
+                    # The late answer would be read as the reply to the next question, so the connection is dropped
+                    self._drop()
+                    check_deadline()
+                    raise ModelServerError(f"Model server at {self.address} did not answer within {timeout:.1f}s")
+                reply = conn.recv()
+                break
+            except (EOFError, OSError) as e:
+                self._drop()
+                if attempt:
+                    raise ModelServerError(f"Lost connection to model server at {self.address}: {e}") from e
+        if 'error' in reply:
+            raise ModelServerError(reply['error'])
+        return reply['answer']
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = self._local.conn = Client(self.address, authkey=self.authkey)
+            except OSError as e:
+                raise ModelServerError(f"Cannot connect to model server at {self.address}: {e}") from e
+        return conn
+
+    def _drop(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+
+# Process-wide client, set when MODEL_SERVER_ADDRESS points at a running model server
+model_client = ModelClient(parse_address(MODEL_SERVER_ADDRESS), MODEL_SERVER_AUTHKEY.encode() or None) \
+    if MODEL_SERVER_ADDRESS else None
@@ -0,0 +1,381 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+from src.core.job_parser import extract_job_details
+from src.core.cover_letter import generate_cover_letter
+from src.core.document_handler import save_cover_letter_documents
+from src.api.notion_client import update_notion_database, is_page_archived, unarchive_page
+from src.core.job_store import JobStore
+from src.core.scheduler import DeadlineQueue
+from src.utils.config import DEDUPE_THRESHOLD, PIPELINE_JOB_DEADLINE
+from src.utils.deadline import request_deadline
+from src.utils.fingerprint import minhash_signature
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, in order
+STAGES = ('extract', 'generate', 'save', 'notion')
+
+# Worker threads per stage when not configured otherwise
+DEFAULT_CONCURRENCY = {'extract': 4, 'generate': 4, 'save': 2, 'notion': 2}
+
+# Job state saved in the checkpoint log after each stage
+STATE_FIELDS = ('url', 'page_id', 'job_details', 'cover_letter', 'folder_path', 'doc_path', 'pdf_path')
+
+
+class PipelineJob:
+    """
+    One job posting moving through the pipeline.
+
+    Attributes:
+        url (str): The job posting URL.
+        page_id (Optional[str]): The Notion page to update, if any.
+        priority (int): Scheduling priority, e.g. from the Notion "Priority" property (see `scheduler`).
+        deadline (Optional[date]): The application deadline, if known before extraction.
+        completed (Optional[str]): The last stage that finished for this job.
+        error (Optional[str]): The error message if a stage failed.
+        time_left (float): Seconds of stage run time the job has left (PIPELINE_JOB_DEADLINE to start).
+    """
+
+    def __init__(self, url: str, page_id: Optional[str] = None, priority: int = 0,
+                 deadline: Optional[date] = None):
+        self.url = url
+        self.page_id = page_id
+        self.priority = priority
+        self.deadline = deadline
+        self.queued_at = None
+        self.job_details = None
+        self.cover_letter = None
+        self.folder_path = None
+        self.doc_path = None
+        self.pdf_path = None
+        self.signature = None
+        self.completed = None
+        self.error = None
+        self.time_left = PIPELINE_JOB_DEADLINE
+
+    @property
+    def key(self) -> str:
+        """Identify the job by its Notion page when it has one, otherwise by URL."""
+        return self.page_id or self.url
+
+    @property
+    def next_stage(self) -> Optional[str]:
+        """Return the stage this job runs next, or None if it is finished."""
+        if self.completed is None:
+            return STAGES[0]
+        index = STAGES.index(self.completed) + 1
+        return STAGES[index] if index < len(STAGES) else None
+
+    def state(self) -> dict:
+        """Return the job's resumable state as a JSON-serialisable dict."""
+        return {field: getattr(self, field) for field in STATE_FIELDS}
+
+    def restore(self, record: dict):
+        """Restore state and progress from a checkpoint record."""
+        for field in STATE_FIELDS:
+            if record.get(field) is not None:
+                setattr(self, field, record[field])
+        self.completed = record['stage']
+
+
+class CheckpointLog:
+    """
+    Append-only JSON-lines log of completed pipeline stages.
+
+    Every finished stage appends the job's full state, so after an
+    interruption each job resumes from the stage after its last record.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by the interruption; the stage will be redone
+                        continue
+                    if record.get('stage') in STAGES:
+                        self._records[record['key']] = record
+
+    def last_record(self, key: str) -> Optional[dict]:
+        """Return the latest completed-stage record for a job, if any."""
+        return self._records.get(key)
+
+    def record(self, job: PipelineJob, stage: str, error: Optional[str] = None):
+        """
+        Append a record for a finished (or failed) stage and flush it to disk.
+
+        Args:
+            job (PipelineJob): The job.
+            stage (str): The stage that finished.
+            error (Optional[str]): The error message if the stage failed.
+        """
+        record = {'key': job.key, 'time': datetime.now().isoformat()}
+        if error is None:
+            record.update(job.state(), stage=stage)
+        else:
+            record.update(failed_stage=stage, error=error)
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            if error is None:
+                self._records[job.key] = record
+
+
+def reuse_artifacts(job: PipelineJob, record: dict) -> bool:
+    """
+    Copy a stored posting's cover letter and document paths onto a job.
+
+    Args:
+        job (PipelineJob): The job.
+        record (dict): A posting from the job store.
+
+    Returns:
+        bool: True if the record had a complete set of artifacts to reuse.
+    """
+    if not all(record[field] for field in ('cover_letter', 'folder_path', 'doc_path', 'pdf_path')):
+        return False
+    job.cover_letter = record['cover_letter']
+    job.folder_path, job.doc_path, job.pdf_path = record['folder_path'], record['doc_path'], record['pdf_path']
+    return True
+
+
+def near_duplicate_finder(url: str, store: Optional[JobStore], lookup: dict) -> Callable[[str], Optional[dict]]:
+    """
+    Build the `find_duplicate` callback that `extract_job_details` calls with the cleaned page text.
+
+    The callback stores the text's MinHash signature in `lookup['signature']`
+    and, with a job store, looks for a stored posting under another URL whose
+    text is at least DEDUPE_THRESHOLD similar. A match is stored in
+    `lookup['duplicate']` and its job details are returned.
+
+    Args:
+        url (str): The posting URL, whose own stored posting is not a match.
+        store (Optional[JobStore]): The job store, if any.
+        lookup (dict): Filled with the signature and any match.
+
+    Returns:
+        Callable[[str], Optional[dict]]: The callback.
+    """
+    def find_duplicate(text):
+        lookup['signature'] = minhash_signature(text)
+        if store is None or lookup['signature'] is None:
+            return None
+        match = store.find_similar(lookup['signature'], DEDUPE_THRESHOLD, exclude_url=url)
+        if match is None or not match['job_details']:
+            return None
+        lookup['duplicate'] = match
+        return match['job_details']
+
+    return find_duplicate
+
+
+def run_extract(job: PipelineJob, store: Optional[JobStore] = None):
+    """
+    Extract the job details from the posting.
+
+    With a job store, the cleaned page text is fingerprinted and a stored
+    near-duplicate posting (a repost under another URL) supplies the details
+    and, if it has them, the letter and documents, skipping those stages
+    (see `near_duplicate_finder`).
+    """
+    lookup = {}
+    job.job_details = extract_job_details(job.url, find_duplicate=near_duplicate_finder(job.url, store, lookup))
+    job.job_details['Job URL'] = job.url
+    job.signature = lookup.get('signature')
+    duplicate = lookup.get('duplicate')
+    if duplicate:
+        logger.info(f"{job.key} is a near-duplicate ({duplicate['similarity']:.2f}) of {duplicate['url']}")
+        metrics.increment('pipeline.near_duplicates')
+        if reuse_artifacts(job, duplicate):
+            job.completed = 'save'
+
+
+def run_generate(job: PipelineJob, store: Optional[JobStore] = None):
+    """Generate the cover letter."""
+    job.cover_letter = generate_cover_letter(job.job_details)
+
+
+def run_save(job: PipelineJob, store: Optional[JobStore] = None):
+    """Render and save the cover letter documents."""
+    job.folder_path, job.doc_path, job.pdf_path = save_cover_letter_documents(job.job_details, job.cover_letter)
+
+
+def run_notion(job: PipelineJob, store: Optional[JobStore] = None):
+    """Update the job's Notion page, unarchiving it first if needed."""
+    if not job.page_id:
+        return
+    if is_page_archived(job.page_id):
+        unarchive_page(job.page_id)
+        logger.info(f"Page {job.page_id} was archived. It has been unarchived.")
+    update_notion_database(job.page_id, job.job_details, job.folder_path, job.doc_path, job.pdf_path)
+
+
+STAGE_FUNCTIONS = {'extract': run_extract, 'generate': run_generate, 'save': run_save, 'notion': run_notion}
+
+
+def reuse_prior_work(job: PipelineJob, store: JobStore) -> bool:
+    """
+    Fill a job from the store's record of an earlier run of the same posting.
+
+    Stored job details skip extraction; a stored letter and artifacts also
+    skip generation and saving. A posting already finished for the same
+    Notion page is marked complete. The Notion update still runs for a
+    different page that points at an already-processed posting.
+
+    Args:
+        job (PipelineJob): The job about to be queued.
+        store (JobStore): The job store.
+
+    Returns:
+        bool: True if any prior work was reused.
+    """
+    prior = store.find(job.url, job.page_id)
+    if prior is None or not prior['job_details']:
+        return False
+    job.job_details = dict(prior['job_details'], **{'Job URL': job.url})
+    job.completed = 'extract'
+    if reuse_artifacts(job, prior):
+        job.completed = 'save'
+        if prior['page_id'] == job.page_id and prior['stage'] == 'notion' and prior['status'] == 'ok':
+            job.completed = 'notion'
+    logger.info(f"Reusing stored work for {job.key} through the {job.completed} stage")
+    metrics.increment('pipeline.reused')
+    return True
+
+
+def run_pipeline(jobs: Iterable[PipelineJob], concurrency: Optional[Dict[str, int]] = None,
+                 checkpoint: Optional[CheckpointLog] = None, store: Optional[JobStore] = None) -> List[PipelineJob]:
+    """
+    Run jobs through extract -> generate -> save -> notion with per-stage worker pools.
+
+    Each stage has its own bounded set of worker threads and a queue feeding
+    it, so a slow stage (e.g. LaTeX compilation) does not hold up the others
+    beyond its own parallelism. Each queue hands out the most urgent job first,
+    by application deadline, priority and time waited (see `scheduler.schedule_key`). Jobs already finished according to the
+    checkpoint are skipped; partly finished jobs resume at their next stage.
+    With a job store, postings processed by earlier runs reuse their stored
+    details and artifacts (see `reuse_prior_work`), and every stage's outcome
+    is recorded in the store. A job's stages share a PIPELINE_JOB_DEADLINE
+    budget; a stage that runs out of it fails with DeadlineExceeded.
+
+    Args:
+        jobs (Iterable[PipelineJob]): The jobs to process.
+        concurrency (Optional[Dict[str, int]]): Worker threads per stage;
+                                                missing stages use DEFAULT_CONCURRENCY.
+        checkpoint (Optional[CheckpointLog]): Log used to resume and record progress.
+        store (Optional[JobStore]): Store used to find and record processed postings.
+
+    Returns:
+        List[PipelineJob]: All jobs, with their final stage or error set.
+    """
+    concurrency = dict(DEFAULT_CONCURRENCY, **(concurrency or {}))
+    queues = {stage: DeadlineQueue() for stage in STAGES}
+
+    def enqueue(job):
+        stage = job.next_stage
+        if stage is not None:
+            queues[stage].put(job)
+
+    def worker(stage):
+        while True:
+            job = queues[stage].get()
+            if job is None:
+                queues[stage].task_done()
+                return
+            started = time.monotonic()
+            try:
+                # The job's deadline covers time spent in its stages, not time spent waiting in queues
+                with metrics.timer(f'pipeline.{stage}'), request_deadline(job.time_left):
+                    STAGE_FUNCTIONS[stage](job, store)
+                # A stage may skip later ones by marking them completed itself
+                if job.next_stage == stage:
+                    job.completed = stage
+                if checkpoint is not None:
+                    checkpoint.record(job, job.completed)
+                if store is not None:
+                    store.record_stage(job.url, job.completed, page_id=job.page_id, job_details=job.job_details,
+                                       signature=job.signature, cover_letter=job.cover_letter,
+                                       folder_path=job.folder_path, doc_path=job.doc_path, pdf_path=job.pdf_path)
+                metrics.increment(f'pipeline.{stage}.done')
+                enqueue(job)
+            except Exception as e:
+                job.error = f"{stage}: {e}"
+                logger.error(f"Pipeline stage {stage} failed for {job.key}: {e}", exc_info=True)
+                metrics.increment(f'pipeline.{stage}.failed')
+                if checkpoint is not None:
+                    checkpoint.record(job, stage, error=str(e))
+                if store is not None:
+                    store.record_stage(job.url, stage, status='failed', error=str(e), page_id=job.page_id)
+            finally:
+                job.time_left -= time.monotonic() - started
+                queues[stage].task_done()
+
+    all_jobs = []
+    for job in jobs:
+        job.queued_at = time.time()
+        record = checkpoint.last_record(job.key) if checkpoint is not None else None
+        if record is not None:
+            job.restore(record)
+        elif store is not None:
+            reuse_prior_work(job, store)
+        if job.next_stage is None:
+            logger.info(f"Skipping {job.key}: already completed")
+        all_jobs.append(job)
+        enqueue(job)
+
+    # Start the workers once the whole batch is queued, so the first jobs taken are the most urgent
+    threads = [
+        threading.Thread(target=worker, args=(stage,), name=f'pipeline-{stage}-{i}', daemon=True)
+        for stage in STAGES for i in range(max(1, concurrency[stage]))
+    ]
+    for thread in threads:
+        thread.start()
+
+    # A job is always queued for its next stage before the current stage is
+    # marked done, so joining the stages in order waits for every job
+    for stage in STAGES:
+        queues[stage].join()
+    for stage in STAGES:
+        for _ in range(max(1, concurrency[stage])):
+            queues[stage].put(None)
+    for thread in threads:
+        thread.join()
+    return all_jobs
+
+
+def parse_job_lines(lines: Iterable[str]) -> List[PipelineJob]:
+    """
+    Parse job input lines of the form "<url> [<notion page id>]".
+
+    Fields may be separated by whitespace, tabs or a comma. Blank lines and
+    lines starting with '#' are ignored, as are repeated jobs.
+
+    Args:
+        lines (Iterable[str]): The input lines.
+
+    Returns:
+        List[PipelineJob]: One job per distinct input line.
+    """
+    jobs = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.replace(',', ' ').split()
+        job = PipelineJob(fields[0], fields[1] if len(fields) > 1 else None)
+        jobs.setdefault(job.key, job)
+    return list(jobs.values())
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import time
+from itertools import takewhile
+from typing import Dict, List, Optional
+from src.api.notion_client import query_changed_pages, get_page_job_url, get_page_priority, get_page_deadline
+from src.core.job_store import JobStore
+from src.core.pipeline import CheckpointLog, PipelineJob, run_pipeline
+from src.core.scheduler import parse_priority
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CursorStore:
+    """
+    Durable poll cursor for the Notion jobs database.
+
+    Holds the newest last_edited_time handed to the pipeline and, for pages
+    edited at exactly that time, their IDs. Notion timestamps are only
+    minute-precise, so the next query starts *at* the cursor and the seen IDs
+    keep those pages from being processed twice. The file is replaced
+    atomically, so a crash never leaves a half-written cursor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.since = None
+        self.seen = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.since = state.get('last_edited_time')
+            self.seen = state.get('seen', [])
+
+    def is_new(self, page: dict) -> bool:
+        """Return True if a page has not been handed to the pipeline at its current edit time."""
+        return not (page['last_edited_time'] == self.since and page['id'] in self.seen)
+
+    def advance(self, pages: List[dict]):
+        """
+        Move the cursor past a processed batch and save it.
+
+        Args:
+            pages (List[dict]): The batch's Notion pages, in ascending edit order.
+        """
+        for page in pages:
+            if page['last_edited_time'] != self.since:
+                self.since = page['last_edited_time']
+                self.seen = []
+            self.seen.append(page['id'])
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_edited_time': self.since, 'seen': self.seen}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def poll_once(database_id: str, cursor: CursorStore, batch_size: int = 20,
+              concurrency: Optional[Dict[str, int]] = None,
+              checkpoint: Optional[CheckpointLog] = None,
+              store: Optional[JobStore] = None) -> List[PipelineJob]:
+    """
+    Send every new or changed row of the jobs database through the pipeline.
+
+    Rows are read with one paginated query from the cursor onwards and run in
+    batches of `batch_size`; the cursor is saved after each batch, so a restart
+    resumes after the last finished batch. Rows without a Job URL are skipped.
+    Each row's "Priority" and "Application Deadline" properties, if set,
+    order the pipeline's work queues.
+    The cursor never moves past the oldest row whose pipeline run failed, so
+    the next poll returns that row again and the checkpoint log lets it
+    resume. Rows after it that succeeded are not returned again, because the
+    query leaves out rows that already have a PDF.
+
+    Args:
+        database_id (str): The ID of the Notion jobs database.
+        cursor (CursorStore): The durable poll cursor.
+        batch_size (int): Rows sent to the pipeline at a time.
+        concurrency (Optional[Dict[str, int]]): Worker threads per pipeline stage.
+        checkpoint (Optional[CheckpointLog]): Pipeline checkpoint log.
+        store (Optional[JobStore]): Store of processed postings.
+
+    Returns:
+        List[PipelineJob]: The jobs processed in this poll.
+    """
+    processed = []
+    batch = []
+    # Set once a row fails; the cursor then stays at that row for the rest of the poll
+    held = False
+
+    def flush():
+        nonlocal held
+        jobs = [PipelineJob(get_page_job_url(page), page['id'], priority=parse_priority(get_page_priority(page)),
+                            deadline=get_page_deadline(page))
+                for page in batch if get_page_job_url(page)]
+        finished = run_pipeline(jobs, concurrency, checkpoint, store) if jobs else []
+        processed.extend(finished)
+        failed = {job.page_id for job in finished if job.error}
+        if failed:
+            logger.warning(f"{len(failed)} polled rows failed; they will be retried on the next poll")
+            metrics.increment('poller.failed', len(failed))
+        if not held:
+            done = list(takewhile(lambda page: page['id'] not in failed, batch))
+            held = len(done) < len(batch)
+            cursor.advance(done)
+        batch.clear()
+
+    for page in query_changed_pages(database_id, cursor.since):
+        if not cursor.is_new(page):
+            continue
+        metrics.increment('poller.pages')
+        batch.append(page)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    logger.info(f"Poll of {database_id} processed {len(processed)} jobs; cursor at {cursor.since}")
+    return processed
+
+
+def run_poller(database_id: str, cursor: CursorStore, interval: float = 60.0, **kwargs):
+    """
+    Poll the jobs database forever, sleeping `interval` seconds between polls.
+
+    Errors in one poll are logged and the next poll retries from the saved cursor.
+
+    Args:
+        database_id (str): The ID of the Notion jobs database.
+        cursor (CursorStore): The durable poll cursor.
+        interval (float): Seconds between polls.
+        **kwargs: Passed to `poll_once` (batch_size, concurrency, checkpoint, store).
+    """
+    while True:
+        try:
+            poll_once(database_id, cursor, **kwargs)
+        except Exception as e:
+            logger.error(f"Notion poll failed: {e}", exc_info=True)
+        time.sleep(interval)
@@ -0,0 +1,265 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+from src.utils.text_processing import iter_token_spans
+
+logger = logging.getLogger(__name__)
+
+# Fields extracted from every job posting, in the order they are requested
+JOB_DETAIL_FIELDS = ['Job Title', 'Company', 'Location', 'Experience Level', 'Application Deadline', 'Salary Range']
+
+# Fields that must be filled before the model can be skipped for a posting
+REQUIRED_JOB_DETAIL_FIELDS = ['Job Title', 'Company', 'Location']
+
+# How each field is described to the model: (question, answer placeholder)
+FIELD_PROMPTS = {
+    'Job Title': ('Job Title', '[extracted job title]'),
+    'Company': ('Company', '[extracted company name]'),
+    'Location': ('Location', '[extracted location]'),
+    'Experience Level': ('Experience Level Required', '[extracted experience level]'),
+    'Application Deadline': ('Application Deadline', '[extracted deadline]'),
+    'Salary Range': ('Salary Range (if available)', '[extracted salary range or "Not specified" if not found]'),
+}
+
+# Keywords that mark a block of the page as useful for extraction, with weights
+SECTION_KEYWORDS = {
+    'title': (3.0, ['job title', 'position', 'title', 'role', 'opening', 'vacancy']),
+    'company': (2.0, ['company', 'about us', 'employer', 'university', 'department', 'school of', 'organization']),
+    'location': (2.0, ['location', 'remote', 'hybrid', 'on-site', 'onsite', 'office', 'campus']),
+    'requirements': (1.5, ['requirement', 'qualification', 'experience', 'degree', 'ph.d', 'phd', 'years of', 'senior', 'junior']),
+    'compensation': (2.0, ['salary', 'compensation', 'pay range', 'per year', 'per hour', 'annual', '$', 'benefits']),
+    'deadline': (2.5, ['deadline', 'apply by', 'closing date', 'review of applications', 'applications received', 'posted']),
+}
+
+# Characters per token used when no local tokenizer is available
+APPROX_CHARS_PER_TOKEN = 4
+
+# tiktoken encoding for OpenAI models that tiktoken does not know by name (the GPT-4o family's)
+DEFAULT_OPENAI_ENCODING = 'o200k_base'
+
+# Output tokens allowed per requested field, plus a fixed allowance for formatting
+OUTPUT_TOKENS_PER_FIELD = 40
+OUTPUT_TOKENS_OVERHEAD = 20
+
+
+@lru_cache(maxsize=None)
+def openai_tokenizer(model: str):
+    """
+    Return the tiktoken encoding an OpenAI model uses, loaded on first use.
+
+    Models tiktoken does not know by name get DEFAULT_OPENAI_ENCODING. If
+    tiktoken is not installed or its encoding files cannot be fetched, None is
+    returned and token counts fall back to the character estimate.
+
+    Args:
+        model (str): The OpenAI model name, e.g. 'gpt-4o-mini'.
+
+    Returns:
+        The tiktoken encoding, or None.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed; estimating prompt tokens from character counts")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_OPENAI_ENCODING)
+    except Exception as e:
+        # Encoding files are downloaded on first use
+        logger.warning(f"Cannot load the tiktoken encoding for {model}; estimating prompt tokens: {e}")
+        return None
+
+
+def _is_tiktoken(tokenizer) -> bool:
+    """Return True for a tiktoken encoding, as opposed to a Hugging Face tokenizer."""
+    return hasattr(tokenizer, 'encode_ordinary')
+
+
+def count_tokens(text: str, tokenizer=None) -> int:
+    """
+    Count the tokens in a text.
+
+    Args:
+        text (str): The text to measure.
+        tokenizer: Optional tiktoken encoding (see `openai_tokenizer`) or Hugging
+                   Face tokenizer. If None, the count is approximated from the
+                   character length.
+
+    Returns:
+        int: The number of tokens in the text.
+    """
+    if not text:
+        return 0
+    if tokenizer is None:
+        return -(-len(text) // APPROX_CHARS_PER_TOKEN)
+    if _is_tiktoken(tokenizer):
+        return len(tokenizer.encode_ordinary(text))
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def _is_heading(line: str) -> bool:
+    """Return True if a cleaned page line looks like a section heading."""
+    words = line.split()
+    if not words or len(words) > 6 or line.endswith(('.', ',', ';')):
+        return False
+    return line.endswith(':') or line.isupper() or line.istitle()
+
+
+def split_sections(text: str) -> List[Tuple[int, int]]:
+    """
+    Split cleaned page text into heading-delimited sections.
+
+    A new section starts at every line that looks like a heading, so each
+    section holds a heading and the lines that follow it.
+
+    Args:
+        text (str): Newline-separated page text, as produced by the HTML cleaner.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) character spans of each section.
+    """
+    sections = []
+    section_start = 0
+    for match in re.finditer(r'[^\n]+', text):
+        if match.start() > section_start and _is_heading(match.group().strip()):
+            sections.append((section_start, match.start() - 1))
+            section_start = match.start()
+    if section_start < len(text):
+        sections.append((section_start, len(text)))
+    return sections
+
+
+def score_section(section_text: str, position: int) -> float:
+    """
+    Score how useful a section is for extracting job details.
+
+    Args:
+        section_text (str): The text of the section.
+        position (int): The index of the section on the page.
+
+    Returns:
+        float: A relevance score; higher is more useful.
+    """
+    lowered = section_text.lower()
+    score = sum(weight for weight, keywords in SECTION_KEYWORDS.values()
+                if any(keyword in lowered for keyword in keywords))
+    # The job title and employer are almost always at the top of the page
+    if position == 0:
+        score += SECTION_KEYWORDS['title'][0]
+    return score
+
+
+def select_sections(text: str, token_budget: int, tokenizer=None) -> str:
+    """
+    Pick the most relevant sections of a page that fit in a token budget.
+
+    Sections are ranked by `score_section`, added greedily until the budget is
+    spent, and returned in their original page order. A section that does not
+    fit whole is cut at a token boundary to use the remaining budget.
+
+    Args:
+        text (str): Newline-separated page text.
+        token_budget (int): The maximum number of tokens to return.
+        tokenizer: Optional tokenizer used to count tokens (see `count_tokens`).
+
+    Returns:
+        str: The selected page text.
+    """
+    if count_tokens(text, tokenizer) <= token_budget:
+        return text
+
+    sections = split_sections(text)
+    ranked = sorted(range(len(sections)),
+                    key=lambda i: score_section(text[sections[i][0]:sections[i][1]], i),
+                    reverse=True)
+
+    remaining = token_budget
+    selected = []
+    for index in ranked:
+        if remaining <= 0:
+            break
+        start, end = sections[index]
+        tokens = count_tokens(text[start:end], tokenizer)
+        if tokens > remaining:
+            end = _truncate_span(text, start, end, remaining, tokenizer)
+            tokens = remaining
+        selected.append((start, end))
+        remaining -= tokens
+
+    return '\n'.join(text[start:end] for start, end in sorted(selected) if end > start)
+
+
+def _truncate_span(text: str, start: int, end: int, max_tokens: int, tokenizer=None) -> int:
+    """Return the end offset of the first `max_tokens` tokens of text[start:end]."""
+    if tokenizer is None:
+        return start + max_tokens * APPROX_CHARS_PER_TOKEN
+    if _is_tiktoken(tokenizer):
+        tokens = tokenizer.encode_ordinary(text[start:end])[:max_tokens]
+        # The tokens are a byte prefix of the text; a character cut in half is dropped
+        return start + len(tokenizer.decode_bytes(tokens).decode('utf-8', errors='ignore'))
+    for _, span_end in iter_token_spans(text[start:end], max_tokens, 0, tokenizer):
+        return start + span_end
+    return start
+
+
+def output_token_limit(fields: Iterable[str] = JOB_DETAIL_FIELDS) -> int:
+    """
+    Return a `max_tokens` value large enough for the requested answer format.
+
+    Args:
+        fields (Iterable[str]): The job detail fields the model must return.
+
+    Returns:
+        int: The number of output tokens to allow.
+    """
+    return OUTPUT_TOKENS_OVERHEAD + OUTPUT_TOKENS_PER_FIELD * len(list(fields))
+
+
+def build_extraction_prompt(url: str, text: str, token_budget: int,
+                            fields: Iterable[str] = JOB_DETAIL_FIELDS, tokenizer=None,
+                            structured: bool = False) -> str:
+    """
+    Build the job detail extraction prompt for a page within a token budget.
+
+    Args:
+        url (str): The URL of the job posting.
+        text (str): The cleaned page text.
+        token_budget (int): The maximum number of tokens of page text to include.
+        fields (Iterable[str]): The job detail fields to ask for.
+        tokenizer: Optional tokenizer used to count tokens, normally the target
+                   model's tiktoken encoding (see `openai_tokenizer`).
+        structured (bool): If True, ask for a JSON object (used together with a
+                           schema-constrained `response_format`) instead of
+                           `Key: value` lines.
+
+    Returns:
+        str: The user prompt to send to the model.
+    """
+    fields = list(fields)
+    questions = '\n'.join(f"    {i}. {FIELD_PROMPTS[field][0]}" for i, field in enumerate(fields, 1))
+    page_text = select_sections(text, token_budget, tokenizer)
+    if structured:
+        return f"""
+    Extract the following information from the job posting at {url}:
+{questions}
+    Here's the content of the webpage:
+    {page_text}
+    Respond with a JSON object only. Use an empty string for any field not stated in the job description.
+    Only include the requested information as provided in the job description. No fake companies.
+    """
+    answer_format = '\n'.join(f"    {field}: {FIELD_PROMPTS[field][1]}" for field in fields)
+    return f"""
+    Extract the following information from the job posting at {url}:
+{questions}
+    Here's the content of the webpage:
+    {page_text}
+    Provide the information in the following format:
+{answer_format}
+    Ensure each piece of information is on a separate line and follows the exact format specified above.
+    Do not include any additional text, explanations, or formatting.
+    Only include the requested information as provided in the job description. No fake companies.
+    """
@@ -0,0 +1,94 @@
+import json
+import os
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from src.utils.config import CANDIDATE_PROFILE_PATH, TEMPLATES_DIR
+
+PROMPT_TEMPLATE_DIR = os.path.join(TEMPLATES_DIR, 'prompts')
+
+
+@lru_cache(maxsize=1)
+def _prompt_environment() -> Environment:
+    """Return the Jinja2 environment for prompt templates, created once per process."""
+    return Environment(
+        loader=FileSystemLoader(PROMPT_TEMPLATE_DIR),
+        undefined=StrictUndefined,
+        keep_trailing_newline=False,
+        auto_reload=False,
+    )
+
+
+def get_prompt_template(name: str):
+    """
+    Return a compiled prompt template.
+
+    Templates are compiled on first use and cached by the environment, so
+    rendering a prompt never re-reads or re-parses the template file.
+
+    Args:
+        name (str): The template file name in templates/prompts, e.g. 'cover_letter_user.j2'.
+
+    Returns:
+        jinja2.Template: The compiled template.
+    """
+    return _prompt_environment().get_template(name)
+
+
+@lru_cache(maxsize=None)
+def load_candidate_profile(path: str = CANDIDATE_PROFILE_PATH) -> dict:
+    """
+    Load a candidate profile file once per process.
+
+    A profile holds the letterhead fields (first_name, last_name, position,
+    address, phone, email, website, github, linkedin) and the biography used
+    in the cover letter prompt. Profiles are cached by path, so several
+    candidates can be served from one process. The returned dict is shared;
+    callers must not modify it.
+
+    Args:
+        path (str): The path to a JSON profile file.
+
+    Returns:
+        dict: The candidate profile.
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def cover_letter_system_prompt(profile_path: str = CANDIDATE_PROFILE_PATH) -> str:
+    """
+    Return the static system prompt (instructions, candidate profile and guidelines).
+
+    The prompt depends only on the profile, so it is rendered once per profile
+    and every request for that candidate starts with byte-identical text,
+    letting provider-side prompt caching reuse the prefix.
+
+    Args:
+        profile_path (str): The path to the candidate's profile file.
+
+    Returns:
+        str: The system prompt.
+    """
+    profile = load_candidate_profile(profile_path)
+    return get_prompt_template('cover_letter_system.j2').render(profile=profile)
+
+
+def build_cover_letter_messages(job_details: dict, profile_path: str = CANDIDATE_PROFILE_PATH) -> list:
+    """
+    Build the chat messages for generating a cover letter.
+
+    The stable system prompt comes first and the per-job fields last, so only
+    the tail of the request changes between postings.
+
+    Args:
+        job_details (dict): The extracted job details.
+        profile_path (str): The path to the candidate's profile file.
+
+    Returns:
+        list: The system and user messages.
+    """
+    return [
+        {"role": "system", "content": cover_letter_system_prompt(profile_path)},
+        {"role": "user", "content": get_prompt_template('cover_letter_user.j2').render(job_details=job_details)},
+    ]
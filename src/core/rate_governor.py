@@ -0,0 +1,265 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Mapping, Optional
+from src.core.prompt_builder import count_tokens
+from src.utils.circuit_breaker import circuit_breaker
+from src.utils.config import (
+    OPENAI_INITIAL_CONCURRENCY, OPENAI_MAX_CONCURRENCY, OPENAI_REQUESTS_PER_MINUTE,
+    OPENAI_TOKENS_PER_MINUTE, OPENAI_RATE_LIMIT_RETRIES, OPENAI_TIMEOUT
+)
+from src.utils.deadline import DeadlineExceeded, call_timeout, time_remaining
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+# Backoff for a rate limit or server error that came without a retry hint: base * 2**attempt, capped
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# openai's connection and timeout errors carry no status code; matched by name so openai stays a lazy import
+TRANSIENT_ERROR_NAMES = {'APIConnectionError', 'APITimeoutError'}
+
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class RateLimitedError(RuntimeError):
+    """Raised when a request is still rate limited after every retry."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an OpenAI reset duration such as "1s", "6m0s" or "20ms" into seconds.
+
+    Args:
+        value (Optional[str]): The header value; a plain number is taken as seconds.
+
+    Returns:
+        Optional[float]: The duration in seconds, or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_hint(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Return the seconds to wait from Retry-After style headers, if any."""
+    if not headers:
+        return None
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+    return parse_duration(headers.get('retry-after'))
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True for server errors, timeouts and connection failures, which are worth retrying."""
+    status = getattr(error, 'status_code', None)
+    return (status or 0) >= 500 or type(error).__name__ in TRANSIENT_ERROR_NAMES
+
+
+def estimate_tokens(messages: list, max_tokens: Optional[int]) -> int:
+    """Estimate the tokens a chat completion uses: the prompt plus the most it may generate."""
+    prompt = sum(count_tokens(str(message.get('content', ''))) for message in messages)
+    return prompt + (max_tokens or 0)
+
+
+class RateGovernor:
+    """
+    Process-wide admission control for OpenAI requests.
+
+    Callers queue in `create` until three conditions all hold:
+    - a concurrency slot is free;
+    - the request and token budget for the current minute has room;
+    - no rate-limit pause is in effect.
+
+    The concurrency limit adapts by AIMD: every success raises it by 1/limit
+    (about one more slot per round of requests), and every 429 halves it. It
+    always stays between 1 and `max_concurrency`.
+
+    The budget comes from the x-ratelimit-remaining/reset headers of recent
+    responses. Until those arrive, the configured per-minute limits apply
+    over a sliding window. A request counts there with its estimated tokens
+    until its response reports the actual usage.
+
+    A 429 or server error is retried after the server's Retry-After hint,
+    or after exponential backoff. All callers wait out that pause. Only
+    after `max_retries` does `create` raise.
+
+    Each attempt's timeout is OPENAI_TIMEOUT or the time left before the
+    request deadline, whichever is shorter. Queueing and retries stop at the
+    deadline. Repeated server errors open the 'openai' circuit breaker.
+    """
+
+    def __init__(self, initial_concurrency: int = OPENAI_INITIAL_CONCURRENCY,
+                 max_concurrency: int = OPENAI_MAX_CONCURRENCY,
+                 requests_per_minute: int = OPENAI_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = OPENAI_TOKENS_PER_MINUTE,
+                 max_retries: int = OPENAI_RATE_LIMIT_RETRIES):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(min(max(1, initial_concurrency), self.max_concurrency))
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._paused_until = 0.0
+        # Requests started in the last minute: [start time, tokens], estimated until the response arrives
+        self._window = deque()
+        # Budget reported by the API: kind -> [remaining, reset time]
+        self._budget = {}
+
+    def create(self, client, **kwargs) -> Any:
+        """
+        Run `client.chat.completions.create(**kwargs)` once the governor admits it.
+
+        Args:
+            client: The OpenAI client.
+            **kwargs: Arguments for `chat.completions.create` (model, messages, max_tokens, ...).
+
+        Returns:
+            Any: The completion response.
+
+        Raises:
+            RateLimitedError: If the request is still rate limited after every retry.
+            DeadlineExceeded: If the request deadline passes while queued.
+            CircuitOpenError: If OpenAI has been failing and its breaker is open.
+        """
+        estimate = estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens'))
+        for attempt in range(self.max_retries + 1):
+            entry = self._acquire(estimate)
+            try:
+                response, headers = self._send(client, dict(kwargs, timeout=call_timeout(OPENAI_TIMEOUT)))
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                rate_limited = status == 429
+                if not (rate_limited or is_transient(e)):
+                    self._release(outcome='failed')
+                    raise
+                headers = getattr(getattr(e, 'response', None), 'headers', None)
+                delay = retry_hint(headers) or min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                self._release(headers=headers, outcome='rate_limited' if rate_limited else 'failed', pause=delay)
+                metrics.increment('openai.rate_limited' if rate_limited else 'openai.transient_errors')
+                remaining = time_remaining()
+                if attempt == self.max_retries or (remaining is not None and remaining <= delay):
+                    if rate_limited:
+                        raise RateLimitedError(f"OpenAI rate limit persisted after {attempt + 1} attempts: {e}",
+                                               delay) from e
+                    raise
+                logger.warning(f"OpenAI request failed ({status or type(e).__name__}); "
+                               f"retrying in {delay:.1f}s with concurrency {self.limit:.1f}")
+                continue
+            used = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+            metrics.increment('openai.tokens', used or estimate)
+            self._release(headers=headers, entry=entry, used=used)
+            return response
+
+    @staticmethod
+    def _send(client, kwargs):
+        """Send the request, reading rate-limit headers when the client exposes them."""
+        completions = client.chat.completions
+        with circuit_breaker('openai').guard(is_transient):
+            # Only the real SDK resource has this; test doubles are called directly
+            if hasattr(type(completions), 'with_raw_response'):
+                raw = completions.with_raw_response.create(**kwargs)
+                return raw.parse(), raw.headers
+            return completions.create(**kwargs), None
+
+    def _wait_time(self, now: float, estimate: int) -> float:
+        """Seconds until a request of `estimate` tokens may start, apart from a free slot."""
+        waits = [self._paused_until - now]
+        for kind, need in (('requests', 1), ('tokens', estimate)):
+            remaining, reset_at = self._budget.get(kind, (None, 0.0))
+            if remaining is not None and now < reset_at and remaining < need:
+                waits.append(reset_at - now)
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            self._window.popleft()
+        if self._window:
+            window_full = WINDOW_SECONDS - (now - self._window[0][0])
+            if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+                waits.append(window_full)
+            used = sum(tokens for _, tokens in self._window)
+            if self.tokens_per_minute and used + estimate > self.tokens_per_minute:
+                waits.append(window_full)
+        return max(waits)
+
+    def _acquire(self, estimate: int) -> list:
+        """Wait for a free slot and budget, reserve them and return the request's window entry."""
+        queued = time.perf_counter()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now, estimate)
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                left = time_remaining()
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded("Request deadline exceeded while queued for OpenAI")
+                timeout = wait if wait > 0 else None
+                if left is not None:
+                    timeout = left if timeout is None else min(timeout, left)
+                self._cond.wait(timeout=timeout)
+            self.in_flight += 1
+            entry = [now, estimate]
+            self._window.append(entry)
+            for kind, need in (('requests', 1), ('tokens', estimate)):
+                if kind in self._budget and self._budget[kind][0] is not None:
+                    self._budget[kind][0] -= need
+        metrics.observe('openai.queue_wait', time.perf_counter() - queued)
+        return entry
+
+    def _release(self, headers: Optional[Mapping[str, str]] = None, outcome: str = 'ok', pause: float = 0.0,
+                 entry: Optional[list] = None, used: Optional[int] = None):
+        """
+        Free a slot and adapt the limit: grow after 'ok', halve after 'rate_limited', keep after 'failed'.
+
+        If the response reported its token usage (`used`), it replaces the
+        estimate in the request's window `entry`.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if entry is not None and used:
+                entry[1] = used
+            if headers:
+                self._update_budget(headers, now)
+            if outcome == 'rate_limited':
+                self.limit = max(1.0, self.limit / 2)
+            elif outcome == 'ok':
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            if pause > 0:
+                self._paused_until = max(self._paused_until, now + pause)
+            self._cond.notify_all()
+
+    def _update_budget(self, headers: Mapping[str, str], now: float):
+        for kind in ('requests', 'tokens'):
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            reset = parse_duration(headers.get(f'x-ratelimit-reset-{kind}'))
+            if remaining is None or reset is None:
+                continue
+            try:
+                self._budget[kind] = [int(remaining), now + reset]
+            except ValueError:
+                continue
+
+
+# Process-wide governor shared by every OpenAI call
+openai_governor = RateGovernor()
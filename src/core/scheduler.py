@@ -0,0 +1,92 @@
+import itertools
+import queue
+from datetime import date, datetime, time
+from typing import Optional, Tuple
+from src.utils.config import SCHEDULER_PRIORITY_WEIGHT_DAYS, SCHEDULER_AGE_WEIGHT, SCHEDULER_NO_DEADLINE_DAYS
+from src.utils.text_processing import parse_application_deadline
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Notion "Priority" select options; numbers are used as given
+PRIORITY_LEVELS = {'low': -1, 'normal': 0, 'medium': 0, 'high': 1, 'urgent': 2}
+
+# Jobs at or above this priority preempt the queue: they go ahead of every other job
+URGENT_PRIORITY = PRIORITY_LEVELS['urgent']
+
+
+def parse_priority(value) -> int:
+    """
+    Convert a Notion priority (a select option name or a number) to a priority level.
+
+    Args:
+        value: The property value, e.g. 'High', 2 or None.
+
+    Returns:
+        int: The priority; 0 when unset or unrecognised.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    return PRIORITY_LEVELS.get(str(value or '').strip().lower(), 0)
+
+
+def job_deadline(job) -> Optional[date]:
+    """Return a job's application deadline: the one it was queued with, else the extracted one."""
+    if job.deadline is not None:
+        return job.deadline
+    return parse_application_deadline((job.job_details or {}).get('Application Deadline'))
+
+
+def schedule_key(job) -> Tuple[int, float]:
+    """
+    Return a job's position in the work queue; lower keys run first.
+
+    Urgent jobs (priority >= URGENT_PRIORITY) come before all others. The rest
+    are ordered by an effective due time: the end of the deadline day (or
+    SCHEDULER_NO_DEADLINE_DAYS after queueing if there is none), moved earlier
+    by SCHEDULER_PRIORITY_WEIGHT_DAYS per priority level and by
+    SCHEDULER_AGE_WEIGHT seconds for every second the job has waited. As the
+    age credit grows at the same rate for every queued job, it is folded into
+    the key as a fixed offset from the queueing time, so keys never need
+    recomputing while jobs wait.
+
+    Args:
+        job (PipelineJob): The job, with `priority`, `deadline`, `job_details` and `queued_at` set.
+
+    Returns:
+        Tuple[int, float]: (0 for urgent jobs else 1, effective due time score).
+    """
+    deadline = job_deadline(job)
+    if deadline is not None:
+        due = datetime.combine(deadline, time.max).timestamp()
+    else:
+        due = job.queued_at + SCHEDULER_NO_DEADLINE_DAYS * DAY_SECONDS
+    score = due - job.priority * SCHEDULER_PRIORITY_WEIGHT_DAYS * DAY_SECONDS + SCHEDULER_AGE_WEIGHT * job.queued_at
+    return (0 if job.priority >= URGENT_PRIORITY else 1), score
+
+
+class DeadlineQueue:
+    """
+    Stage work queue that hands out the most urgent job first (see `schedule_key`).
+
+    A job's key is taken when it is put, so a deadline found by the extract
+    stage moves the job forward for the following stages. Jobs with equal keys
+    keep their arrival order, and None (the worker stop signal) sorts after
+    every job.
+    """
+
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._arrivals = itertools.count()
+
+    def put(self, job):
+        key = (2, 0.0) if job is None else schedule_key(job)
+        self._queue.put((*key, next(self._arrivals), job))
+
+    def get(self):
+        return self._queue.get()[-1]
+
+    def task_done(self):
+        self._queue.task_done()
+
+    def join(self):
+        self._queue.join()
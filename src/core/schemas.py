@@ -0,0 +1,92 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple, Type
+from pydantic import BaseModel, ConfigDict, Field, create_model
+from src.core.prompt_builder import JOB_DETAIL_FIELDS, FIELD_PROMPTS
+
+
+class JobDetailsBase(BaseModel):
+    """
+    Base class for the structured job detail answers returned by the model.
+
+    Fields use snake_case names in the JSON the model produces, which keeps the
+    response compact; `to_job_details` maps them back to the display keys used
+    throughout the pipeline (e.g. 'Job Title').
+    """
+    model_config = ConfigDict(extra='forbid', str_strip_whitespace=True)
+
+    def to_job_details(self) -> Dict[str, str]:
+        """Return the answer as a job_details dict keyed by display field names."""
+        return {field_name(key): value for key, value in self.model_dump().items()}
+
+
+def attribute_name(field: str) -> str:
+    """Return the JSON attribute name for a job detail field, e.g. 'job_title'."""
+    return field.lower().replace(' ', '_')
+
+
+def field_name(attribute: str) -> str:
+    """Return the job detail field name for a JSON attribute, e.g. 'Job Title'."""
+    for field in JOB_DETAIL_FIELDS:
+        if attribute_name(field) == attribute:
+            return field
+    return attribute
+
+
+@lru_cache(maxsize=None)
+def job_details_model(fields: Tuple[str, ...] = tuple(JOB_DETAIL_FIELDS)) -> Type[JobDetailsBase]:
+    """
+    Build (once per field set) a pydantic model for the requested job detail fields.
+
+    Every field is a required string so the generated JSON schema satisfies
+    OpenAI's strict structured output rules. An empty string means the field
+    was not found on the page.
+
+    Args:
+        fields (Tuple[str, ...]): The job detail fields to include.
+
+    Returns:
+        Type[JobDetailsBase]: A pydantic model class.
+    """
+    definitions = {
+        attribute_name(field): (str, Field(description=f"{FIELD_PROMPTS[field][0]}; empty string if not found"))
+        for field in fields
+    }
+    return create_model('JobDetails', __base__=JobDetailsBase, **definitions)
+
+
+def job_details_response_format(fields: Iterable[str] = JOB_DETAIL_FIELDS) -> dict:
+    """
+    Return the OpenAI `response_format` that constrains output to the job details schema.
+
+    Args:
+        fields (Iterable[str]): The job detail fields the model must return.
+
+    Returns:
+        dict: A `json_schema` response format with strict validation enabled.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "job_details",
+            "strict": True,
+            "schema": job_details_model(tuple(fields)).model_json_schema(),
+        },
+    }
+
+
+def parse_job_details_json(content: str, fields: Iterable[str] = JOB_DETAIL_FIELDS) -> Dict[str, str]:
+    """
+    Validate a JSON model answer against the job details schema.
+
+    Args:
+        content (str): The raw JSON text returned by the model.
+        fields (Iterable[str]): The job detail fields that were requested.
+
+    Returns:
+        Dict[str, str]: The job details keyed by display field names.
+
+    Raises:
+        pydantic.ValidationError: If the content is not valid JSON for the schema.
+    """
+    return job_details_model(tuple(fields)).model_validate_json(content).to_job_details()
+
@@ -0,0 +1,217 @@
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+from src.core.prompt_builder import JOB_DETAIL_FIELDS
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# A selector rule is a CSS selector (use the element text) or (CSS selector, attribute)
+SelectorRule = Union[str, Tuple[str, str]]
+
+
+def _strip_prefix(prefix: str) -> Callable[[str], str]:
+    """Return a transform that removes a leading word such as 'at ' from a value."""
+    def transform(value: str) -> str:
+        return value[len(prefix):].strip() if value.lower().startswith(prefix) else value
+    return transform
+
+
+class SiteExtractor:
+    """
+    Deterministic job_details extraction for a job board with a known page layout.
+
+    Each field maps to an ordered list of selector rules; the first rule that
+    matches a non-empty value wins. Rules must target the board's own markup:
+    a bare heading selector such as 'h1' also matches banners and sidebars,
+    and a field filled from one keeps the model from being asked. Optional per-field transforms clean up the
+    matched text (e.g. Greenhouse renders the company as 'at ACME Corp').
+    """
+
+    def __init__(self, name: str, hosts: Sequence[str], selectors: Dict[str, List[SelectorRule]],
+                 transforms: Optional[Dict[str, Callable[[str], str]]] = None):
+        self.name = name
+        self.hosts = tuple(hosts)
+        self.selectors = selectors
+        self.transforms = transforms or {}
+
+    def matches(self, host: str) -> bool:
+        """Return True if this extractor handles pages served from `host`."""
+        host = host.lower()
+        return any(host == suffix or host.endswith('.' + suffix) for suffix in self.hosts)
+
+    def extract(self, soup) -> Dict[str, str]:
+        """
+        Apply the selector rules to a parsed page.
+
+        Args:
+            soup (BeautifulSoup): The parsed page.
+
+        Returns:
+            Dict[str, str]: The job detail fields that could be filled.
+        """
+        details = {}
+        for field, rules in self.selectors.items():
+            for rule in rules:
+                selector, attribute = (rule, None) if isinstance(rule, str) else rule
+                element = soup.select_one(selector)
+                if element is None:
+                    continue
+                value = element.get(attribute, '') if attribute else element.get_text(' ', strip=True)
+                value = ' '.join(value.split())
+                if field in self.transforms:
+                    value = self.transforms[field](value)
+                if value:
+                    details[field] = value
+                    break
+        return details
+
+
+# Registered extractors, checked in registration order
+SITE_EXTRACTORS: List[SiteExtractor] = []
+
+
+def register_site_extractor(extractor: SiteExtractor) -> SiteExtractor:
+    """
+    Add an extractor to the registry.
+
+    Args:
+        extractor (SiteExtractor): The extractor to register.
+
+    Returns:
+        SiteExtractor: The same extractor, so registration can be used inline.
+    """
+    SITE_EXTRACTORS.append(extractor)
+    return extractor
+
+
+def get_site_extractor(url: str) -> Optional[SiteExtractor]:
+    """
+    Return the registered extractor for a URL's host, if any.
+
+    Args:
+        url (str): The job posting URL.
+
+    Returns:
+        Optional[SiteExtractor]: The first matching extractor, or None.
+    """
+    host = urlparse(url).hostname or ''
+    return next((extractor for extractor in SITE_EXTRACTORS if extractor.matches(host)), None)
+
+
+def extract_site_job_details(url: str, soup) -> Dict[str, str]:
+    """
+    Extract job details with the site extractor registered for a URL, recording stats.
+
+    Args:
+        url (str): The job posting URL.
+        soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        Dict[str, str]: The job detail fields that could be filled; empty if no
+                        extractor handles the host.
+    """
+    extractor = get_site_extractor(url)
+    if extractor is None:
+        return {}
+
+    with metrics.timer(f'site_extractor.{extractor.name}'):
+        try:
+            details = extractor.extract(soup)
+        except Exception as e:
+            logger.warning(f"Site extractor {extractor.name} failed for {url}: {e}")
+            details = {}
+    metrics.increment(f'site_extractor.{extractor.name}.calls')
+    metrics.increment(f'site_extractor.{extractor.name}.fields', len(details))
+    logger.info(f"Site extractor {extractor.name} filled {sorted(details)} for {url}")
+    return details
+
+
+def site_extractor_stats() -> Dict[str, dict]:
+    """
+    Return per-extractor timing and coverage since the process started.
+
+    Returns:
+        Dict[str, dict]: For each extractor that has run, the number of calls,
+                         the mean seconds per call, and coverage (the share of
+                         job detail fields it filled).
+    """
+    snapshot = metrics.snapshot()
+    stats = {}
+    for extractor in SITE_EXTRACTORS:
+        calls = snapshot['counters'].get(f'site_extractor.{extractor.name}.calls', 0)
+        if not calls:
+            continue
+        fields = snapshot['counters'].get(f'site_extractor.{extractor.name}.fields', 0)
+        timing = snapshot['timings'].get(f'site_extractor.{extractor.name}', {})
+        stats[extractor.name] = {
+            'calls': calls,
+            'mean_seconds': timing.get('mean', 0.0),
+            'coverage': fields / (calls * len(JOB_DETAIL_FIELDS)),
+        }
+    return stats
+
+
+register_site_extractor(SiteExtractor(
+    'linkedin', ['linkedin.com'],
+    {
+        'Job Title': ['h1.top-card-layout__title', 'h1.topcard__title'],
+        'Company': ['a.topcard__org-name-link', 'span.topcard__flavor a'],
+        'Location': ['span.topcard__flavor--bullet'],
+        'Experience Level': ['li.description__job-criteria-item span.description__job-criteria-text'],
+        'Salary Range': ['div.salary.compensation__salary', 'div.compensation__salary'],
+    },
+))
+
+register_site_extractor(SiteExtractor(
+    'greenhouse', ['greenhouse.io'],
+    {
+        'Job Title': ['h1.app-title', 'div.job__title h1', 'h1.section-header'],
+        'Company': ['span.company-name', ('meta[property="og:site_name"]', 'content')],
+        'Location': ['div.location', 'div.job__location'],
+        'Salary Range': ['div.pay-range', 'div.job__pay-range'],
+    },
+    transforms={'Company': _strip_prefix('at ')},
+))
+
+register_site_extractor(SiteExtractor(
+    'lever', ['lever.co'],
+    {
+        'Job Title': ['div.posting-headline h2'],
+        'Company': [('div.main-header-logo img', 'alt'), ('meta[property="og:site_name"]', 'content')],
+        'Location': ['div.posting-categories div.location', 'div.posting-categories .sort-by-location'],
+        'Salary Range': ['div.posting-requirements.salary', 'div[data-qa="salary-range"]'],
+    },
+    transforms={'Company': lambda value: value.replace(' logo', '')},
+))
+
+register_site_extractor(SiteExtractor(
+    'workday', ['myworkdayjobs.com', 'myworkdaysite.com'],
+    {
+        'Job Title': ['[data-automation-id="jobPostingHeader"]'],
+        'Company': [('meta[property="og:site_name"]', 'content')],
+        'Location': ['[data-automation-id="locations"] dd', '[data-automation-id="locations"]'],
+        'Application Deadline': ['[data-automation-id="time-left-to-apply"] dd'],
+    },
+))
+
+register_site_extractor(SiteExtractor(
+    'higheredjobs', ['higheredjobs.com'],
+    {
+        'Job Title': ['#jobTitle', 'h1.job-title'],
+        'Company': ['#jobAttrib a', 'div.job-institution', 'h2.institution'],
+        'Location': ['#jobAttrib .job-location', 'div.job-location'],
+        'Application Deadline': ['#jobAttrib .application-deadline', 'div.application-deadline'],
+        'Salary Range': ['#jobAttrib .salary', 'div.job-salary'],
+    },
+))
+
+register_site_extractor(SiteExtractor(
+    'academicjobsonline', ['academicjobsonline.org'],
+    {
+        'Job Title': ['div.position-title', 'h2.position'],
+        'Company': ['div.institution'],
+        'Location': ['div.location', 'span.location'],
+        'Application Deadline': ['span.deadline', 'div.deadline'],
+    },
+))
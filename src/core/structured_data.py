@@ -0,0 +1,225 @@
+import json
+import logging
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Currency codes rendered with a symbol rather than the ISO code
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'CAD': 'CA$', 'AUD': 'A$'}
+
+
+def _is_job_posting(item) -> bool:
+    """Return True if a JSON-LD node is a schema.org JobPosting."""
+    if not isinstance(item, dict):
+        return False
+    types = item.get('@type', [])
+    if isinstance(types, str):
+        types = [types]
+    return any(t.rsplit('/', 1)[-1] == 'JobPosting' for t in types)
+
+
+def _iter_json_ld_nodes(data) -> Iterator[dict]:
+    """Yield every JSON-LD node in a parsed document, descending into lists and @graph."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if '@graph' in data:
+            yield from _iter_json_ld_nodes(data['@graph'])
+
+
+def _text(value) -> str:
+    """Return a schema.org value as text, taking the name of nested objects."""
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value') or ''
+    if value is None:
+        return ''
+    return ' '.join(str(value).split())
+
+
+def _format_location(job_location, location_type='') -> str:
+    """Format a schema.org jobLocation (Place, PostalAddress or text) as 'City, Region, Country'."""
+    places = job_location if isinstance(job_location, list) else [job_location]
+    formatted = []
+    for place in places:
+        if isinstance(place, dict):
+            address = place.get('address', place)
+            if isinstance(address, dict):
+                parts = [_text(address.get(key)) for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+                text = ', '.join(part for part in parts if part)
+            else:
+                text = _text(address)
+        else:
+            text = _text(place)
+        if text and text not in formatted:
+            formatted.append(text)
+    if 'TELECOMMUTE' in str(location_type).upper():
+        formatted.append('Remote')
+    return '; '.join(formatted)
+
+
+def _format_number(value) -> str:
+    """Format a salary figure with thousands separators, dropping a zero fraction."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return _text(value)
+    return f"{number:,.0f}" if number.is_integer() else f"{number:,.2f}"
+
+
+def _format_salary(base_salary) -> str:
+    """Format a schema.org MonetaryAmount as e.g. '$100,000 - $120,000 per year'."""
+    if not isinstance(base_salary, dict):
+        return _text(base_salary)
+    currency = _text(base_salary.get('currency'))
+    symbol = CURRENCY_SYMBOLS.get(currency.upper(), f"{currency} " if currency else '')
+    value = base_salary.get('value', '')
+    unit = ''
+    if isinstance(value, dict):
+        unit = _text(value.get('unitText')).lower()
+        low, high = value.get('minValue'), value.get('maxValue')
+        if low is not None and high is not None and low != high:
+            amount = f"{symbol}{_format_number(low)} - {symbol}{_format_number(high)}"
+        else:
+            single = value.get('value', low if low is not None else high)
+            amount = f"{symbol}{_format_number(single)}" if single is not None else ''
+    else:
+        amount = f"{symbol}{_format_number(value)}" if value != '' else ''
+    if amount and unit:
+        amount = f"{amount} per {unit}"
+    return amount
+
+
+def _format_experience(requirements) -> str:
+    """Format schema.org experienceRequirements (text or OccupationalExperienceRequirements)."""
+    if isinstance(requirements, dict):
+        months = requirements.get('monthsOfExperience')
+        if months is not None:
+            try:
+                years = float(months) / 12
+            except (TypeError, ValueError):
+                return ''
+            return f"{years:g}+ years"
+        return _text(requirements.get('description', ''))
+    return _text(requirements)
+
+
+def _format_date(value) -> str:
+    """Return the date part of an ISO 8601 date or datetime."""
+    return _text(value).split('T', 1)[0]
+
+
+def job_posting_to_details(posting: dict) -> Dict[str, str]:
+    """
+    Map a schema.org JobPosting object to job_details fields.
+
+    Args:
+        posting (dict): A JobPosting node from JSON-LD (or built from microdata).
+
+    Returns:
+        Dict[str, str]: The job detail fields that could be filled, without empty values.
+    """
+    details = {
+        'Job Title': _text(posting.get('title', '')),
+        'Company': _text(posting.get('hiringOrganization', '')),
+        'Location': _format_location(posting.get('jobLocation', []), posting.get('jobLocationType', '')),
+        'Experience Level': _format_experience(posting.get('experienceRequirements', '')),
+        'Application Deadline': _format_date(posting.get('validThrough', '')),
+        'Salary Range': _format_salary(posting.get('baseSalary', '')),
+    }
+    return {key: value for key, value in details.items() if value}
+
+
+def extract_json_ld(soup) -> List[dict]:
+    """
+    Return every schema.org JobPosting embedded as JSON-LD in a page.
+
+    Must be called before <script> elements are stripped from the soup.
+
+    Args:
+        soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        List[dict]: The JobPosting nodes found, in page order.
+    """
+    postings = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or script.get_text() or 'null')
+        except ValueError:
+            logger.debug("Skipping malformed JSON-LD block")
+            continue
+        postings.extend(node for node in _iter_json_ld_nodes(data) if _is_job_posting(node))
+    return postings
+
+
+def _itemprop_value(element):
+    """Return the value of a microdata property element, nesting item scopes as dicts."""
+    if element.has_attr('itemscope'):
+        return {
+            child['itemprop']: _itemprop_value(child)
+            for child in element.find_all(attrs={'itemprop': True})
+            if child.find_parent(attrs={'itemscope': True}) is element
+        }
+    for attribute in ('content', 'datetime', 'href'):
+        if element.has_attr(attribute):
+            return element[attribute]
+    return element.get_text(' ', strip=True)
+
+
+def extract_microdata(soup) -> List[dict]:
+    """
+    Return every schema.org JobPosting marked up with microdata, as JSON-LD style dicts.
+
+    Args:
+        soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        List[dict]: The JobPosting items found, in page order.
+    """
+    items = soup.find_all(attrs={'itemscope': True, 'itemtype': lambda t: t and t.rstrip('/').endswith('JobPosting')})
+    return [_itemprop_value(item) for item in items]
+
+
+def extract_open_graph(soup) -> Dict[str, str]:
+    """
+    Return the job details implied by OpenGraph tags (og:title and og:site_name).
+
+    Args:
+        soup (BeautifulSoup): The parsed page.
+
+    Returns:
+        Dict[str, str]: 'Job Title' and/or 'Company', when present.
+    """
+    properties = {'og:title': 'Job Title', 'og:site_name': 'Company'}
+    details = {}
+    for meta in soup.find_all('meta', property=lambda p: p in properties):
+        content = ' '.join(meta.get('content', '').split())
+        if content:
+            details.setdefault(properties[meta['property']], content)
+    return details
+
+
+def extract_structured_job_details(soup) -> Dict[str, str]:
+    """
+    Fill job_details fields from schema.org JobPosting data embedded in a page.
+
+    JSON-LD is preferred over microdata; each posting only fills fields the
+    previous ones left empty. OpenGraph tags are too generic to trust over the
+    model (og:site_name is often the job board), so they are exposed separately
+    through `extract_open_graph` as a last-resort fallback.
+
+    Args:
+        soup (BeautifulSoup): The parsed page, with <script> elements still present.
+
+    Returns:
+        Dict[str, str]: The job detail fields that could be filled.
+    """
+    details = {}
+    for posting in extract_json_ld(soup) + extract_microdata(soup):
+        for key, value in job_posting_to_details(posting).items():
+            details.setdefault(key, value)
+    return details
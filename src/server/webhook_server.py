@@ -1,12 +1,42 @@
-from flask import Flask, request, jsonify
+import io
+import logging
+import os
+from flask import Flask, request, jsonify, send_file
 from src.core.job_parser import extract_job_details
 from src.core.document_handler import save_cover_letter_documents
-from src.api.notion_client import update_notion_database, is_page_archived, unarchive_page
+from src.api.notion_client import docker_to_local_path, update_notion_database, is_page_archived, unarchive_page
+from src.core.artifacts import ARTIFACT_KINDS, artifact_cache, load_artifact
 from src.core.cover_letter import generate_cover_letter
-from src.utils.config import logger
+from src.core.job_store import JobStore
+from src.core.latex_compiler import LatexQueueFullError
+from src.core.pipeline import near_duplicate_finder
+from src.core.rate_governor import RateLimitedError
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.config import configure_logging, JOB_STORE_PATH, WEBHOOK_DEADLINE
+from src.utils.deadline import DeadlineExceeded, request_deadline
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Opened on first use; records the documents published for each page, here and by the bulk and poll commands
+job_store = None
+
+def create_app():
+    """
+    Set up logging and return the Flask application.
+
+    Used as the server entry point (`flask --app "src.server.webhook_server:create_app()" run`)
+    so that importing this module, as the tests do, never opens log files or
+    starts the logging thread.
+
+    Returns:
+        Flask: The application.
+    """
+    configure_logging()
+    return app
+
 @app.route('/')
 def home():
     """
@@ -24,50 +54,179 @@ def webhook():
 
     This function handles POST requests, extracts job details from the provided URL,
     generates a cover letter, saves the documents, and updates the Notion database.
+    Postings already in the job store (compared by normalized URL) reuse their
+    stored details and, if their published PDF still exists, their letter and
+    documents (see `_process_posting`). A truthy "Draft" field renders a quick
+    draft PDF without LaTeX. The whole request must finish within
+    WEBHOOK_DEADLINE seconds; it answers 504 if time runs out and 503 while a
+    dependency's circuit breaker is open.
 
     Returns:
         Response: A JSON response indicating success or failure.
     """
     try:
-        # Parse JSON data from the request
-        data = request.json
-       
-        logger.info(f"Received webhook data: {data}")
-        url = data['Job URL']
-        page_id = data['ID']
-
-        # Check if the Notion page is archived and unarchive if necessary
-        if is_page_archived(page_id):
-            unarchive_page(page_id)
-            logger.info(f"Page {page_id} was archived. It has been unarchived.")
-
-        # Extract job details from the provided URL
-        job_details = extract_job_details(url)
-        job_details['Job URL'] = url  # Ensure the URL is included in the job details
-        logger.info(f"Extracted job details: {job_details}")
-
-        # Generate a cover letter based on the job details
-        cover_letter = generate_cover_letter(job_details)
-       
-        # Save the cover letter documents and get their paths
-        docker_folder_path, doc_path, pdf_path, windows_folder_path, windows_doc_path, windows_pdf_path = save_cover_letter_documents(job_details, cover_letter)
+        # Every call made for this request shares one deadline
+        with request_deadline(WEBHOOK_DEADLINE):
+            # Parse JSON data from the request
+            data = request.json
        
-        logger.info(f"Documents saved in Docker path: {docker_folder_path}")
-        logger.info(f"Documents should appear in Windows path: {windows_folder_path}")
-        logger.info(f"Updating Notion with: {job_details}")
+            logger.info("Received webhook data", extra={'payload': data})
+            url = data['Job URL']
+            page_id = data['ID']
 
-        # Update the Notion database with the job details and document paths
-        update_notion_database(page_id, job_details, windows_folder_path, windows_doc_path, windows_pdf_path)
+            # Check if the Notion page is archived and unarchive if necessary
+            if is_page_archived(page_id):
+                unarchive_page(page_id)
+                logger.info(f"Page {page_id} was archived. It has been unarchived.")
+
+            docker_folder_path = _process_posting(url, page_id, draft=bool(data.get('Draft')))
+            windows_folder_path = str(docker_to_local_path(docker_folder_path))
+            logger.info(f"Documents should appear in Windows path: {windows_folder_path}")
        
-        return jsonify({
-            'status': 'success',
-            'documents_folder': windows_folder_path
-        })
+            return jsonify({
+                'status': 'success',
+                'documents_folder': windows_folder_path
+            })
+    except LatexQueueFullError as e:
+        logger.warning(f"Rejected webhook while the LaTeX queue is full: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': '30'}
+    except RateLimitedError as e:
+        logger.warning(f"Rejected webhook while OpenAI is rate limited: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': str(max(1, round(e.retry_after)))}
+    except CircuitOpenError as e:
+        logger.warning(f"Rejected webhook while a dependency is down: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 503, {'Retry-After': str(max(1, round(e.retry_after)))}
+    except DeadlineExceeded as e:
+        logger.warning(f"Webhook ran out of time: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 504
     except Exception as e:
         logger.error(f"Error processing request: {e}", exc_info=True)
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@app.route('/artifacts/<job_id>/<kind>', methods=['GET'])
+def download_artifact(job_id, kind):
+    """
+    Download a generated document for a job.
+
+    Documents rendered by this server are served from memory; others are read
+    from the folder recorded in the job store. Responses carry a content-hash
+    ETag and honour If-None-Match and Range requests.
+
+    Args:
+        job_id (str): The job's Notion page ID.
+        kind (str): One of 'pdf', 'docx', 'tex' or 'details'.
+
+    Returns:
+        Response: The file, or a JSON error with status 404.
+    """
+    if kind not in ARTIFACT_KINDS:
+        return jsonify({'status': 'error', 'message': f"Unknown artifact kind: {kind}"}), 404
+    artifact = artifact_cache.get(job_id, kind) or _load_published_artifact(job_id, kind)
+    if artifact is None:
+        return jsonify({'status': 'error', 'message': f"No {kind} artifact for job {job_id}"}), 404
+    return send_file(io.BytesIO(artifact.data), mimetype=artifact.mimetype, download_name=artifact.filename,
+                     etag=artifact.etag, conditional=True, max_age=0)
+
+def _process_posting(url, page_id, draft=False):
+    """
+    Run a posting through extraction, letter generation, saving and the Notion update.
+
+    Each finished stage is recorded in the job store, and a failed stage is
+    recorded with its error before the exception propagates. Stored details
+    for the same posting skip extraction; a stored letter whose published
+    PDF still exists also skips generation and rendering. A new URL whose page
+    text nearly matches a stored posting (a repost or mirror) reuses that
+    posting's details, letter and documents the same way. The published
+    folder is recorded under the page ID, so /artifacts links keep working
+    after the in-memory copy is evicted or the server restarts. Draft
+    documents are recorded for /artifacts but never reused.
+
+    Args:
+        url (str): The job posting URL.
+        page_id (str): The Notion page to update.
+        draft (bool): Render a quick draft PDF without LaTeX.
+
+    Returns:
+        str: The Docker path of the documents folder.
+    """
+    store = _get_job_store()
+    job_details = cover_letter = paths = None
+    prior = store.find(url)
+    if prior is not None and prior['job_details']:
+        job_details = dict(prior['job_details'], **{'Job URL': url})
+        cover_letter, paths = _reusable_documents(prior)
+        logger.info(f"Reusing stored {'documents' if paths else 'job details'} for {url}")
+        metrics.increment('webhook.reused')
+
+    stage = 'extract'
+    try:
+        if job_details is None:
+            # Extract job details from the provided URL, reusing a stored near-duplicate's if there is one
+            lookup = {}
+            job_details = extract_job_details(url, find_duplicate=near_duplicate_finder(url, store, lookup))
+            job_details['Job URL'] = url  # Ensure the URL is included in the job details
+            store.record_stage(url, stage, page_id=page_id, job_details=job_details,
+                               signature=lookup.get('signature'))
+            duplicate = lookup.get('duplicate')
+            if duplicate:
+                logger.info(f"{url} is a near-duplicate ({duplicate['similarity']:.2f}) of {duplicate['url']}")
+                metrics.increment('webhook.near_duplicates')
+                cover_letter, paths = _reusable_documents(duplicate)
+        logger.debug("Extracted job details", extra={'job_details': job_details})
+
+        stage = 'generate'
+        if cover_letter is None:
+            # Generate a cover letter based on the job details
+            cover_letter = generate_cover_letter(job_details)
+            store.record_stage(url, stage, page_id=page_id, cover_letter=cover_letter)
+
+        stage = 'save'
+        if paths is None:
+            # Save the cover letter documents and get their paths; keep them in memory for /artifacts
+            artifacts = {}
+            paths = save_cover_letter_documents(job_details, cover_letter, artifacts=artifacts, draft=draft)
+            artifact_cache.put(page_id, artifacts)
+        docker_folder_path, doc_path, pdf_path = paths
+        # A draft's document paths are left out so a later full run renders them properly
+        store.record_stage(url, stage, page_id=page_id, cover_letter=cover_letter, folder_path=docker_folder_path,
+                           doc_path=None if draft else doc_path, pdf_path=None if draft else pdf_path)
+        logger.info(f"Documents saved in Docker path: {docker_folder_path}")
+
+        stage = 'notion'
+        logger.info(f"Updating Notion page {page_id}")
+        # Update the Notion database with the job details and document paths
+        # Takes the Docker paths and converts them to host paths itself
+        update_notion_database(page_id, job_details, docker_folder_path, doc_path, pdf_path)
+        store.record_stage(url, stage, page_id=page_id)
+    except Exception as e:
+        store.record_stage(url, stage, status='failed', error=str(e), page_id=page_id)
+        raise
+    return docker_folder_path
+
+def _reusable_documents(record):
+    """Return a stored posting's letter and document paths, or (None, None) if its PDF is gone."""
+    if record['cover_letter'] and record['folder_path'] and record['doc_path'] and record['pdf_path'] \
+            and os.path.isfile(record['pdf_path']):
+        return record['cover_letter'], (record['folder_path'], record['doc_path'], record['pdf_path'])
+    return None, None
+
+def _get_job_store():
+    """Return the job store, opening it on first use."""
+    global job_store
+    if job_store is None:
+        job_store = JobStore(JOB_STORE_PATH)
+    return job_store
+
+def _load_published_artifact(job_id, kind):
+    """Read a job's artifact from its published folder, as recorded in the job store."""
+    if job_store is None and not os.path.exists(JOB_STORE_PATH):
+        return None
+    record = _get_job_store().find_by_page_id(job_id)
+    if record is None or not record['folder_path']:
+        return None
+    return load_artifact(record['folder_path'], kind)
+
 if __name__ == '__main__':
     # Start the Flask application
     print("Starting Flask application...")
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
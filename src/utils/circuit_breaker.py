@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+from src.utils.config import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable; not retrying for {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a dependency is down.
+
+    After `failure_threshold` consecutive failures the breaker opens and every
+    call raises CircuitOpenError at once. Once `reset_seconds` have passed, a
+    single trial call is let through (half-open): success closes the breaker,
+    failure opens it for another `reset_seconds`. Openings are counted under
+    'breaker.<name>.opened' and rejected calls under 'breaker.<name>.rejected'.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """Return 'closed', 'open' or 'half-open'."""
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            return 'open' if time.monotonic() - self._opened_at < self.reset_seconds else 'half-open'
+
+    def _before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited >= self.reset_seconds and not self._trial_running:
+                self._trial_running = True
+                return
+            metrics.increment(f'breaker.{self.name}.rejected')
+            raise CircuitOpenError(self.name, max(0.0, self.reset_seconds - waited))
+
+    def _after_call(self, failed: bool):
+        with self._lock:
+            self._trial_running = False
+            if not failed:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Circuit breaker {self.name} opened after {self._failures} failures")
+                    metrics.increment(f'breaker.{self.name}.opened')
+                self._opened_at = time.monotonic()
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[BaseException], bool] = lambda error: True):
+        """
+        Run the block as one call to the dependency.
+
+        Args:
+            is_failure (Callable[[BaseException], bool]): Whether an exception from the
+                block means the dependency is unhealthy (e.g. not for a 404).
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        self._before_call()
+        try:
+            yield
+        except BaseException as e:
+            self._after_call(failed=is_failure(e))
+            raise
+        self._after_call(failed=False)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a dependency, creating it on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 import logging
 import sys
@@ -9,59 +10,200 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__))))
 # Load environment variables
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Console handler
-        logging.FileHandler(os.path.join('logs', 'app.log'))  # File handler
-    ]
-)
+from src.utils.lazy import LazyObject
+from src.utils.logging_setup import parse_levels, setup_logging
+
+# Logging: records are queued and written as JSON lines by a background thread (see configure_logging)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+# Per-logger levels as "name=LEVEL,..."; entries here override the quiet defaults for chatty libraries
+LOG_LEVELS = {
+    'urllib3': 'WARNING', 'httpx': 'WARNING', 'httpcore': 'WARNING', 'openai': 'INFO', 'fpdf': 'WARNING',
+    **parse_levels(os.getenv("LOG_LEVELS", "")),
+}
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Longest message or extra field logged before it is cut
+LOG_MAX_MESSAGE_CHARS = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+# Per call site, records below WARNING logged each minute before only one in LOG_SAMPLE_EVERY is kept
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", "100"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+
 logger = logging.getLogger(__name__)
 
 # Path configurations
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+TEMPLATES_DIR = os.path.join(PROJECT_ROOT, 'templates')
+# Compiled Jinja2 bytecode for the document templates, reused across processes
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", os.path.join(PROJECT_ROOT, 'data', 'template_cache'))
+# Cover letter style: a directory under templates/latex
+COVER_LETTER_TEMPLATE = os.getenv("COVER_LETTER_TEMPLATE", "awesome-cv")
+CANDIDATE_PROFILE_PATH = os.getenv("CANDIDATE_PROFILE_PATH", os.path.join(PROJECT_ROOT, 'profiles', 'default.json'))
 BASE_DOCKER_PATH = os.getenv("BASE_DOCKER_PATH", "/app")
 BASE_LOCAL_PATH = os.getenv("BASE_LOCAL_PATH", "C:/Users/davle/Dropbox (Personal)")
 ROOT_DIR = os.path.abspath(r"C:/Users/davle/Dropbox (Personal)/Jobs 2024")
 COVER_LETTERS_DIR = os.path.join(ROOT_DIR, "cover_letters")
+# Local scratch space for building documents before they are published to the synced folder
+ARTIFACT_SCRATCH_DIR = os.getenv("ARTIFACT_SCRATCH_DIR") or (
+    '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else tempfile.gettempdir()
+)
+# xelatex compile pool: parallel compiles, compiles allowed to wait, seconds per compile, MiB per process (0 = no cap)
+LATEX_WORKERS = int(os.getenv("LATEX_WORKERS", str(min(4, os.cpu_count() or 1))))
+LATEX_QUEUE_SIZE = int(os.getenv("LATEX_QUEUE_SIZE", "16"))
+LATEX_TIMEOUT = float(os.getenv("LATEX_TIMEOUT", "60"))
+LATEX_MEMORY_LIMIT_MB = int(os.getenv("LATEX_MEMORY_LIMIT_MB", "1024"))
+# Rendered documents kept in the webhook server's memory for /artifacts downloads
+ARTIFACT_CACHE_BYTES = int(os.getenv("ARTIFACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+# Public base URL of the webhook server; when set, Notion links to /artifacts downloads instead of file:// paths
+ARTIFACT_BASE_URL = os.getenv("ARTIFACT_BASE_URL", "")
 
-# Ensure directories exist
-os.makedirs(COVER_LETTERS_DIR, exist_ok=True)
-os.makedirs('logs', exist_ok=True)  # Create logs directory if it doesn't exist
+# Time budgets in seconds: a whole webhook request, a pipeline job across its stages, and single calls
+# to posting hosts, OpenAI and Notion (each call gets the shorter of its own limit and the time left)
+WEBHOOK_DEADLINE = float(os.getenv("WEBHOOK_DEADLINE", "300"))
+PIPELINE_JOB_DEADLINE = float(os.getenv("PIPELINE_JOB_DEADLINE", "600"))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+NOTION_TIMEOUT = float(os.getenv("NOTION_TIMEOUT", "30"))
+# A posting fetch still unanswered after this long (or the host's recent 90th percentile, if slower)
+# gets a second, hedged request; the first response wins
+FETCH_HEDGE_DELAY = float(os.getenv("FETCH_HEDGE_DELAY", "2"))
+# Consecutive failures that open a dependency's circuit breaker, and seconds before it tries again
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+# Most bytes read from a posting page, and from a PDF posting (a PDF cut short cannot be read, so its
+# limit is higher and exceeding it is an error); pages beyond the first limit are read only that far
+POSTING_MAX_BYTES = int(os.getenv("POSTING_MAX_BYTES", str(5 * 1024 * 1024)))
+POSTING_MAX_PDF_BYTES = int(os.getenv("POSTING_MAX_PDF_BYTES", str(20 * 1024 * 1024)))
+# Characters of text taken from a PDF posting; pages after the budget is filled are not read
+POSTING_MAX_TEXT_CHARS = int(os.getenv("POSTING_MAX_TEXT_CHARS", "60000"))
+# Fetched and parsed posting pages kept for reuse (e.g. extraction then question answering), and for how long
+JOB_PAGE_CACHE_SIZE = int(os.getenv("JOB_PAGE_CACHE_SIZE", "32"))
+JOB_PAGE_CACHE_SECONDS = float(os.getenv("JOB_PAGE_CACHE_SECONDS", "600"))
+# Worker processes that parse large HTML pages off the request thread (0 parses every page inline),
+# and the page size in bytes from which a page is sent to them
+HTML_PARSE_WORKERS = int(os.getenv("HTML_PARSE_WORKERS", "0"))
+HTML_PARSE_OFFLOAD_BYTES = int(os.getenv("HTML_PARSE_OFFLOAD_BYTES", str(256 * 1024)))
 
-# Predefine dependency variables so they can always be imported.
-# In a test environment these will remain None, but in production they will be populated.
-openai_client = None
-notion_client = None
-tokenizer = None
-model = None
+# Extraction prompt limits: page text tokens sent to the model per posting
+EXTRACTION_TOKEN_BUDGET = int(os.getenv("EXTRACTION_TOKEN_BUDGET", "3000"))
+# "structured" constrains answers to a JSON schema; "lines" uses the legacy Key: value format
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "structured")
 
-# Only initialize clients and models if not in test environment
-if not os.getenv('PYTEST') and not os.getenv('PYTEST_CURRENT_TEST'):
+# OpenAI model tiers, cheapest first; answers that fail validation escalate to the next tier
+EXTRACTION_MODEL_TIERS = os.getenv("EXTRACTION_MODEL_TIERS", "gpt-4o-mini,gpt-4o").split(',')
+COVER_LETTER_MODEL_TIERS = os.getenv("COVER_LETTER_MODEL_TIERS", "gpt-4o-mini,gpt-4o").split(',')
+# OpenAI rate governor: concurrent requests to start with and never exceed (adjusted by AIMD in between),
+# optional per-minute limits used until the API reports its own, and rate-limit retries before giving up
+OPENAI_INITIAL_CONCURRENCY = int(os.getenv("OPENAI_INITIAL_CONCURRENCY", "4"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "32"))
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0"))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "0"))
+OPENAI_RATE_LIMIT_RETRIES = int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", "6"))
+
+# SQLite store of processed postings (keep it off the Dropbox-synced folder)
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(PROJECT_ROOT, 'data', 'jobs.sqlite3'))
+# Estimated page text similarity above which a posting reuses a stored near-duplicate's work
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.9"))
+
+# Pipeline scheduling: each Notion priority level counts as this many days closer to the deadline,
+# each hour a job has waited as this many hours closer, and a job without a deadline is due in this many days
+SCHEDULER_PRIORITY_WEIGHT_DAYS = float(os.getenv("SCHEDULER_PRIORITY_WEIGHT_DAYS", "7"))
+SCHEDULER_AGE_WEIGHT = float(os.getenv("SCHEDULER_AGE_WEIGHT", "24"))
+SCHEDULER_NO_DEADLINE_DAYS = float(os.getenv("SCHEDULER_NO_DEADLINE_DAYS", "30"))
+
+# Notion jobs database polled by `python -m src.cli poll`, and seconds between polls
+NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "")
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "60"))
+
+
+def configure_logging():
+    """
+    Set up logging from the LOG_* settings.
+
+    Called by the entry points (the webhook server and the CLI) rather than on
+    import, so importing a module never creates directories or opens log files.
+
+    Returns:
+        logging.Handler: The queue handler installed on the root logger.
+    """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    return setup_logging(
+        level=LOG_LEVEL,
+        module_levels=LOG_LEVELS,
+        log_format=LOG_FORMAT,
+        log_file=os.path.join(LOG_DIR, 'app.log'),
+        max_chars=LOG_MAX_MESSAGE_CHARS,
+        sample_burst=LOG_SAMPLE_BURST,
+        sample_every=LOG_SAMPLE_EVERY,
+        queue_size=LOG_QUEUE_SIZE,
+    )
+
+
+# Local model used by answer_question and for token counting
+MODEL_ID = "mistralai/Mistral-7B-v0.1"
+# Sidecar that owns the local model for every web worker: a Unix socket path or host:port.
+# Empty means each process loads the model itself on first use.
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "")
+# Shared secret for the sidecar connection handshake; required for a host:port address
+MODEL_SERVER_AUTHKEY = os.getenv("MODEL_SERVER_AUTHKEY", "")
+# Questions answered in one forward pass, and milliseconds the sidecar waits to fill a batch
+MODEL_BATCH_SIZE = int(os.getenv("MODEL_BATCH_SIZE", "8"))
+MODEL_BATCH_WAIT_MS = float(os.getenv("MODEL_BATCH_WAIT_MS", "10"))
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", "60"))
+
+
+def _create_openai_client():
     from openai import OpenAI
+    # Rate-limit retries are left to the governor in src.core.rate_governor, which also adapts concurrency
+    return OpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
+
+
+def _create_notion_client():
+    import httpx
     from notion_client import Client
-    from transformers import AutoModelForCausalLM, AutoTokenizer
-    
-    # Initialize OpenAI client
-    openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    
-    # Initialize Notion client
-    notion_client = Client(auth=os.getenv('NOTION_API_KEY'))
-    
-    # Initialize Mistral model and tokenizer
-    MODEL_ID = "mistralai/Mistral-7B-v0.1"
-    
+    from src.utils.deadline import deadline_request_hook
+    # Each request gets NOTION_TIMEOUT or the time left before the caller's deadline, whichever is shorter
+    http_client = httpx.Client(event_hooks={'request': [deadline_request_hook(NOTION_TIMEOUT)]})
+    return Client(auth=os.getenv('NOTION_API_KEY'), timeout_ms=int(NOTION_TIMEOUT * 1000), client=http_client)
+
+
+def _load_tokenizer():
+    from transformers import AutoTokenizer
+    logger.info(f"Loading Mistral tokenizer from {MODEL_ID}")
+    loaded = AutoTokenizer.from_pretrained(MODEL_ID)
+    if loaded.pad_token is None:
+        # Mistral has no pad token, which the model server needs to batch questions of different lengths
+        loaded.pad_token = loaded.eos_token
+    return loaded
+
+
+def _load_model():
+    from transformers import AutoModelForCausalLM
     try:
-        logger.info(f"Loading Mistral model and tokenizer from {MODEL_ID}")
-        tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
-        model = AutoModelForCausalLM.from_pretrained(
+        logger.info(f"Loading Mistral model from {MODEL_ID}")
+        loaded = AutoModelForCausalLM.from_pretrained(
             MODEL_ID,
             torch_dtype="auto",
             device_map="auto",
             load_in_8bit=True  # Enable 8-bit quantization to reduce memory usage
         )
-        logger.info("Successfully loaded Mistral model and tokenizer")
+        logger.info("Successfully loaded Mistral model")
+        return loaded
     except Exception as e:
         logger.error(f"Error loading Mistral model: {str(e)}", exc_info=True)
         raise
+
+
+# Predefine dependency variables so they can always be imported.
+# In a test environment these remain None. Otherwise they are built on first use,
+# so importing a module does not import openai, notion_client or transformers.
+openai_client = None
+notion_client = None
+tokenizer = None
+model = None
+
+if not os.getenv('PYTEST') and not os.getenv('PYTEST_CURRENT_TEST'):
+    openai_client = LazyObject(_create_openai_client, 'openai_client')
+    notion_client = LazyObject(_create_notion_client, 'notion_client')
+    tokenizer = LazyObject(_load_tokenizer, 'tokenizer')
+    model = LazyObject(_load_model, 'model')
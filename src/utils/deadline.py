@@ -0,0 +1,89 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Monotonic time by which the current request (webhook call or pipeline stage) must finish
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request has no time left for another call."""
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]):
+    """
+    Give the code in the block at most `seconds` to finish.
+
+    Nested deadlines can only shorten the one already in effect. Calls to
+    external services inside the block size their timeouts with `call_timeout`.
+    The deadline lives in a context variable, so it follows the request through
+    function calls but not into other threads; code that hands work to a pool
+    computes the timeout first and passes it along.
+
+    Args:
+        seconds (Optional[float]): The time budget; None keeps the current deadline.
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        until = time.monotonic() + seconds
+        current = until if current is None else min(current, until)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> Optional[float]:
+    """Return the seconds left before the current deadline, or None if there is none."""
+    until = _deadline.get()
+    return None if until is None else until - time.monotonic()
+
+
+def check_deadline():
+    """Raise DeadlineExceeded if the current deadline has passed."""
+    remaining = time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def call_timeout(limit: float) -> float:
+    """
+    Return the timeout for one external call: its own limit or the time left, whichever is shorter.
+
+    Args:
+        limit (float): The call's own timeout in seconds.
+
+    Returns:
+        float: The timeout to use.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    remaining = time_remaining()
+    if remaining is None:
+        return limit
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return min(limit, remaining)
+
+
+def deadline_request_hook(limit: float):
+    """
+    Make an httpx request hook that bounds each request by `call_timeout(limit)`.
+
+    Hooks run on the thread sending the request, so the timeout is taken from
+    that request's deadline even when the httpx client is shared.
+
+    Args:
+        limit (float): The timeout in seconds when there is more time left than this.
+
+    Returns:
+        Callable: A hook for `httpx.Client(event_hooks={'request': [...]})`.
+    """
+    def bound_request(request):
+        timeout = call_timeout(limit)
+        request.extensions['timeout'] = {'connect': timeout, 'read': timeout, 'write': timeout, 'pool': timeout}
+    return bound_request
@@ -0,0 +1,110 @@
+import hashlib
+import random
+import re
+from typing import List, Optional, Tuple
+
+# Words per shingle; five-word shingles keep shared boilerplate from dominating
+SHINGLE_SIZE = 5
+# Hash permutations per MinHash signature
+NUM_PERMUTATIONS = 128
+# LSH bands; 16 bands of 8 rows make postings above ~0.7 similarity likely candidates
+LSH_BANDS = 16
+# Pages with fewer words than this (error pages, login walls) are not fingerprinted
+MIN_WORDS = 50
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: stored signatures must stay comparable across processes
+_random = random.Random(20240601)
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _hash64(value: str) -> int:
+    """Return a stable 64-bit hash of a string (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Return the set of overlapping word n-grams of a text.
+
+    Words are lower-cased alphanumeric runs, so punctuation, spacing and layout
+    differences between copies of a posting do not matter.
+
+    Args:
+        text (str): The cleaned page text.
+        size (int): Words per shingle.
+
+    Returns:
+        set: The shingles, each a space-joined string of `size` words.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """
+    Compute the MinHash signature of a text's shingle set.
+
+    The fraction of positions where two signatures agree estimates the Jaccard
+    similarity of the two texts' shingle sets.
+
+    Args:
+        text (str): The cleaned page text.
+
+    Returns:
+        Optional[List[int]]: NUM_PERMUTATIONS 32-bit values, or None if the text
+                             has fewer than MIN_WORDS words.
+    """
+    if len(re.findall(r'\w+', text)) < MIN_WORDS:
+        return None
+    hashes = [_hash64(shingle) & _MAX_HASH for shingle in shingles(text)]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(signature: List[int], other: List[int]) -> float:
+    """
+    Estimate the Jaccard similarity of two texts from their MinHash signatures.
+
+    Args:
+        signature (List[int]): A MinHash signature.
+        other (List[int]): Another signature of the same length.
+
+    Returns:
+        float: The share of matching positions, from 0.0 to 1.0.
+    """
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(a == b for a, b in zip(signature, other)) / len(signature)
+
+
+def lsh_buckets(signature: List[int], bands: int = LSH_BANDS) -> List[Tuple[int, str]]:
+    """
+    Split a signature into bands and hash each band to an LSH bucket key.
+
+    Two signatures sharing any (band, bucket) pair are candidate near-duplicates;
+    the chance of that rises steeply with their similarity.
+
+    Args:
+        signature (List[int]): A MinHash signature.
+        bands (int): The number of bands; must divide the signature length.
+
+    Returns:
+        List[Tuple[int, str]]: One (band index, bucket key) pair per band.
+    """
+    rows = len(signature) // bands
+    return [
+        (band, hashlib.blake2b(
+            ','.join(map(str, signature[band * rows:(band + 1) * rows])).encode('ascii'), digest_size=8
+        ).hexdigest())
+        for band in range(bands)
+    ]
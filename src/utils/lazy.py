@@ -0,0 +1,39 @@
+import threading
+from typing import Any, Callable
+
+
+class LazyObject:
+    """
+    Stand-in for an expensive object that is only built when first used.
+
+    Attribute access and calls are forwarded to the object returned by
+    `factory`, which runs once, on first use, from whichever thread gets
+    there first. Used for API clients and models so that importing a module
+    does not import their libraries or open connections.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        self._factory = factory
+        self._name = name
+        self._lock = threading.Lock()
+        self._target = None
+        self._resolved = False
+
+    def resolve(self) -> Any:
+        """Return the real object, building it if this is the first use."""
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._target = self._factory()
+                    self._resolved = True
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = repr(self._target) if self._resolved else 'not loaded'
+        return f"<LazyObject {self._name}: {state}>"
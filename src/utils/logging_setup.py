@@ -0,0 +1,211 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed in `extra` and is logged as a field
+STANDARD_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'exception'}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Shorten text to at most about `max_chars` characters, noting how much was cut."""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """
+    Parse per-logger levels written as "name=LEVEL,name=LEVEL".
+
+    Args:
+        spec (str): The level specification, e.g. "urllib3=WARNING,src.core.job_parser=INFO".
+
+    Returns:
+        Dict[str, str]: Upper-cased level names keyed by logger name.
+    """
+    levels = {}
+    for item in spec.split(','):
+        if '=' in item:
+            name, level = item.split('=', 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out high-volume log lines below WARNING, per call site.
+
+    Within each `interval` seconds a call site (file and line) logs its first
+    `burst` records and then only every `every`-th one. Warnings and errors
+    always pass.
+    """
+
+    def __init__(self, burst: int = 100, every: int = 100, interval: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._window = time.monotonic()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.burst <= 0:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window >= self.interval:
+                self._counts.clear()
+                self._window = now
+            count = self._counts[site] = self._counts.get(site, 0) + 1
+        return count <= self.burst or (count - self.burst) % self.every == 0
+
+
+class TruncatingQueueHandler(QueueHandler):
+    """
+    Queue handler that does only cheap work on the logging thread.
+
+    The message is formatted and truncated, any exception traceback and
+    `extra` fields are captured, and the record is handed to the background
+    listener. When the queue is full the record is dropped and counted
+    rather than blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int = 2000):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = truncate(record.getMessage(), self.max_chars)
+        record.args = None
+        if record.exc_info:
+            record.exception = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.exc_text = None
+        for key, value in list(vars(record).items()):
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                # Serialise now, so later changes to the caller's objects do not leak in
+                setattr(record, key, truncate(json.dumps(value, default=str), self.max_chars))
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _decode_field(value):
+    """Turn an `extra` field serialised by TruncatingQueueHandler back into JSON data."""
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        # Truncated fields are no longer valid JSON; log them as text
+        return value
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records prepared by TruncatingQueueHandler as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                entry[key] = _decode_field(value)
+        if getattr(record, 'exception', None):
+            entry['exception'] = record.exception
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text format, with any captured traceback appended."""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        exception = getattr(record, 'exception', None)
+        return f"{text}\n{exception}" if exception else text
+
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging():
+    """Stop the background writer, flushing any queued records."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(level: str = 'DEBUG', module_levels: Optional[Dict[str, str]] = None, log_format: str = 'json',
+                  log_file: Optional[str] = None, max_chars: int = 2000, sample_burst: int = 100,
+                  sample_every: int = 100, queue_size: int = 10000) -> QueueHandler:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    The root logger gets a single TruncatingQueueHandler with a SamplingFilter;
+    a QueueListener thread formats records (JSON or text) and writes them to
+    stderr and, optionally, a file. Calling it again replaces the previous setup.
+
+    Args:
+        level (str): The root logger level.
+        module_levels (Optional[Dict[str, str]]): Levels for individual loggers.
+        log_format (str): 'json' for one JSON object per line, or 'text'.
+        log_file (Optional[str]): A file to append log lines to.
+        max_chars (int): Longest message or extra field logged before truncation (0 = no limit).
+        sample_burst (int): Records below WARNING logged per call site each minute before sampling.
+        sample_every (int): After the burst, log one in this many records per call site.
+        queue_size (int): Records buffered for the writer before new ones are dropped.
+
+    Returns:
+        QueueHandler: The handler installed on the root logger.
+    """
+    global _listener
+    stop_logging()
+
+    formatter = JsonFormatter() if log_format == 'json' else TextFormatter()
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = TruncatingQueueHandler(log_queue, max_chars)
+    queue_handler.addFilter(SamplingFilter(sample_burst, sample_every))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    return queue_handler
@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Thread-safe, in-process counters and timings.
+
+    Counters are plain integers keyed by a dotted name (e.g.
+    'structured_data.hit'); timings keep a count, total and maximum in seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+
+    def increment(self, name, amount=1):
+        """Add `amount` to the counter `name`."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """Record one duration, in seconds, for the timing `name`."""
+        with self._lock:
+            timing = self._timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            timing['count'] += 1
+            timing['total'] += seconds
+            timing['max'] = max(timing['max'], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Context manager that records the duration of its block under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name):
+        """Return the current value of the counter `name`."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, numerator, denominator):
+        """Return counter `numerator` divided by counter `denominator`, or 0.0 if it is zero."""
+        with self._lock:
+            total = self._counters.get(denominator, 0)
+            return self._counters.get(numerator, 0) / total if total else 0.0
+
+    def snapshot(self):
+        """
+        Return a copy of all counters and timings.
+
+        Returns:
+            dict: {'counters': {...}, 'timings': {name: {'count', 'total', 'max', 'mean'}}}
+        """
+        with self._lock:
+            timings = {
+                name: dict(timing, mean=timing['total'] / timing['count'] if timing['count'] else 0.0)
+                for name, timing in self._timings.items()
+            }
+            return {'counters': dict(self._counters), 'timings': timings}
+
+    def merge(self, snapshot):
+        """Add the counters and timings of another registry's `snapshot()`, e.g. from a worker process."""
+        with self._lock:
+            for name, amount in snapshot['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + amount
+            for name, other in snapshot['timings'].items():
+                timing = self._timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+                timing['count'] += other['count']
+                timing['total'] += other['total']
+                timing['max'] = max(timing['max'], other['max'])
+
+    def reset(self):
+        """Clear all counters and timings."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+# Process-wide metrics registry shared by the pipeline stages
+metrics = Metrics()
@@ -1,5 +1,8 @@
 import re
-from typing import List
+from collections import deque
+from datetime import date
+from typing import Iterator, List, Optional, Tuple
+from dateutil import parser as date_parser
 
 def expand_job_title_acronyms(title):
     """
@@ -44,44 +47,117 @@ def expand_job_title_acronyms(title):
     
     return expanded_title
 
-def split_text(text: str, max_length: int = 384, stride: int = 128) -> List[str]:
+def _word_offsets(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (start, end) character offsets of each whitespace-delimited word.
+
+    Used as the default tokenizer by `iter_token_spans` when no model tokenizer
+    is supplied.
+    """
+    return (match.span() for match in re.finditer(r'\S+', text))
+
+def _token_offsets(text: str, tokenizer=None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (start, end) character offsets of each token in a text.
+
+    Words are found as they are consumed, so no offset list is built for the
+    whole text. A model tokenizer encodes the text in one call, but its offsets
+    are still handed out one at a time.
+
+    Args:
+        text (str): The text to tokenize.
+        tokenizer: A Hugging Face fast tokenizer (anything that accepts
+                   `return_offsets_mapping=True`). If None, whitespace-delimited
+                   words are used as tokens.
+
+    Yields:
+        Tuple[int, int]: One character span per token, in text order.
+    """
+    if tokenizer is None:
+        yield from _word_offsets(text)
+        return
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+    # Some tokenizers emit empty (0, 0) spans for tokens with no source text
+    yield from ((start, end) for start, end in encoding["offset_mapping"] if end > start)
+
+def iter_token_spans(text: str, max_tokens: int = 384, stride: int = 128,
+                     tokenizer=None) -> Iterator[Tuple[int, int]]:
+    """
+    Yield overlapping (start, end) character spans covering a text by token count.
+
+    Each span covers at most `max_tokens` tokens and consecutive spans share
+    exactly `stride` tokens. Spans index into the original string, so no chunk
+    is copied until the caller slices it (see `iter_text_chunks`). Token
+    offsets are consumed as the spans are produced; only the current span's
+    `max_tokens` offsets are held at a time.
+
+    Args:
+        text (str): The text to chunk.
+        max_tokens (int): The maximum number of tokens in each span.
+        stride (int): The number of tokens shared by consecutive spans.
+        tokenizer: Optional Hugging Face fast tokenizer used to count tokens.
+                   Defaults to whitespace-delimited words.
+
+    Yields:
+        Tuple[int, int]: Character offsets such that `text[start:end]` is a chunk.
+
+    Raises:
+        ValueError: If `stride` is negative or not smaller than `max_tokens`.
+    """
+    if max_tokens <= 0 or stride < 0 or stride >= max_tokens:
+        raise ValueError("stride must be non-negative and smaller than max_tokens")
+
+    step = max_tokens - stride
+    window = deque()
+    # Tokens added to the window since the last span was yielded
+    fresh = 0
+
+    for offset in _token_offsets(text, tokenizer):
+        window.append(offset)
+        fresh += 1
+        if len(window) == max_tokens:
+            yield window[0][0], window[-1][1]
+            fresh = 0
+            for _ in range(step):
+                window.popleft()
+    if fresh:
+        yield window[0][0], window[-1][1]
+
+def iter_text_chunks(text: str, max_tokens: int = 384, stride: int = 128,
+                     tokenizer=None) -> Iterator[str]:
+    """
+    Lazily yield the overlapping chunks described by `iter_token_spans`.
+
+    Args:
+        text (str): The text to chunk.
+        max_tokens (int): The maximum number of tokens in each chunk.
+        stride (int): The number of tokens shared by consecutive chunks.
+        tokenizer: Optional Hugging Face fast tokenizer used to count tokens.
+
+    Yields:
+        str: Each chunk, sliced from the original text only when requested.
+    """
+    for start, end in iter_token_spans(text, max_tokens, stride, tokenizer):
+        yield text[start:end]
+
+def split_text(text: str, max_length: int = 384, stride: int = 128, tokenizer=None) -> List[str]:
     """
     Split a text into overlapping chunks of a specified maximum length.
 
-    This function divides a given text into chunks, each with a maximum length
-    specified by the `max_length` parameter. The chunks overlap by a number of
-    words specified by the `stride` parameter to ensure continuity between chunks.
+    This is the list-returning form of `iter_text_chunks`; prefer the generator
+    (or `iter_token_spans`) for long texts. Lengths are counted in tokens of the
+    given tokenizer, or in whitespace-delimited words when none is supplied.
 
     Args:
         text (str): The text to be split into chunks.
-        max_length (int): The maximum number of words in each chunk.
-        stride (int): The number of words to overlap between consecutive chunks.
+        max_length (int): The maximum number of tokens in each chunk.
+        stride (int): The number of tokens to overlap between consecutive chunks.
+        tokenizer: Optional Hugging Face fast tokenizer used to count tokens.
 
     Returns:
         List[str]: A list of text chunks.
     """
-    words = text.split()
-    
-    if len(words) <= max_length:
-        return [text]
-    
-    chunks = []
-    step = max_length - stride
-    start = 0
-    
-    # Generate chunks using sliding window approach
-    while start + max_length <= len(words):
-        chunks.append(" ".join(words[start:start + max_length]))
-        start += step
-    
-    # Handle remaining words that don't fit perfectly
-    if start < len(words):
-        final_chunk = " ".join(words[start:])
-        # Only add if different from last chunk and contains new content
-        if not chunks or final_chunk != chunks[-1]:
-            chunks.append(final_chunk)
-    
-    return chunks
+    return list(iter_text_chunks(text, max_length, stride, tokenizer))
 
 def escape_latex(text):
     """
@@ -157,3 +233,21 @@ def clean_text(text):
     text = re.sub(r'Agree & Join LinkedIn.*?Cookie Policy\.', '', text, flags=re.DOTALL)
     text = ' '.join(text.split())
     return text
+
+def parse_application_deadline(deadline) -> Optional[date]:
+    """
+    Parse an extracted application deadline into a date.
+
+    Args:
+        deadline (str): The deadline text, e.g. "March 1, 2025" or "2025-03-01".
+
+    Returns:
+        Optional[date]: The parsed date, or None if the text is empty or is not
+                        a date (e.g. "Open until filled").
+    """
+    if not deadline or not str(deadline).strip():
+        return None
+    try:
+        return date_parser.parse(str(deadline)).date()
+    except (ValueError, OverflowError):
+        return None
@@ -0,0 +1,19 @@
+# tests/fake_http.py
+
+class FakeHttpResponse:
+    """Stands in for a streamed requests.Response."""
+
+    def __init__(self, content, content_type="text/html; charset=utf-8", status_code=200):
+        self.content = content
+        self.headers = {"Content-Type": content_type} if content_type else {}
+        self.status_code = status_code
+        self.chunks_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            self.chunks_read += 1
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
@@ -17,7 +17,27 @@ class FakePages:
         # By default, simulate a page that is not archived.
         return {"archived": False}
 
-# A fake Notion client containing our fake pages.
+# Define a fake databases class that pages through preset query results.
+class FakeDatabases:
+    def __init__(self, results=None, page_size=2):
+        self.results = results or []
+        self.page_size = page_size
+        self.queries = []
+
+    def query(self, database_id, start_cursor=None, **kwargs):
+        # Record each query and serve results in chunks, like Notion's pagination.
+        self.queries.append(dict(kwargs, database_id=database_id, start_cursor=start_cursor))
+        start = int(start_cursor or 0)
+        end = start + self.page_size
+        has_more = end < len(self.results)
+        return {
+            "results": self.results[start:end],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+
+# A fake Notion client containing our fake pages and databases.
 class FakeNotionClient:
     def __init__(self):
-        self.pages = FakePages()
\ No newline at end of file
+        self.pages = FakePages()
+        self.databases = FakeDatabases()
\ No newline at end of file
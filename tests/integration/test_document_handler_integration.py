@@ -72,4 +72,39 @@ def test_save_cover_letter_documents_latex_failure(job_details_fixture,
         mock_run.side_effect = Exception("LaTeX compilation error")
 
         with pytest.raises(Exception, match="LaTeX compilation error"):
-            save_cover_letter_documents(job_details_fixture, cover_letter_text_fixture)
\ No newline at end of file
+            save_cover_letter_documents(job_details_fixture, cover_letter_text_fixture)
+
+def test_render_cover_letter_documents_in_memory(job_details_fixture, cover_letter_text_fixture):
+    """
+    Test that rendering returns the final documents' bytes and leaves LaTeX intermediates behind.
+    """
+    from src.core.document_handler import render_cover_letter_documents
+
+    def fake_xelatex(args, **kwargs):
+        output_dir = args[args.index('-output-directory') + 1]
+        for name, content in [("cover_letter.pdf", "%PDF-1.5"), ("cover_letter.aux", "aux"), ("cover_letter.log", "log")]:
+            with open(os.path.join(output_dir, name), 'w') as f:
+                f.write(content)
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
+
+    with patch("subprocess.run", side_effect=fake_xelatex), \
+         patch("jinja2.Environment.get_template") as mock_get_template:
+        mock_get_template.return_value.render.return_value = "\\documentclass{article}"
+        rendered = render_cover_letter_documents(job_details_fixture, cover_letter_text_fixture)
+
+    assert sorted(rendered) == ["cover_letter.docx", "cover_letter.pdf", "cover_letter.tex", "job_details.txt"]
+    assert rendered["cover_letter.pdf"] == b"%PDF-1.5"
+    assert rendered["cover_letter.docx"].startswith(b"PK")
+
+def test_render_cover_letter_documents_draft_skips_latex(job_details_fixture, cover_letter_text_fixture):
+    """
+    Test that a draft render produces a PDF without running xelatex or writing a .tex file.
+    """
+    from src.core.document_handler import render_cover_letter_documents
+
+    with patch("subprocess.run") as mock_run:
+        rendered = render_cover_letter_documents(job_details_fixture, cover_letter_text_fixture, draft=True)
+
+    mock_run.assert_not_called()
+    assert sorted(rendered) == ["cover_letter.docx", "cover_letter.pdf", "job_details.txt"]
+    assert rendered["cover_letter.pdf"].startswith(b"%PDF")
@@ -1,6 +1,8 @@
 import json
 import pytest
 
+from src.api.notion_client import docker_to_local_path
+
 def test_home_route(client):
     """Test that the home route returns the expected greeting."""
     response = client.get("/")
@@ -20,14 +22,135 @@ def test_webhook_success(client):
     assert response.status_code == 200
     data = response.get_json()
     assert data["status"] == "success"
-    assert data["documents_folder"] == "C:/dummy/windows_folder"
+    assert data["documents_folder"] == str(docker_to_local_path("/dummy/docker_folder"))
+
+def test_webhook_caches_artifacts_and_updates_notion_with_saved_paths(client, monkeypatch):
+    """
+    Test that the documents saved by a real-shaped (3-tuple) save are served from /artifacts
+    and that Notion is given the saved Docker paths.
+    """
+    def fake_save(job_details, cover_letter, artifacts=None, **kwargs):
+        artifacts["cover_letter.pdf"] = b"%PDF-1.4 letter"
+        return "/app/cover_letters/Acme", "/app/cover_letters/Acme/cover_letter.docx", \
+            "/app/cover_letters/Acme/cover_letter.pdf"
+    notion_calls = []
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents", fake_save)
+    monkeypatch.setattr("src.server.webhook_server.update_notion_database",
+                        lambda *args: notion_calls.append(args))
+
+    response = client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "page-with-artifacts"})
+    assert response.status_code == 200
+    assert notion_calls[0][2:] == ("/app/cover_letters/Acme", "/app/cover_letters/Acme/cover_letter.docx",
+                                   "/app/cover_letters/Acme/cover_letter.pdf")
+    download = client.get("/artifacts/page-with-artifacts/pdf")
+    assert download.status_code == 200
+    assert download.data == b"%PDF-1.4 letter"
+
+def test_webhook_artifacts_outlive_the_memory_cache(client, monkeypatch, tmp_path):
+    """
+    Test that documents published by /webhook are still served from their folder once the
+    in-memory copy is gone, since the webhook records the folder in the job store.
+    """
+    from src.core.artifacts import artifact_cache
+
+    def fake_save(job_details, cover_letter, artifacts=None, **kwargs):
+        (tmp_path / "cover_letter.pdf").write_bytes(b"%PDF-1.4 published")
+        artifacts["cover_letter.pdf"] = b"%PDF-1.4 published"
+        return str(tmp_path), str(tmp_path / "cover_letter.docx"), str(tmp_path / "cover_letter.pdf")
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents", fake_save)
+
+    assert client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "page-published"}).status_code == 200
+    artifact_cache.clear()
+    download = client.get("/artifacts/page-published/pdf")
+    assert download.status_code == 200
+    assert download.data == b"%PDF-1.4 published"
+
+def test_webhook_reuses_stored_work_for_a_processed_posting(client, monkeypatch, tmp_path,
+                                                            isolate_webhook_job_store):
+    """
+    Test that a posting already in the job store skips extraction, generation and rendering,
+    and that Notion is still updated with the stored documents.
+    """
+    calls = []
+    (tmp_path / "cover_letter.pdf").write_bytes(b"%PDF-1.4 stored")
+
+    def fake_save(job_details, cover_letter, **kwargs):
+        calls.append("save")
+        return str(tmp_path), str(tmp_path / "cover_letter.docx"), str(tmp_path / "cover_letter.pdf")
+    monkeypatch.setattr("src.server.webhook_server.extract_job_details",
+                        lambda url, **kwargs: calls.append("extract") or {"Company": "Acme", "Job Title": "Analyst"})
+    monkeypatch.setattr("src.server.webhook_server.generate_cover_letter",
+                        lambda job_details: calls.append("generate") or "Letter")
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents", fake_save)
+    notion_calls = []
+    monkeypatch.setattr("src.server.webhook_server.update_notion_database",
+                        lambda *args: notion_calls.append(args))
+
+    client.post("/webhook", json={"Job URL": "https://acme.example/jobs/1", "ID": "page-1"})
+    response = client.post("/webhook", json={"Job URL": "https://www.acme.example/jobs/1?utm_source=x",
+                                             "ID": "page-2"})
+    assert response.status_code == 200
+    assert calls == ["extract", "generate", "save"]
+    assert notion_calls[1][0] == "page-2"
+    assert notion_calls[1][1]["Job URL"] == "https://www.acme.example/jobs/1?utm_source=x"
+    assert notion_calls[1][2:] == notion_calls[0][2:]
+    record = isolate_webhook_job_store.find_by_page_id("page-2")
+    assert (record["stage"], record["status"]) == ("notion", "ok")
+
+def test_webhook_reuses_near_duplicate_posting(client, monkeypatch, tmp_path, isolate_webhook_job_store):
+    """
+    Test that a repost under a new URL whose page text nearly matches a stored posting reuses
+    its details, letter and documents instead of generating and rendering them again.
+    """
+    from src.utils.fingerprint import minhash_signature
+
+    page_text = " ".join(f"Acme Corp is hiring an analyst to build forecasting model number {i}." for i in range(20))
+    (tmp_path / "cover_letter.pdf").write_bytes(b"%PDF-1.4 stored")
+    isolate_webhook_job_store.record_stage(
+        "https://acme.example/careers/42", "notion", page_id="page-1",
+        job_details={"Company": "Acme Corp", "Job Title": "Analyst"}, signature=minhash_signature(page_text),
+        cover_letter="Stored letter", folder_path=str(tmp_path), doc_path=str(tmp_path / "cover_letter.docx"),
+        pdf_path=str(tmp_path / "cover_letter.pdf"))
+
+    def fake_extract(url, find_duplicate=None):
+        return find_duplicate(page_text) or {"Company": "Someone else"}
+    calls = []
+    notion_calls = []
+    monkeypatch.setattr("src.server.webhook_server.extract_job_details", fake_extract)
+    monkeypatch.setattr("src.server.webhook_server.generate_cover_letter", lambda job_details: calls.append("generate"))
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents",
+                        lambda *args, **kwargs: calls.append("save"))
+    monkeypatch.setattr("src.server.webhook_server.update_notion_database", lambda *args: notion_calls.append(args))
+
+    response = client.post("/webhook", json={"Job URL": "https://jobs-aggregator.example/view/9913", "ID": "page-2"})
+    assert response.status_code == 200
+    assert calls == []
+    page_id, job_details, folder_path, _, pdf_path = notion_calls[0]
+    assert (page_id, job_details["Company"], folder_path) == ("page-2", "Acme Corp", str(tmp_path))
+    assert job_details["Job URL"] == "https://jobs-aggregator.example/view/9913"
+    mirror = isolate_webhook_job_store.find("https://jobs-aggregator.example/view/9913")
+    assert mirror["signature"] == minhash_signature(page_text)
+    assert (mirror["cover_letter"], mirror["pdf_path"]) == ("Stored letter", str(tmp_path / "cover_letter.pdf"))
+
+def test_webhook_records_failed_stage(client, monkeypatch, isolate_webhook_job_store):
+    """
+    Test that a stage that fails is recorded in the job store with its error.
+    """
+    def model_down(job_details):
+        raise RuntimeError("model unavailable")
+    monkeypatch.setattr("src.server.webhook_server.generate_cover_letter", model_down)
+
+    assert client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"}).status_code == 500
+    record = isolate_webhook_job_store.find("http://dummy.url")
+    assert (record["stage"], record["status"], record["error"]) == ("generate", "failed", "model unavailable")
+    assert record["job_details"]["Company"] == "Test Company"
 
 def test_webhook_error(client, monkeypatch):
     """
     Test that if one of the internal functions (e.g. extract_job_details)
     raises an Exception, the /webhook endpoint returns an error status.
     """
-    def raise_error(url):
+    def raise_error(url, **kwargs):
         raise Exception("Test error")
     monkeypatch.setattr(
         "src.server.webhook_server.extract_job_details", 
@@ -42,3 +165,114 @@ def test_webhook_error(client, monkeypatch):
     data = response.get_json()
     assert data["status"] == "error"
     assert "Test error" in data["message"]
+
+def test_download_artifact_from_memory_with_etag_and_range(client):
+    """
+    Test that a document cached by the server is served with ETag and Range support.
+    """
+    from src.core.artifacts import artifact_cache
+    artifact_cache.put("page-artifacts", {"cover_letter.pdf": b"%PDF-1.5 letter body"})
+
+    response = client.get("/artifacts/page-artifacts/pdf")
+    assert response.status_code == 200
+    assert response.data == b"%PDF-1.5 letter body"
+    assert response.mimetype == "application/pdf"
+    etag = response.headers["ETag"]
+
+    assert client.get("/artifacts/page-artifacts/pdf", headers={"If-None-Match": etag}).status_code == 304
+    partial = client.get("/artifacts/page-artifacts/pdf", headers={"Range": "bytes=0-7"})
+    assert partial.status_code == 206
+    assert partial.data == b"%PDF-1.5"
+
+def test_download_artifact_from_job_store(client, monkeypatch, tmp_path):
+    """
+    Test that documents published by the pipeline are read from the folder in the job store.
+    """
+    from src.core.job_store import JobStore
+    from src.server import webhook_server
+    (tmp_path / "cover_letter.docx").write_bytes(b"PK docx")
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.record_stage("http://dummy.url/stored", "save", page_id="page-stored", folder_path=str(tmp_path))
+    monkeypatch.setattr(webhook_server, "job_store", store)
+
+    response = client.get("/artifacts/page-stored/docx")
+    assert response.status_code == 200
+    assert response.data == b"PK docx"
+    assert client.get("/artifacts/page-stored/pdf").status_code == 404
+    assert client.get("/artifacts/page-stored/exe").status_code == 404
+
+def test_webhook_busy_when_latex_queue_full(client, monkeypatch):
+    """
+    Test that a full LaTeX compile queue is reported as a retryable 503.
+    """
+    from src.core.latex_compiler import LatexQueueFullError
+
+    def queue_full(job_details, cover_letter, **kwargs):
+        raise LatexQueueFullError("LaTeX compile queue is full")
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents", queue_full)
+
+    response = client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert response.get_json()["status"] == "error"
+
+
+def test_webhook_busy_when_openai_rate_limited(client, monkeypatch):
+    """
+    Test that a request still rate limited after the governor's retries is a 503 with its retry hint.
+    """
+    from src.core.rate_governor import RateLimitedError
+
+    def rate_limited(job_details):
+        raise RateLimitedError("OpenAI rate limit persisted", retry_after=12.4)
+    monkeypatch.setattr("src.server.webhook_server.generate_cover_letter", rate_limited)
+
+    response = client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
+
+def test_webhook_times_out_at_deadline(client, monkeypatch):
+    """
+    Test that a request whose deadline passes partway through is a 504, and that the deadline is set.
+    """
+    from src.utils.deadline import DeadlineExceeded, time_remaining
+
+    seen = []
+
+    def out_of_time(job_details):
+        seen.append(time_remaining())
+        raise DeadlineExceeded("Request deadline exceeded")
+    monkeypatch.setattr("src.server.webhook_server.generate_cover_letter", out_of_time)
+
+    response = client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"})
+    assert response.status_code == 504
+    assert seen[0] is not None and seen[0] > 0
+
+def test_webhook_unavailable_while_breaker_open(client, monkeypatch):
+    """
+    Test that an open circuit breaker is a 503 with the time until the breaker retries.
+    """
+    from src.utils.circuit_breaker import CircuitOpenError
+
+    def breaker_open(url, **kwargs):
+        raise CircuitOpenError("fetch.example.com", retry_after=20)
+    monkeypatch.setattr("src.server.webhook_server.extract_job_details", breaker_open)
+
+    response = client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "20"
+
+def test_webhook_passes_draft_flag(client, monkeypatch):
+    """
+    Test that a "Draft" field asks for a draft render.
+    """
+    calls = []
+
+    def fake_save(job_details, cover_letter, **kwargs):
+        calls.append(kwargs["draft"])
+        return ("/d", "/d/doc.docx", "/d/doc.pdf")
+    monkeypatch.setattr("src.server.webhook_server.save_cover_letter_documents", fake_save)
+
+    client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id", "Draft": True})
+    client.post("/webhook", json={"Job URL": "http://dummy.url", "ID": "dummy_id"})
+    assert calls == [True, False]
@@ -0,0 +1,39 @@
+# tests/unit/test_artifacts.py
+
+import hashlib
+
+from src.core.artifacts import ArtifactCache, artifact_url, load_artifact
+
+
+def test_cache_returns_artifacts_by_kind_with_content_etag():
+    cache = ArtifactCache(max_bytes=1024)
+    cache.put("page-1", {"cover_letter.pdf": b"%PDF-1.5", "cover_letter.docx": b"PK", "cover_letter.aux": b"x"})
+
+    pdf = cache.get("page-1", "pdf")
+    assert pdf.data == b"%PDF-1.5"
+    assert pdf.etag == hashlib.sha256(b"%PDF-1.5").hexdigest()
+    assert (pdf.filename, pdf.mimetype) == ("cover_letter.pdf", "application/pdf")
+    assert cache.get("page-1", "tex") is None
+    assert cache.get("page-2", "pdf") is None
+
+
+def test_cache_evicts_least_recently_used_jobs():
+    cache = ArtifactCache(max_bytes=10)
+    cache.put("old", {"cover_letter.pdf": b"aaaa"})
+    cache.put("used", {"cover_letter.pdf": b"bbbb"})
+    assert cache.get("old", "pdf") is not None
+    cache.put("new", {"cover_letter.pdf": b"cccc"})
+
+    assert cache.get("used", "pdf") is None
+    assert cache.get("old", "pdf").data == b"aaaa"
+    assert cache.get("new", "pdf").data == b"cccc"
+
+
+def test_load_artifact_reads_published_folder(tmp_path):
+    (tmp_path / "cover_letter.docx").write_bytes(b"PK docx")
+    assert load_artifact(str(tmp_path), "docx").data == b"PK docx"
+    assert load_artifact(str(tmp_path), "pdf") is None
+
+
+def test_artifact_url():
+    assert artifact_url("https://host.example/", "abc", "pdf") == "https://host.example/artifacts/abc/pdf"
@@ -0,0 +1,61 @@
+# tests/unit/test_circuit_breaker.py
+
+import time
+
+import pytest
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, circuit_breaker
+from src.utils.metrics import metrics
+
+
+def fail(breaker, error=ConnectionError("down"), is_failure=lambda e: True):
+    with pytest.raises(type(error)):
+        with breaker.guard(is_failure):
+            raise error
+
+
+def test_opens_after_consecutive_failures_and_rejects():
+    breaker = CircuitBreaker("test-open", failure_threshold=2, reset_seconds=60)
+    fail(breaker)
+    assert breaker.state == "closed"
+    fail(breaker)
+    assert breaker.state == "open"
+    rejected = metrics.counter("breaker.test-open.rejected")
+    with pytest.raises(CircuitOpenError) as info:
+        with breaker.guard():
+            pytest.fail("the call should not run while the breaker is open")
+    assert 0 < info.value.retry_after <= 60
+    assert metrics.counter("breaker.test-open.rejected") == rejected + 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test-reset", failure_threshold=2, reset_seconds=60)
+    fail(breaker)
+    with breaker.guard():
+        pass
+    fail(breaker)
+    assert breaker.state == "closed"
+
+
+def test_errors_that_are_not_failures_do_not_open():
+    breaker = CircuitBreaker("test-ignored", failure_threshold=1, reset_seconds=60)
+    fail(breaker, ValueError("bad request"), is_failure=lambda e: isinstance(e, ConnectionError))
+    assert breaker.state == "closed"
+
+
+def test_half_open_trial_closes_or_reopens():
+    breaker = CircuitBreaker("test-half-open", failure_threshold=1, reset_seconds=0.01)
+    fail(breaker)
+    time.sleep(0.02)
+    assert breaker.state == "half-open"
+    fail(breaker)
+    assert breaker.state == "open"
+    time.sleep(0.02)
+    with breaker.guard():
+        pass
+    assert breaker.state == "closed"
+
+
+def test_registry_returns_one_breaker_per_name():
+    assert circuit_breaker("test-registry") is circuit_breaker("test-registry")
+    assert circuit_breaker("test-registry") is not circuit_breaker("test-other")
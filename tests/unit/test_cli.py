@@ -0,0 +1,58 @@
+# tests/unit/test_cli.py
+
+import pytest
+
+from src import cli
+
+
+@pytest.fixture(autouse=True)
+def keep_test_logging(monkeypatch):
+    # Leave pytest's log capture in place instead of starting the background writer
+    monkeypatch.setattr(cli, "configure_logging", lambda: None)
+
+
+def test_bulk_reads_file_and_passes_concurrency(monkeypatch, tmp_path, capsys):
+    captured = {}
+
+    def fake_run_pipeline(jobs, concurrency, checkpoint, store):
+        captured.update(jobs=jobs, concurrency=concurrency, checkpoint=checkpoint, store=store)
+        jobs[1].error = "extract: boom"
+        return jobs
+
+    monkeypatch.setattr(cli, "run_pipeline", fake_run_pipeline)
+    input_file = tmp_path / "jobs.txt"
+    input_file.write_text("https://a.example/1 page-1\nhttps://a.example/2\n")
+
+    exit_code = cli.main(["bulk", str(input_file), "--checkpoint", str(tmp_path / "cp.jsonl"),
+                          "--job-store", str(tmp_path / "jobs.sqlite3"),
+                          "--extract-workers", "8", "--save-workers", "1"])
+
+    assert exit_code == 1
+    assert [job.key for job in captured["jobs"]] == ["page-1", "https://a.example/2"]
+    assert captured["concurrency"]["extract"] == 8
+    assert captured["concurrency"]["save"] == 1
+    assert captured["checkpoint"].path == str(tmp_path / "cp.jsonl")
+    assert captured["store"].path == str(tmp_path / "jobs.sqlite3")
+    out = capsys.readouterr().out
+    assert "Completed 1 of 2 jobs." in out
+    assert "FAILED https://a.example/2: extract: boom" in out
+
+
+def test_poll_once_requires_database_and_reports(monkeypatch, tmp_path, capsys):
+    assert cli.main(["poll", "--once", "--database-id", ""]) == 2
+
+    captured = {}
+
+    def fake_poll_once(database_id, cursor, batch_size, concurrency, checkpoint, store):
+        captured.update(database_id=database_id, batch_size=batch_size, cursor=cursor, store=store)
+        return []
+
+    monkeypatch.setattr(cli, "poll_once", fake_poll_once)
+    exit_code = cli.main(["poll", "--once", "--database-id", "db", "--batch-size", "5",
+                          "--cursor-file", str(tmp_path / "cursor.json"),
+                          "--checkpoint", str(tmp_path / "cp.jsonl"), "--no-job-store"])
+    assert exit_code == 0
+    assert captured["store"] is None
+    assert captured["database_id"] == "db"
+    assert captured["batch_size"] == 5
+    assert "Completed 0 of 0 jobs." in capsys.readouterr().out
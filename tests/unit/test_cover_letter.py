@@ -66,3 +66,14 @@ def test_generate_cover_letter_includes_job_details(monkeypatch, dummy_job_detai
     
     # Also check that the function returns the simulated response output
     assert result == "Test cover letter output"
+
+
+def test_is_acceptable_cover_letter():
+    """
+    Letters with placeholders, no content, or too many paragraphs are rejected
+    so the router escalates to a stronger model.
+    """
+    assert cover_letter.is_acceptable_cover_letter("I am excited to apply.\n\nThank you.")
+    assert not cover_letter.is_acceptable_cover_letter("")
+    assert not cover_letter.is_acceptable_cover_letter("Dear [Hiring Manager], I am excited to apply.")
+    assert not cover_letter.is_acceptable_cover_letter("\n\n".join(["Paragraph."] * 4))
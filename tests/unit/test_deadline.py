@@ -0,0 +1,69 @@
+# tests/unit/test_deadline.py
+
+import time
+
+import pytest
+
+from src.utils.deadline import (
+    DeadlineExceeded, call_timeout, check_deadline, deadline_request_hook, request_deadline, time_remaining
+)
+
+
+def test_no_deadline_by_default():
+    assert time_remaining() is None
+    assert call_timeout(20) == 20
+    check_deadline()
+
+
+def test_call_timeout_is_cut_to_time_left():
+    with request_deadline(5):
+        assert 4 < call_timeout(20) <= 5
+        assert call_timeout(1) == 1
+    assert time_remaining() is None
+
+
+def test_nested_deadline_only_shortens():
+    with request_deadline(1):
+        with request_deadline(100):
+            assert time_remaining() <= 1
+        with request_deadline(0.5):
+            assert time_remaining() <= 0.5
+
+
+def test_expired_deadline_raises():
+    with request_deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            check_deadline()
+        with pytest.raises(DeadlineExceeded):
+            call_timeout(20)
+
+
+def test_request_hook_bounds_each_httpx_request_by_the_deadline():
+    import httpx
+
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler),
+                          event_hooks={"request": [deadline_request_hook(30)]})
+    client.get("https://api.notion.com/v1/pages/1")
+    with request_deadline(2):
+        client.get("https://api.notion.com/v1/pages/1")
+        time.sleep(0.01)
+    assert timeouts[0] == 30
+    assert 1 < timeouts[1] <= 2
+    with request_deadline(0.001):
+        time.sleep(0.01)
+        with pytest.raises(DeadlineExceeded):
+            client.get("https://api.notion.com/v1/pages/1")
+
+
+def test_notion_client_uses_the_deadline_hook():
+    from src.utils import config
+
+    client = config._create_notion_client()
+    assert [hook.__name__ for hook in client.client.event_hooks["request"]] == ["bound_request"]
@@ -1,6 +1,8 @@
 # tests/unit/test_document_handler.py
 
-from src.core.document_handler import is_one_page_pdf
+import os
+
+from src.core.document_handler import is_one_page_pdf, publish_artifacts
 
 def test_is_one_page_pdf_true(one_page_pdf_fixture):
     """
@@ -13,3 +15,19 @@ def test_is_one_page_pdf_false(two_page_pdf_fixture):
     Unit test: is_one_page_pdf should return False for multiple-page PDF.
     """
     assert is_one_page_pdf(two_page_pdf_fixture) is False
+
+def test_publish_artifacts_never_merges_folders(tmp_path):
+    """
+    Unit test: publish_artifacts renames a complete folder into place, suffixing on collision.
+    """
+    artifacts = {"cover_letter.docx": b"docx", "cover_letter.pdf": b"%PDF"}
+    output_dir = tmp_path / "cover_letters"
+
+    first = publish_artifacts(artifacts, str(output_dir / "Acme_Analyst"))
+    second = publish_artifacts(artifacts, str(output_dir / "Acme_Analyst"))
+
+    assert first == str(output_dir / "Acme_Analyst")
+    assert second == str(output_dir / "Acme_Analyst_2")
+    assert sorted(os.listdir(first)) == ["cover_letter.docx", "cover_letter.pdf"]
+    assert (output_dir / "Acme_Analyst" / "cover_letter.pdf").read_bytes() == b"%PDF"
+    assert sorted(os.listdir(output_dir)) == ["Acme_Analyst", "Acme_Analyst_2"]
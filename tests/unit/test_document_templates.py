@@ -0,0 +1,57 @@
+# tests/unit/test_document_templates.py
+
+import os
+import pytest
+from docx import Document
+
+from src.core import document_templates
+from src.core.document_templates import available_templates, get_document_template, new_word_document
+
+
+@pytest.fixture
+def template_dir(monkeypatch, tmp_path):
+    """Point the registry at a temporary templates/latex directory with a fresh environment."""
+    latex_dir = tmp_path / "latex"
+    (latex_dir / "plain").mkdir(parents=True)
+    (latex_dir / "plain" / "plain_cover_letter_template.tex").write_text("Dear {{ recipient }},")
+    monkeypatch.setattr(document_templates, "LATEX_TEMPLATE_DIR", str(latex_dir))
+    monkeypatch.setattr(document_templates, "TEMPLATE_CACHE_DIR", str(tmp_path / "cache"))
+    document_templates._latex_environment.cache_clear()
+    yield latex_dir
+    document_templates._latex_environment.cache_clear()
+
+
+def test_bundled_awesome_cv_template_is_registered():
+    assert "awesome-cv" in available_templates()
+    template = get_document_template("awesome-cv")
+    assert template.directory.endswith(os.path.join("latex", "awesome-cv"))
+    assert "\\documentclass" in template.latex.render(first_name="Ada", last_name="Lovelace")
+
+
+def test_templates_are_compiled_once_and_reloaded_on_change(template_dir):
+    first = get_document_template("plain")
+    assert first.latex.render(recipient="Hiring Team") == "Dear Hiring Team,"
+    assert get_document_template("plain").latex is first.latex
+    assert os.listdir(template_dir.parent / "cache")
+
+    path = template_dir / "plain" / "plain_cover_letter_template.tex"
+    path.write_text("Hello {{ recipient }}!")
+    os.utime(path, (os.path.getatime(path), os.path.getmtime(path) + 5))
+
+    assert get_document_template("plain").latex.render(recipient="Hiring Team") == "Hello Hiring Team!"
+
+
+def test_unknown_template_lists_available(template_dir):
+    with pytest.raises(ValueError, match="available: plain"):
+        get_document_template("fancy")
+
+
+def test_word_document_uses_template_base(template_dir):
+    base = Document()
+    base.add_paragraph("Letterhead")
+    base.save(str(template_dir / "plain" / "cover_letter_template.docx"))
+
+    document = new_word_document(get_document_template("plain"))
+    document.add_paragraph("Body")
+    assert [p.text for p in document.paragraphs] == ["Letterhead", "Body"]
+    assert new_word_document(get_document_template("plain")).paragraphs[0].text == "Letterhead"
@@ -0,0 +1,44 @@
+# tests/unit/test_draft_renderer.py
+
+import io
+import time
+
+import pytest
+from PyPDF2 import PdfReader
+
+from src.core.draft_renderer import render_draft_pdf, to_latin1
+
+FIELDS = {
+    "first_name": "Ada", "last_name": "Lovelace", "position": "Analyst",
+    "address": "1 Main St", "phone": "555-0100", "email": "ada@example.com",
+    "website": "ada.example.com", "github": "ada", "linkedin": "",
+    "recipient": "Hiring Committee", "date": "March 1, 2025",
+    "job_title": "Job Application for Data Analyst", "opening": "Dear Hiring Committee,",
+    "cover_letter_content": "I am writing \u2014 with enthusiasm \u2014 to apply.\n\nI build \u201cmodels\u201d.",
+    "company_address_lines": ["Acme Corp", "Zürich"],
+}
+
+
+def test_to_latin1_maps_typographic_punctuation():
+    assert to_latin1("\u201cHi\u201d \u2014 it\u2019s Zürich\u2026 \u4e2d") == '"Hi" - it\'s Zürich... ?'
+
+
+def test_render_draft_pdf_lays_out_letter():
+    pdf = render_draft_pdf(FIELDS)
+    reader = PdfReader(io.BytesIO(pdf))
+    text = reader.pages[0].extract_text()
+    assert len(reader.pages) == 1
+    assert "Ada" in text and "Lovelace" in text
+    assert "ANALYST" in text
+    assert "github.com/ada" in text and "linkedin.com" not in text
+    assert "Acme Corp" in text
+    assert "I am writing - with enthusiasm - to apply." in text
+    assert "Sincerely," in text
+
+
+@pytest.mark.benchmark
+def test_render_draft_pdf_is_fast():
+    render_draft_pdf(FIELDS)
+    start = time.perf_counter()
+    render_draft_pdf(FIELDS)
+    assert time.perf_counter() - start < 0.5
@@ -0,0 +1,151 @@
+# tests/unit/test_fetcher.py
+
+import threading
+import time
+
+import pytest
+import requests
+
+from src.core import fetcher
+from src.core.fetcher import Download, HedgedFetcher, PostingTooLargeError, sniff_kind
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.metrics import metrics
+from src.utils.deadline import DeadlineExceeded, request_deadline
+from tests.fake_http import FakeHttpResponse
+
+
+def test_fast_response_is_not_hedged(monkeypatch):
+    calls = []
+
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        calls.append(timeout)
+        return FakeHttpResponse(b"page")
+    monkeypatch.setattr(fetcher.requests, "get", fake_get)
+
+    assert HedgedFetcher(timeout=5, hedge_delay=1).get("https://fast.example.com/job").content == b"page"
+    assert calls == [5]
+
+
+def test_slow_request_is_hedged_and_first_response_wins(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        with lock:
+            calls.append(url)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.5)
+            return FakeHttpResponse(b"slow")
+        return FakeHttpResponse(b"hedged")
+    monkeypatch.setattr(fetcher.requests, "get", fake_get)
+
+    hedged = metrics.counter("fetch.hedged")
+    assert HedgedFetcher(timeout=5, hedge_delay=0.05).get("https://slow.example.com/job").content == b"hedged"
+    assert len(calls) == 2
+    assert metrics.counter("fetch.hedged") == hedged + 1
+
+
+def test_hedge_delay_follows_host_latency():
+    fetcher_ = HedgedFetcher(timeout=5, hedge_delay=0.1)
+    assert fetcher_.hedge_delay_for("example.com") == 0.1
+    for seconds in (0.2, 0.3, 0.4, 0.5, 0.6, 0.7):
+        fetcher_._record_latency("example.com", seconds)
+    assert fetcher_.hedge_delay_for("example.com") == 0.6
+
+
+def test_unreachable_host_opens_its_breaker(monkeypatch):
+    def refused(url, headers=None, timeout=None, stream=False):
+        raise requests.ConnectionError("refused")
+    breaker = CircuitBreaker("fetch.down.example.com", failure_threshold=2, reset_seconds=60)
+    monkeypatch.setattr(fetcher.requests, "get", refused)
+    monkeypatch.setattr(fetcher, "circuit_breaker", lambda name: breaker)
+
+    client = HedgedFetcher(timeout=5, hedge_delay=1)
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://down.example.com/job")
+    with pytest.raises(CircuitOpenError):
+        client.get("https://down.example.com/job")
+
+
+def test_http_errors_do_not_count_against_the_host(monkeypatch):
+    def not_found(url, headers=None, timeout=None, stream=False):
+        raise requests.HTTPError("404")
+    monkeypatch.setattr(fetcher.requests, "get", not_found)
+
+    client = HedgedFetcher(timeout=5, hedge_delay=1)
+    for _ in range(10):
+        with pytest.raises(requests.HTTPError):
+            client.get("https://missing.example.com/job")
+    assert fetcher.circuit_breaker("fetch.missing.example.com").state == "closed"
+
+
+def test_sniff_kind_prefers_the_pdf_signature():
+    assert sniff_kind("application/octet-stream", b"%PDF-1.7\n") == "pdf"
+    assert sniff_kind("application/pdf; name=job.pdf", b"") == "pdf"
+    assert sniff_kind("text/html; charset=utf-8", b"<!doctype html>") == "html"
+    assert sniff_kind(None, b"Plain text posting") == "html"
+
+
+def test_download_stops_reading_large_pages(monkeypatch):
+    response = FakeHttpResponse(b"<p>" + b"x" * 10_000)
+    monkeypatch.setattr(fetcher.requests, "get", lambda url, **kwargs: response)
+    monkeypatch.setattr(fetcher, "CHUNK_BYTES", 1_000)
+
+    download = HedgedFetcher(timeout=5, hedge_delay=1).download("https://big.example.com/job", max_bytes=2_500)
+    assert download == Download(b"<p>" + b"x" * 2_497, "html", 200, True)
+    assert response.chunks_read == 3
+    assert response.closed
+
+
+def test_download_rejects_oversized_pdf(monkeypatch):
+    response = FakeHttpResponse(b"%PDF-1.4\n" + b"x" * 10_000, content_type="application/octet-stream")
+    monkeypatch.setattr(fetcher.requests, "get", lambda url, **kwargs: response)
+
+    client = HedgedFetcher(timeout=5, hedge_delay=1)
+    with pytest.raises(PostingTooLargeError):
+        client.download("https://pdf.example.com/job", max_bytes=100, max_pdf_bytes=5_000)
+    download = client.download("https://pdf.example.com/job", max_bytes=100, max_pdf_bytes=50_000)
+    assert download.kind == "pdf" and not download.truncated
+
+
+def test_download_stops_a_slow_body_at_the_deadline(monkeypatch):
+    class DrippingResponse(FakeHttpResponse):
+        def iter_content(self, chunk_size=1):
+            while True:
+                self.chunks_read += 1
+                time.sleep(0.01)
+                yield b"x"
+
+    response = DrippingResponse(b"")
+    monkeypatch.setattr(fetcher.requests, "get", lambda url, **kwargs: response)
+    with request_deadline(0.1), pytest.raises(DeadlineExceeded):
+        HedgedFetcher(timeout=5, hedge_delay=1).download("https://drip.example.com/job")
+    assert response.closed
+    assert response.chunks_read < 50
+
+
+def test_losing_and_late_hedged_responses_are_closed(monkeypatch):
+    responses = []
+    lock = threading.Lock()
+
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        with lock:
+            response = FakeHttpResponse(b"page")
+            responses.append(response)
+            first = len(responses) == 1
+        time.sleep(0.3 if first else 0.0)
+        return response
+
+    monkeypatch.setattr(fetcher.requests, "get", fake_get)
+    winner = HedgedFetcher(timeout=5, hedge_delay=0.05).get("https://slow.example.com/job", stream=True)
+    time.sleep(0.4)
+    assert winner is responses[1] and not winner.closed
+    assert responses[0].closed
+
+    responses.clear()
+    with pytest.raises(requests.Timeout):
+        HedgedFetcher(timeout=0.1, hedge_delay=1).get("https://late.example.com/job")
+    time.sleep(0.4)
+    assert len(responses) == 1 and responses[0].closed
@@ -0,0 +1,44 @@
+# tests/unit/test_fingerprint.py
+
+from src.utils.fingerprint import (
+    LSH_BANDS, NUM_PERMUTATIONS, estimate_similarity, lsh_buckets, minhash_signature, shingles
+)
+
+POSTING = " ".join(
+    f"We are looking for a backend engineer to design APIs, own services and mentor peers, part {i}."
+    for i in range(6)
+)
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("One, two THREE four five six", size=5) == {"one two three four five", "two three four five six"}
+    assert shingles("Too short", size=5) == {"too short"}
+    assert shingles("", size=5) == set()
+
+
+def test_minhash_signature_is_stable_and_skips_short_pages():
+    signature = minhash_signature(POSTING)
+    assert len(signature) == NUM_PERMUTATIONS
+    assert signature == minhash_signature(POSTING)
+    assert minhash_signature("Sign in to view this job") is None
+
+
+def test_similarity_separates_reposts_from_other_postings():
+    original = minhash_signature(POSTING)
+    repost = minhash_signature("Senior role! " + POSTING.upper() + " Apply via our partner site.")
+    other = minhash_signature(" ".join(
+        f"Our clinic needs a registered nurse for night shifts and patient intake, week {i}." for i in range(6)
+    ))
+    assert estimate_similarity(original, repost) > 0.8
+    assert estimate_similarity(original, other) < 0.1
+
+
+def test_lsh_buckets_match_for_identical_bands():
+    signature = minhash_signature(POSTING)
+    buckets = lsh_buckets(signature)
+    assert len(buckets) == LSH_BANDS
+    assert [band for band, _ in buckets] == list(range(LSH_BANDS))
+    changed = list(signature)
+    changed[0] += 1
+    assert lsh_buckets(changed)[1:] == buckets[1:]
+    assert lsh_buckets(changed)[0] != buckets[0]
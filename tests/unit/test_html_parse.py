@@ -0,0 +1,147 @@
+# tests/unit/test_html_parse.py
+
+import statistics
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.core import html_parse
+from src.core.html_parse import HtmlParsePool, clean_text, parse_html_page
+from src.utils.deadline import DeadlineExceeded, request_deadline
+from src.utils.metrics import metrics
+
+JOB_HTML = b"""
+<html><head>
+  <meta property="og:title" content="Senior Developer | ACME Corp">
+  <script type="application/ld+json">
+    {"@type": "JobPosting", "title": "Senior Developer", "hiringOrganization": {"name": "ACME Corp"}}
+  </script>
+  <style>h1 { color: red; }</style>
+</head><body>
+  <h1 class="app-title">Senior Developer</h1>
+  <p>ACME Corp builds anvils.</p>
+</body></html>
+"""
+
+
+def big_page(blocks):
+    """An ATS-style page: deeply nested markup around a little text, repeated."""
+    block = b"<div class='row'><div class='cell'><span><a href='#'>Benefit</a></span></div></div>\n"
+    return JOB_HTML.replace(b"</body>", block * blocks + b"</body>")
+
+
+@pytest.fixture
+def pool():
+    pool = HtmlParsePool(workers=1, offload_bytes=1_000)
+    yield pool
+    pool.close()
+
+
+def test_clean_text_drops_blank_lines_and_splits_double_spaces():
+    assert clean_text("  Title  \n\n Location: City  Remote ok \n") == "Title\nLocation: City\nRemote ok"
+
+
+def test_parse_html_page_reads_structured_data_before_stripping_scripts():
+    details, open_graph, text = parse_html_page("https://jobs.example.com/1", JOB_HTML)
+    assert details["Job Title"] == "Senior Developer"
+    assert details["Company"] == "ACME Corp"
+    assert open_graph
+    assert "JobPosting" not in text and "color" not in text
+    assert text.splitlines()[0] == "Senior Developer"
+
+
+def test_small_pages_are_parsed_inline(pool):
+    before = metrics.counter("html_parse.inline")
+    assert pool.parse("https://jobs.example.com/1", JOB_HTML) == parse_html_page("https://jobs.example.com/1", JOB_HTML)
+    assert metrics.counter("html_parse.inline") == before + 1
+    assert pool._executor is None
+
+
+def test_large_pages_are_parsed_in_a_worker_with_its_metrics_kept(pool):
+    page = big_page(200)
+    url = "https://boards.greenhouse.io/acme/jobs/1"
+    offloaded = metrics.counter("html_parse.offloaded")
+    site_calls = metrics.counter("site_extractor.greenhouse.calls")
+
+    assert pool.parse(url, page) == parse_html_page(url, page)
+    assert metrics.counter("html_parse.offloaded") == offloaded + 1
+    # One call from the worker, merged back, and one from the inline parse above
+    assert metrics.counter("site_extractor.greenhouse.calls") == site_calls + 2
+
+
+def test_offloaded_parse_stops_at_the_deadline(pool, monkeypatch):
+    class SlowFuture:
+        def result(self, timeout=None):
+            raise html_parse.FutureTimeoutError()
+
+        def cancel(self):
+            return True
+
+    monkeypatch.setattr(pool, "_get_executor", lambda: type("Executor", (), {
+        "submit": lambda self, *args: SlowFuture()})())
+    with request_deadline(0.01), pytest.raises(DeadlineExceeded):
+        pool.parse("https://jobs.example.com/1", big_page(50))
+
+
+def test_dead_worker_falls_back_to_inline(pool, monkeypatch):
+    class BrokenExecutor:
+        def submit(self, *args):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True):
+            pass
+
+    pool._executor = BrokenExecutor()
+    page = big_page(50)
+    assert pool.parse("https://jobs.example.com/1", page) == parse_html_page("https://jobs.example.com/1", page)
+    assert pool._executor is None
+
+
+@pytest.mark.benchmark
+def test_benchmark_offloading_keeps_small_requests_fast():
+    """
+    Benchmark: latency of small-page requests while other requests parse large pages.
+
+    Two threads keep parsing a large page, as concurrent webhook requests
+    would; meanwhile the small-page latency is measured, parsing everything inline
+    and then with large pages offloaded.
+    """
+    large = big_page(5_000)
+    small_url = "https://jobs.example.com/small"
+
+    def measure(pool):
+        stop = threading.Event()
+
+        def heavy_requests():
+            while not stop.is_set():
+                pool.parse("https://jobs.example.com/large", large)
+
+        threads = [threading.Thread(target=heavy_requests) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        latencies = []
+        for _ in range(20):
+            start = time.perf_counter()
+            pool.parse(small_url, JOB_HTML)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.01)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return statistics.median(latencies), max(latencies)
+
+    inline = measure(HtmlParsePool(workers=0))
+    offload_pool = HtmlParsePool(workers=2, offload_bytes=256 * 1024)
+    try:
+        offload_pool.parse("https://jobs.example.com/large", large)  # start the workers
+        offloaded = measure(offload_pool)
+    finally:
+        offload_pool.close()
+
+    print(f"\nsmall-page latency with {len(large) / 1e6:.1f} MB pages parsing alongside: "
+          f"inline median {inline[0] * 1000:.1f} ms, max {inline[1] * 1000:.1f} ms; "
+          f"offloaded median {offloaded[0] * 1000:.1f} ms, max {offloaded[1] * 1000:.1f} ms")
+    assert offloaded[0] < inline[0]
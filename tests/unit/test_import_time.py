@@ -0,0 +1,49 @@
+# tests/unit/test_import_time.py
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Libraries that cost hundreds of milliseconds and must only load on first use
+HEAVY_MODULES = {'torch', 'transformers', 'openai', 'notion_client', 'fpdf', 'PyPDF2', 'docx', 'bs4'}
+
+# Cumulative import time allowed for an entry point module, in seconds
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.0"))
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module):
+    """Import a module in a fresh interpreter with -X importtime, outside test mode."""
+    env = {key: value for key, value in os.environ.items() if key not in ('PYTEST', 'PYTEST_CURRENT_TEST')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return {match.group(4): int(match.group(2)) / 1e6
+            for match in map(IMPORT_TIME_LINE.match, result.stderr.splitlines()) if match}
+
+
+@pytest.mark.parametrize("module", ["src.server.webhook_server", "src.cli"])
+def test_entry_point_imports_stay_light(module):
+    times = import_times(module)
+    heavy = sorted(name for name in times if name.split('.')[0] in HEAVY_MODULES)
+    assert heavy == []
+    assert times[module] < IMPORT_BUDGET_SECONDS
+
+
+def test_importing_the_server_does_not_set_up_logging(tmp_path):
+    env = {key: value for key, value in os.environ.items() if key not in ('PYTEST', 'PYTEST_CURRENT_TEST')}
+    env['LOG_DIR'] = str(tmp_path / 'logs')
+    code = ('import logging, src.server.webhook_server; '
+            'assert not logging.getLogger().handlers, logging.getLogger().handlers')
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / 'logs').exists()
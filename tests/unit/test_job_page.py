@@ -0,0 +1,102 @@
+# tests/unit/test_job_page.py
+
+import threading
+import time
+from unittest.mock import patch
+
+from src.core.html_parse import parse_html_page
+from src.core.job_page import JobPage, JobPageCache
+from tests.fake_http import FakeHttpResponse
+
+JOB_HTML = b"""
+<html><head>
+  <meta property="og:title" content="Senior Developer | ACME Corp">
+  <script type="application/ld+json">
+    {"@type": "JobPosting", "title": "Senior Developer", "hiringOrganization": {"name": "ACME Corp"}}
+  </script>
+  <style>h1 { color: red; }</style>
+</head><body>
+  <h1>Senior Developer</h1>
+  <div>About Us</div>
+  <p>ACME Corp builds anvils.</p>
+  <div>Benefits</div>
+  <p>Free coffee and a gym.</p>
+  <div>Salary</div>
+  <p>The salary range is $100k to $120k per year.</p>
+</body></html>
+"""
+
+
+def test_page_is_parsed_once_and_drops_its_body():
+    page = JobPage("https://jobs.example.com/1", JOB_HTML)
+    with patch("src.core.html_parse.parse_html_page", wraps=parse_html_page) as parse:
+        assert "ACME Corp builds anvils." in page.lines
+        assert page.structured_details["Company"] == "ACME Corp"
+        assert page.text
+    assert parse.call_count == 1
+    assert page._content is None
+    assert page.sections[0][0] == 0
+
+
+def test_structured_details_are_copies():
+    page = JobPage("https://jobs.example.com/1", JOB_HTML)
+    page.structured_details["Company"] = "Changed"
+    assert page.structured_details["Company"] == "ACME Corp"
+
+
+def test_context_for_picks_the_sections_matching_the_question():
+    page = JobPage("https://jobs.example.com/1", JOB_HTML)
+    context = page.context_for("What is the salary range?", token_budget=15)
+    assert "salary range is $100k" in context
+    assert "anvils" not in context
+
+
+@patch("src.core.fetcher.requests.get")
+def test_cache_fetches_each_url_once(mock_requests_get):
+    mock_requests_get.side_effect = lambda url, **kwargs: FakeHttpResponse(JOB_HTML)
+    cache = JobPageCache(max_entries=1, ttl=60)
+    first = cache.get("https://jobs.example.com/1")
+    assert cache.get("https://jobs.example.com/1") is first
+    assert mock_requests_get.call_count == 1
+
+    cache.get("https://jobs.example.com/2")
+    assert cache.get("https://jobs.example.com/1") is not first
+    assert mock_requests_get.call_count == 3
+
+
+@patch("src.core.fetcher.requests.get")
+def test_cache_skips_error_pages_and_expired_entries(mock_requests_get):
+    mock_requests_get.side_effect = lambda url, **kwargs: FakeHttpResponse(JOB_HTML, status_code=503)
+    cache = JobPageCache(max_entries=4, ttl=60)
+    cache.get("https://jobs.example.com/1")
+    cache.get("https://jobs.example.com/1")
+    assert mock_requests_get.call_count == 2
+
+    mock_requests_get.side_effect = lambda url, **kwargs: FakeHttpResponse(JOB_HTML)
+    expired = JobPageCache(max_entries=4, ttl=0)
+    expired.get("https://jobs.example.com/1")
+    expired.get("https://jobs.example.com/1")
+    assert mock_requests_get.call_count == 4
+
+
+@patch("src.core.fetcher.requests.get")
+def test_cache_shares_one_fetch_between_concurrent_misses(mock_requests_get):
+    def slow_get(url, **kwargs):
+        time.sleep(0.1)
+        return FakeHttpResponse(JOB_HTML)
+
+    mock_requests_get.side_effect = slow_get
+    cache = JobPageCache(max_entries=4, ttl=60)
+    pages = []
+    threads = [
+        threading.Thread(target=lambda: pages.append(cache.get("https://jobs.example.com/1")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert mock_requests_get.call_count == 1
+    assert len(pages) == 4
+    assert all(page is pages[0] for page in pages)
+    assert not cache._loading
@@ -1,14 +1,19 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
+from tests.fake_http import FakeHttpResponse
+from src.core.job_page import job_page_cache
 from src.core.job_parser import (
     extract_job_details,
     fetch_job_posting_text,
     answer_question,
     clean_job_details,
+    structured_data_hit_rate,
+    is_plausible_extraction,
+    is_open_deadline,
 )
 
-@patch("src.core.job_parser.requests.get")
+@patch("src.core.fetcher.requests.get")
 @patch("src.core.job_parser.openai_client.chat.completions.create")
 def test_extract_job_details(mock_openai_call, mock_requests_get, mock_html_content, mock_openai_response):
     """
@@ -16,8 +21,7 @@ def test_extract_job_details(mock_openai_call, mock_requests_get, mock_html_cont
     Ensures `extract_job_details` handles the logic of extracting fields.
     """
     # Mock the requests.get() to return a response with our mock_html_content
-    mock_response = MagicMock()
-    mock_response.content = mock_html_content.encode("utf-8")
+    mock_response = FakeHttpResponse(mock_html_content.encode("utf-8"))
     mock_requests_get.return_value = mock_response
 
     # Mock the OpenAI call to return a specific structured text
@@ -43,13 +47,127 @@ def test_extract_job_details(mock_openai_call, mock_requests_get, mock_html_cont
     # etc.
 
 
-@patch("src.core.job_parser.requests.get")
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extract_job_details_structured_response(mock_openai_call, mock_requests_get, mock_html_content, mock_openai_response):
+    """
+    Unit test: a schema-constrained JSON answer is validated and mapped to display keys,
+    and the request asks for the JSON schema response format.
+    """
+    mock_response = FakeHttpResponse(mock_html_content.encode("utf-8"))
+    mock_requests_get.return_value = mock_response
+    mock_openai_call.return_value = mock_openai_response(
+        '{"job_title": "Senior Developer", "company": "ACME Corp", "location": "Some City", '
+        '"experience_level": "Mid-Level", "application_deadline": "", "salary_range": "Not specified"}'
+    )
+
+    result = extract_job_details("https://fakejob.url")
+
+    assert mock_openai_call.call_args.kwargs["response_format"]["type"] == "json_schema"
+    assert result["Job Title"] == "Senior Developer"
+    assert result["Company"] == "ACME Corp"
+    assert result["Salary Range"] == ""
+    assert result["Job URL"] == "https://fakejob.url"
+
+
+JSON_LD_HTML = """
+<html><head>
+<script type="application/ld+json">
+{"@type": "JobPosting", "title": "Senior Developer", "hiringOrganization": {"name": "ACME Corp"},
+ "jobLocation": {"address": {"addressLocality": "Some City"}}, "validThrough": "2025-03-01"}
+</script>
+</head><body><h1>Senior Developer</h1></body></html>
+"""
+
+
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extract_job_details_json_ld_skips_model(mock_openai_call, mock_requests_get):
+    """
+    Unit test: when JSON-LD fills the required fields, the model is not called.
+    """
+    mock_response = FakeHttpResponse(JSON_LD_HTML.encode("utf-8"))
+    mock_requests_get.return_value = mock_response
+
+    result = extract_job_details("https://fakejob.url")
+
+    mock_openai_call.assert_not_called()
+    assert result["Job Title"] == "Senior Developer"
+    assert result["Company"] == "ACME Corp"
+    assert result["Location"] == "Some City"
+    assert result["Application Deadline"] == "2025-03-01"
+    assert result["Salary Range"] == ""
+    assert structured_data_hit_rate() > 0
+
+
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extract_job_details_asks_model_only_for_missing_fields(mock_openai_call, mock_requests_get, mock_openai_response):
+    """
+    Unit test: fields filled from JSON-LD are kept and only the rest are requested.
+    """
+    html = JSON_LD_HTML.replace('"jobLocation": {"address": {"addressLocality": "Some City"}}, ', "")
+    mock_response = FakeHttpResponse(html.encode("utf-8"))
+    mock_requests_get.return_value = mock_response
+    mock_openai_call.return_value = mock_openai_response(
+        '{"location": "Remote", "experience_level": "", "salary_range": ""}'
+    )
+
+    result = extract_job_details("https://fakejob.url")
+
+    required = mock_openai_call.call_args.kwargs["response_format"]["json_schema"]["schema"]["required"]
+    assert set(required) == {"location", "experience_level", "salary_range"}
+    assert result["Company"] == "ACME Corp"
+    assert result["Location"] == "Remote"
+
+
+@patch("src.core.job_parser.tokenizer")
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extraction_budget_does_not_use_the_qa_tokenizer(mock_openai_call, mock_requests_get, mock_tokenizer,
+                                                         mock_html_content, mock_openai_response):
+    """
+    Unit test: the extraction prompt is sized for the OpenAI model, not with the QA model's tokenizer.
+    """
+    mock_requests_get.return_value = FakeHttpResponse(mock_html_content.encode("utf-8"))
+    mock_openai_call.return_value = mock_openai_response(
+        '{"job_title": "Software Engineer", "company": "ACME Corp", "location": "Remote", '
+        '"experience_level": "", "application_deadline": "", "salary_range": ""}'
+    )
+    with patch("src.core.job_parser.openai_tokenizer") as mock_openai_tokenizer:
+        extract_job_details("https://fakejob.url")
+    mock_tokenizer.assert_not_called()
+    mock_openai_tokenizer.assert_called_once_with("gpt-4o-mini")
+
+
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extract_job_details_reuses_near_duplicate(mock_openai_call, mock_requests_get, mock_html_content):
+    """
+    Unit test: details returned by the duplicate lookup are reused without the model.
+    """
+    mock_response = FakeHttpResponse(mock_html_content.encode("utf-8"))
+    mock_requests_get.return_value = mock_response
+    seen_texts = []
+
+    def find_duplicate(text):
+        seen_texts.append(text)
+        return {"Job Title": "Data Analyst", "Company": "Acme", "Job URL": "https://original.url"}
+
+    result = extract_job_details("https://mirror.url", find_duplicate=find_duplicate)
+
+    mock_openai_call.assert_not_called()
+    assert "<" not in seen_texts[0]
+    assert result["Company"] == "Acme"
+    assert result["Job URL"] == "https://mirror.url"
+
+
+@patch("src.core.fetcher.requests.get")
 def test_fetch_job_posting_text(mock_requests_get, mock_html_content):
     """
     Unit test for fetch_job_posting_text, mocking out the network call.
     """
-    mock_response = MagicMock()
-    mock_response.content = mock_html_content.encode("utf-8")
+    mock_response = FakeHttpResponse(mock_html_content.encode("utf-8"))
     mock_requests_get.return_value = mock_response
 
     text = fetch_job_posting_text("https://fakejob.url")
@@ -58,6 +176,50 @@ def test_fetch_job_posting_text(mock_requests_get, mock_html_content):
     # and so on
 
 
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_extract_job_details_from_pdf_posting(mock_openai_call, mock_requests_get, mock_openai_response):
+    """
+    Unit test: a PDF posting (sniffed from its bytes, whatever the header says)
+    is read with the PDF extractor and its text sent to the model.
+    """
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.cell(0, 10, "Assistant Professor of Chemistry at Example University")
+    mock_requests_get.return_value = FakeHttpResponse(bytes(pdf.output()), content_type="application/octet-stream")
+    mock_openai_call.return_value = mock_openai_response(
+        '{"job_title": "Assistant Professor of Chemistry", "company": "Example University", "location": "", '
+        '"experience_level": "", "application_deadline": "", "salary_range": ""}'
+    )
+
+    result = extract_job_details("https://fakejob.url/posting.pdf")
+
+    prompt = str(mock_openai_call.call_args.kwargs["messages"])
+    assert "Assistant Professor of Chemistry at Example University" in prompt
+    assert result["Company"] == "Example University"
+
+
+@patch("src.core.fetcher.requests.get")
+def test_fetch_job_posting_text_rejects_error_status(mock_requests_get, mock_html_content):
+    """
+    Unit test: an error page yields no text.
+    """
+    mock_requests_get.return_value = FakeHttpResponse(mock_html_content.encode("utf-8"), status_code=404)
+    assert fetch_job_posting_text("https://fakejob.url") == ""
+
+
+@patch("src.core.fetcher.requests.get")
+def test_extract_job_details_rejects_error_status(mock_requests_get, mock_html_content):
+    """
+    Unit test: an error page is not passed on for extraction.
+    """
+    mock_requests_get.return_value = FakeHttpResponse(mock_html_content.encode("utf-8"), status_code=404)
+    with pytest.raises(ValueError, match="status code 404"):
+        extract_job_details("https://fakejob.url")
+
+
 @patch("src.core.job_parser.model")
 @patch("src.core.job_parser.tokenizer")
 def test_answer_question(mock_tokenizer, mock_model, mock_model_output):
@@ -86,6 +248,33 @@ def test_answer_question(mock_tokenizer, mock_model, mock_model_output):
     assert isinstance(result["confidence"], float)
 
 
+@patch("src.core.fetcher.requests.get")
+@patch("src.core.job_parser.model")
+@patch("src.core.job_parser.tokenizer")
+@patch("src.core.job_parser.openai_client.chat.completions.create")
+def test_posting_is_fetched_once_for_extraction_text_and_questions(
+        mock_openai_call, mock_tokenizer, mock_model, mock_requests_get,
+        mock_html_content, mock_openai_response, mock_model_output):
+    """
+    Unit test: extraction, the text fetch and question answering over the page share one download.
+    """
+    mock_requests_get.return_value = FakeHttpResponse(mock_html_content.encode("utf-8"))
+    mock_openai_call.return_value = mock_openai_response(
+        '{"job_title": "Senior Developer", "company": "ACME Corp", "location": "Some City", '
+        '"experience_level": "", "application_deadline": "", "salary_range": ""}'
+    )
+    mock_tokenizer.return_value = {"input_ids": [[101, 102, 103]]}
+    mock_tokenizer.decode.return_value = "Some City"
+    mock_model.return_value = mock_model_output
+
+    extract_job_details("https://fakejob.url")
+    text = fetch_job_posting_text("https://fakejob.url")
+    answer_question("Where is the job?", job_page_cache.get("https://fakejob.url"))
+
+    assert mock_requests_get.call_count == 1
+    assert mock_tokenizer.call_args.args == ("Where is the job?", text)
+
+
 def test_clean_job_details():
     """
     Simple unit test for clean_job_details with a local dictionary.
@@ -101,3 +290,32 @@ def test_clean_job_details():
     assert cleaned["Job Title"] == "Senior Developer"
     assert cleaned["Company"] == "ACME"
     assert cleaned["Job URL"] == "https://example.com"
+
+
+def test_is_plausible_extraction():
+    """
+    Unit test for the escalation check applied to cheap-tier extractions.
+    """
+    fields = ["Job Title", "Company", "Location", "Application Deadline"]
+    good = {"Job Title": "Analyst", "Company": "ACME", "Location": "Remote", "Application Deadline": "March 1, 2025"}
+    assert is_plausible_extraction(good, fields)
+    assert is_plausible_extraction(dict(good, **{"Application Deadline": ""}), fields)
+    assert not is_plausible_extraction(dict(good, **{"Location": ""}), fields)
+    assert not is_plausible_extraction(dict(good, **{"Application Deadline": "whenever"}), fields)
+    assert is_plausible_extraction(dict(good, **{"Application Deadline": "Open until filled"}), fields)
+    assert is_plausible_extraction(dict(good, **{"Application Deadline": "Rolling basis"}), fields)
+    assert not is_plausible_extraction(dict(good, **{"Company": "LinkedIn"}), fields)
+    # Fields that were not requested are not checked
+    assert is_plausible_extraction({"Salary Range": ""}, ["Salary Range"])
+
+
+def test_is_open_deadline_matches_whole_phrases_only():
+    assert is_open_deadline("Open until filled")
+    assert is_open_deadline("Open until the position is filled.")
+    assert is_open_deadline("Rolling basis")
+    assert not is_open_deadline("Open until March 1")
+    assert not is_open_deadline("Opening date 2024-11-01")
+    assert not is_open_deadline("Open")
+    # A phrase that is neither open-ended nor a parseable date sends the answer to the next tier
+    fields = ["Application Deadline"]
+    assert not is_plausible_extraction({"Application Deadline": "Open until March 1"}, fields)
@@ -0,0 +1,66 @@
+# tests/unit/test_job_store.py
+
+import threading
+
+from src.core.job_store import JobStore, normalize_url
+from src.utils.fingerprint import minhash_signature
+
+
+def test_normalize_url_drops_tracking_and_formatting():
+    assert normalize_url("HTTPS://www.Example.com/jobs/123/?utm_source=li&gh_src=abc&b=2&a=1#apply") == \
+        "https://example.com/jobs/123?a=1&b=2"
+    assert normalize_url("https://example.com:443/jobs/123") == "https://example.com/jobs/123"
+    assert normalize_url("https://example.com/jobs/123?id=9") != normalize_url("https://example.com/jobs/123?id=8")
+
+
+def test_record_stage_upserts_and_keeps_earlier_values(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    details = {"Company": "Acme", "Job Title": "Data Analyst"}
+    store.record_stage("https://acme.example/job?utm_medium=x", "extract", page_id="page-1", job_details=details)
+    store.record_stage("https://acme.example/job", "save", cover_letter="Dear Acme", pdf_path="/out/acme.pdf")
+    store.record_stage("https://acme.example/job", "notion", status="failed", error="rate limited")
+
+    record = store.find_by_url("https://www.acme.example/job/")
+    assert record["job_details"] == details
+    assert record["cover_letter"] == "Dear Acme"
+    assert record["pdf_path"] == "/out/acme.pdf"
+    assert (record["stage"], record["status"], record["error"]) == ("notion", "failed", "rate limited")
+    assert store.status_counts() == {"notion:failed": 1}
+
+
+def test_lookups_by_page_id_and_company_title(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.record_stage("https://acme.example/1", "extract", page_id="page-1",
+                       job_details={"Company": "Acme", "Job Title": "Analyst"})
+    store.record_stage("https://acme.example/2", "extract", job_details={"Company": "Acme", "Job Title": "Engineer"})
+
+    assert store.find_by_page_id("page-1")["url"] == "https://acme.example/1"
+    assert store.find("https://other.example/moved", "page-1")["url"] == "https://acme.example/1"
+    assert store.find("https://other.example/moved") is None
+    assert [r["url"] for r in store.find_by_company_title("ACME", "analyst")] == ["https://acme.example/1"]
+
+
+def test_store_is_shared_across_threads(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    threads = [threading.Thread(target=store.record_stage, args=(f"https://a.example/{i}", "extract"))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.status_counts() == {"extract:ok": 20}
+    store.close()
+
+
+def test_find_similar_uses_lsh_index(tmp_path):
+    text = " ".join(f"Acme seeks a product designer for mobile apps and research, item {i}." for i in range(8))
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.record_stage("https://acme.example/design", "extract", signature=minhash_signature(text),
+                       job_details={"Company": "Acme", "Job Title": "Product Designer"})
+
+    match = store.find_similar(minhash_signature(text + " Posted 3 days ago."), 0.8)
+    assert match["url"] == "https://acme.example/design"
+    assert match["similarity"] > 0.8
+    assert store.find_similar(minhash_signature(text), 0.8, exclude_url="https://acme.example/design/") is None
+    unrelated = " ".join(f"Warehouse associate wanted for forklift loading on the early shift {i}." for i in range(8))
+    assert store.find_similar(minhash_signature(unrelated), 0.8) is None
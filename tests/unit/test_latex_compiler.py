@@ -0,0 +1,106 @@
+# tests/unit/test_latex_compiler.py
+
+import subprocess
+import threading
+import time
+import pytest
+
+from src.core import latex_compiler
+from src.core.latex_compiler import LatexCompiler, LatexQueueFullError, limited_command
+from src.utils.deadline import request_deadline
+from src.utils.metrics import metrics
+
+
+def test_limited_command_uses_prlimit_when_available(monkeypatch):
+    monkeypatch.setattr(latex_compiler.shutil, "which", lambda name: "/usr/bin/prlimit")
+    assert limited_command(["xelatex", "a.tex"], 30, 512) == [
+        "/usr/bin/prlimit", f"--as={512 * 1024 * 1024}", "--cpu=30", "--", "xelatex", "a.tex"
+    ]
+    assert limited_command(["xelatex", "a.tex"], 30, 0) == ["xelatex", "a.tex"]
+    monkeypatch.setattr(latex_compiler.shutil, "which", lambda name: None)
+    assert limited_command(["xelatex", "a.tex"], 30, 512) == ["xelatex", "a.tex"]
+
+
+def test_compiler_caps_concurrency_and_rejects_when_queue_full(monkeypatch, tmp_path):
+    release = threading.Event()
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def fake_run(command, **kwargs):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        release.wait(5)
+        with lock:
+            state["running"] -= 1
+        assert "-no-shell-escape" in command
+        assert kwargs["cwd"] == str(tmp_path)
+        assert kwargs["env"]["TEXINPUTS"].startswith("/templates/plain")
+        return subprocess.CompletedProcess(command, 0, stdout="ok", stderr="")
+
+    monkeypatch.setattr(latex_compiler.subprocess, "run", fake_run)
+    compiler = LatexCompiler(workers=2, queue_size=1, timeout=5, memory_limit_mb=0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            compiler.compile(str(tmp_path / "a.tex"), str(tmp_path), texinputs="/templates/plain")))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while state["running"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    with pytest.raises(LatexQueueFullError):
+        compiler.compile(str(tmp_path / "b.tex"), str(tmp_path))
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 3
+    assert state["peak"] == 2
+    assert metrics.snapshot()["timings"]["latex.queue_wait"]["count"] >= 3
+
+
+def test_compiler_reports_timeouts(monkeypatch, tmp_path):
+    def fake_run(command, **kwargs):
+        raise subprocess.TimeoutExpired(command, kwargs["timeout"])
+
+    monkeypatch.setattr(latex_compiler.subprocess, "run", fake_run)
+    before = metrics.counter("latex.timeouts")
+    with pytest.raises(subprocess.TimeoutExpired):
+        LatexCompiler(workers=1, queue_size=0, timeout=2, memory_limit_mb=0).compile("a.tex", str(tmp_path))
+    assert metrics.counter("latex.timeouts") == before + 1
+
+
+def test_compile_timeout_is_cut_to_the_request_deadline(monkeypatch, tmp_path):
+    timeouts = []
+
+    def fake_run(command, **kwargs):
+        timeouts.append(kwargs["timeout"])
+        return subprocess.CompletedProcess(command, 0, "", "")
+    monkeypatch.setattr(latex_compiler.subprocess, "run", fake_run)
+
+    with request_deadline(3):
+        LatexCompiler(workers=1, queue_size=0, timeout=60, memory_limit_mb=0).compile("a.tex", str(tmp_path))
+    assert 2 < timeouts[0] <= 3
+
+
+def test_time_queued_does_not_count_against_the_compile_timeout(monkeypatch, tmp_path):
+    timeouts = []
+
+    def fake_run(command, **kwargs):
+        timeouts.append(kwargs["timeout"])
+        time.sleep(0.3)
+        return subprocess.CompletedProcess(command, 0, "", "")
+    monkeypatch.setattr(latex_compiler.subprocess, "run", fake_run)
+
+    compiler = LatexCompiler(workers=1, queue_size=1, timeout=5, memory_limit_mb=0)
+    first = threading.Thread(target=compiler.compile, args=("a.tex", str(tmp_path)))
+    first.start()
+    time.sleep(0.05)
+    compiler.compile("b.tex", str(tmp_path))
+    first.join()
+    assert timeouts == [5, 5]
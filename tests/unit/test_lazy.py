@@ -0,0 +1,24 @@
+# tests/unit/test_lazy.py
+
+from src.utils.lazy import LazyObject
+
+
+def test_lazy_object_builds_once_on_first_use():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return lambda value: value * 2
+
+    lazy = LazyObject(factory, 'doubler')
+    assert calls == []
+    assert 'not loaded' in repr(lazy)
+    assert lazy(3) == 6
+    assert lazy(4) == 8
+    assert calls == [1]
+
+
+def test_lazy_object_forwards_attributes():
+    lazy = LazyObject(lambda: type('Client', (), {'name': 'notion'})(), 'client')
+    assert lazy.name == 'notion'
+    assert lazy.resolve() is lazy.resolve()
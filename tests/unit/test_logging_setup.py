@@ -0,0 +1,77 @@
+# tests/unit/test_logging_setup.py
+
+import json
+import logging
+import queue
+import sys
+
+from src.utils.logging_setup import (
+    JsonFormatter, SamplingFilter, TruncatingQueueHandler, parse_levels, truncate
+)
+
+
+def make_record(msg, *args, level=logging.INFO, lineno=10, exc_info=None, **extra):
+    record = logging.LogRecord('src.test', level, 'test.py', lineno, msg, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_parse_levels():
+    assert parse_levels("urllib3=warning, src.core = DEBUG,,bad") == {'urllib3': 'WARNING', 'src.core': 'DEBUG'}
+    assert parse_levels("") == {}
+
+
+def test_truncate_notes_cut_length():
+    assert truncate("abcdef", 10) == "abcdef"
+    assert truncate("abcdef", 4) == "abcd... [2 more chars]"
+    assert truncate("abcdef", 0) == "abcdef"
+
+
+def test_sampling_keeps_burst_then_one_in_n():
+    sampler = SamplingFilter(burst=3, every=5)
+    kept = sum(sampler.filter(make_record("hot")) for _ in range(23))
+    # 3 from the burst, then records 8, 13, 18 and 23
+    assert kept == 7
+    # Other call sites and warnings are unaffected
+    assert sampler.filter(make_record("cold", lineno=99))
+    assert all(sampler.filter(make_record("warn", level=logging.WARNING)) for _ in range(10))
+
+
+def test_queue_handler_prepares_truncated_json_record():
+    log_queue = queue.Queue()
+    handler = TruncatingQueueHandler(log_queue, max_chars=20)
+    details = {'Company': 'Acme'}
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("value %s" + "x" * 50, 42, exc_info=sys.exc_info(), job_details=details)
+    handler.handle(record)
+    details['Company'] = 'Changed'
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry['message'].startswith("value 42xxxxxxxxxxxx...")
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'src.test'
+    assert entry['job_details'] == {'Company': 'Acme'}
+    assert 'ValueError: boom' in entry['exception']
+
+
+def test_queue_handler_drops_when_full():
+    handler = TruncatingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.dropped == 1
+
+
+def test_modules_log_under_their_own_names():
+    from src.core import job_parser, pipeline
+
+    assert job_parser.logger.name == 'src.core.job_parser'
+    # A LOG_LEVELS entry for a package applies to the loggers of its modules
+    logging.getLogger('src.core').setLevel(logging.WARNING)
+    try:
+        assert not pipeline.logger.isEnabledFor(logging.INFO)
+        assert pipeline.logger.isEnabledFor(logging.WARNING)
+    finally:
+        logging.getLogger('src.core').setLevel(logging.NOTSET)
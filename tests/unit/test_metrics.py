@@ -0,0 +1,44 @@
+# tests/unit/test_metrics.py
+
+from src.utils.metrics import Metrics
+
+
+def test_counters_and_ratio():
+    metrics = Metrics()
+    metrics.increment("lookups", 4)
+    metrics.increment("hits")
+    assert metrics.counter("hits") == 1
+    assert metrics.ratio("hits", "lookups") == 0.25
+    assert metrics.ratio("hits", "missing") == 0.0
+
+
+def test_timer_records_durations():
+    metrics = Metrics()
+    with metrics.timer("stage"):
+        pass
+    metrics.observe("stage", 2.0)
+    timing = metrics.snapshot()["timings"]["stage"]
+    assert timing["count"] == 2
+    assert timing["max"] == 2.0
+    assert timing["mean"] == timing["total"] / 2
+
+
+def test_reset_clears_everything():
+    metrics = Metrics()
+    metrics.increment("x")
+    metrics.observe("y", 1.0)
+    metrics.reset()
+    assert metrics.snapshot() == {"counters": {}, "timings": {}}
+
+
+def test_merge_adds_another_snapshot():
+    worker = Metrics()
+    worker.increment("pages", 2)
+    worker.observe("parse", 3.0)
+    metrics = Metrics()
+    metrics.increment("pages")
+    metrics.observe("parse", 1.0)
+    metrics.merge(worker.snapshot())
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"pages": 3}
+    assert snapshot["timings"]["parse"] == {"count": 2, "total": 4.0, "max": 3.0, "mean": 2.0}
@@ -0,0 +1,84 @@
+# tests/unit/test_model_router.py
+
+import pytest
+from types import SimpleNamespace
+
+from src.core.model_router import route_completion, routing_stats
+from src.core.rate_governor import RateLimitedError
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.deadline import DeadlineExceeded
+from src.utils.metrics import metrics
+from tests.fake_openai import FakeResponse
+
+
+def fake_client(answers):
+    """Build a client whose create() returns (or raises) the answer for each model."""
+    calls = []
+
+    def create(model, messages, **kwargs):
+        calls.append(model)
+        answer = answers[model]
+        if isinstance(answer, Exception):
+            raise answer
+        return FakeResponse(answer)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client, calls
+
+
+def parse(response):
+    return response.choices[0].message.content
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+
+
+def test_cheap_tier_answer_is_used_when_valid():
+    client, calls = fake_client({"cheap": "good", "strong": "good"})
+    result = route_completion(client, "task", ["cheap", "strong"], [], parse, lambda r: r == "good")
+    assert result == "good"
+    assert calls == ["cheap"]
+    assert routing_stats("task", ["cheap", "strong"])["escalation_rate"] == 0.0
+
+
+def test_invalid_answer_escalates():
+    client, calls = fake_client({"cheap": "bad", "strong": "good"})
+    result = route_completion(client, "task", ["cheap", "strong"], [], parse, lambda r: r == "good")
+    assert result == "good"
+    assert calls == ["cheap", "strong"]
+    stats = routing_stats("task", ["cheap", "strong"])
+    assert stats["escalation_rate"] == 1.0
+    assert stats["tiers"]["cheap"]["rejected"] == 1
+    assert stats["tiers"]["strong"]["calls"] == 1
+
+
+def test_error_escalates_and_last_tier_errors_propagate():
+    client, calls = fake_client({"cheap": RuntimeError("boom"), "strong": "good"})
+    assert route_completion(client, "task", ["cheap", "strong"], [], parse, lambda r: True) == "good"
+    assert routing_stats("task", ["cheap"])["tiers"]["cheap"]["errors"] == 1
+
+    client, _ = fake_client({"only": RuntimeError("down")})
+    with pytest.raises(RuntimeError, match="down"):
+        route_completion(client, "task", ["only"], [], parse, lambda r: True)
+
+
+@pytest.mark.parametrize("error", [
+    DeadlineExceeded("out of time"),
+    CircuitOpenError("openai", 30),
+    RateLimitedError("still limited", 5),
+])
+def test_deadline_breaker_and_rate_limit_errors_do_not_escalate(error):
+    client, calls = fake_client({"cheap": error, "strong": "good"})
+    with pytest.raises(type(error)):
+        route_completion(client, "task", ["cheap", "strong"], [], parse, lambda r: True)
+    assert calls == ["cheap"]
+    stats = routing_stats("task", ["cheap", "strong"])
+    assert stats["escalation_rate"] == 0.0
+    assert stats["tiers"]["cheap"]["errors"] == 1
+
+
+def test_last_tier_answer_returned_even_if_invalid():
+    client, _ = fake_client({"cheap": "bad", "strong": "still bad"})
+    assert route_completion(client, "task", ["cheap", "strong"], [], parse, lambda r: False) == "still bad"
@@ -0,0 +1,119 @@
+# tests/unit/test_model_server.py
+
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from src.core import job_parser, model_server
+from src.core.model_server import ModelClient, ModelServer, ModelServerError, answer_batch, parse_address
+from src.utils import config
+from src.utils.deadline import DeadlineExceeded, request_deadline
+
+
+def fake_answer_batch(questions, contexts, tokenizer, model):
+    if "fail" in questions:
+        raise ValueError("model exploded")
+    model.append(len(questions))
+    return [{"answer": f"{q}:{c}", "confidence": 1.0} for q, c in zip(questions, contexts)]
+
+
+def test_parse_address():
+    assert parse_address("/run/jobglider/model.sock") == "/run/jobglider/model.sock"
+    assert parse_address("model-server:6000") == ("model-server", 6000)
+
+
+def test_answer_batch_reads_each_row():
+    class FakeTokenizer:
+        def __call__(self, questions, contexts, **kwargs):
+            assert kwargs["padding"] is True
+            return {"input_ids": torch.tensor([[1, 2, 3], [4, 5, 6]])}
+
+        def decode(self, ids):
+            return "<s>" + " ".join(str(int(i)) for i in ids) + "</s>"
+
+    def fake_model(input_ids):
+        return SimpleNamespace(start_logits=torch.tensor([[9.0, 0, 0], [0, 0, 9.0]]),
+                               end_logits=torch.tensor([[0, 9.0, 0], [0, 0, 9.0]]))
+
+    answers = answer_batch(["q1", "q2"], ["c1", "c2"], FakeTokenizer(), fake_model)
+    assert [a["answer"] for a in answers] == ["1 2", "6"]
+    assert answers[0]["confidence"] == 18.0
+
+
+def test_server_batches_concurrent_questions(monkeypatch):
+    monkeypatch.setattr(model_server, "answer_batch", fake_answer_batch)
+    batch_sizes = []
+    server = ModelServer("unused.sock", tokenizer=None, model=batch_sizes, max_batch=4, max_wait=0.2)
+    futures = [server.submit(f"q{i}", "ctx") for i in range(6)]
+    results = [future.result(timeout=5) for future in futures]
+    server.close()
+
+    assert [r["answer"] for r in results] == [f"q{i}:ctx" for i in range(6)]
+    assert batch_sizes[0] == 4
+    assert sum(batch_sizes) == 6
+
+
+def test_client_round_trip_over_socket(monkeypatch, tmp_path):
+    monkeypatch.setattr(model_server, "answer_batch", fake_answer_batch)
+    address = str(tmp_path / "model.sock")
+    server = ModelServer(address, tokenizer=None, model=[], max_wait=0.01)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ModelClient(address, timeout=5)
+    try:
+        for _ in range(50):
+            try:
+                assert client.answer("role", "page") == {"answer": "role:page", "confidence": 1.0}
+                break
+            except ModelServerError:
+                threading.Event().wait(0.05)  # server still starting
+        else:
+            pytest.fail("model server did not start")
+        with pytest.raises(ModelServerError, match="model exploded"):
+            client.answer("fail", "page")
+    finally:
+        server.close()
+
+
+def test_client_reports_missing_server(tmp_path):
+    with pytest.raises(ModelServerError, match="Cannot connect"):
+        ModelClient(str(tmp_path / "missing.sock")).answer("q", "c")
+
+
+def test_client_wait_is_bounded_by_the_deadline(tmp_path):
+    from multiprocessing.connection import Listener
+
+    address = str(tmp_path / "silent.sock")
+    listener = Listener(address)
+    connections = []
+    # A server that accepts and reads but never answers
+    threading.Thread(target=lambda: connections.append(listener.accept()), daemon=True).start()
+    client = ModelClient(address, timeout=30)
+    try:
+        with request_deadline(0.2), pytest.raises(DeadlineExceeded):
+            client.answer("q", "c")
+    finally:
+        listener.close()
+
+
+def test_tokenizer_without_pad_token_pads_with_eos(monkeypatch):
+    loaded = SimpleNamespace(pad_token=None, eos_token="</s>")
+    fake_transformers = SimpleNamespace(AutoTokenizer=SimpleNamespace(from_pretrained=lambda model_id: loaded))
+    monkeypatch.setitem(sys.modules, "transformers", fake_transformers)
+    assert config._load_tokenizer().pad_token == "</s>"
+
+
+def test_tcp_address_requires_authkey():
+    with pytest.raises(ValueError):
+        ModelServer(("localhost", 6000), tokenizer=None, model=None)
+
+
+def test_answer_question_uses_model_server(monkeypatch):
+    calls = []
+    fake_client = SimpleNamespace(answer=lambda q, c: calls.append((q, c)) or {"answer": "x", "confidence": 2.0})
+    monkeypatch.setattr(job_parser, "model_client", fake_client)
+    assert job_parser.answer_question("What?", "Context") == {"answer": "x", "confidence": 2.0}
+    assert calls == [("What?", "Context")]
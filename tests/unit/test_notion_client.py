@@ -79,9 +79,24 @@ def test_update_notion_database_success(fake_notion_client, tmp_path):
     parsed = urlparse(folder_uri)
     assert parsed.scheme in ("file",)
 
-def test_update_notion_database_invalid_date(monkeypatch, fake_notion_client, tmp_path, capsys):
+def test_update_notion_database_links_artifact_downloads(monkeypatch, fake_notion_client, tmp_path):
     """
-    When the Application Deadline is invalid, it should be omitted and a warning printed.
+    With ARTIFACT_BASE_URL set, the Word and PDF links point at the server's downloads.
+    """
+    monkeypatch.setattr(notion_client, "ARTIFACT_BASE_URL", "https://jobs.example.org/")
+    job_details = {"Company": "Test Company", "Job URL": "http://example.com"}
+    folder = tmp_path / "cover_letters" / "TestCompany_TestJob_20250101_123456"
+
+    notion_client.update_notion_database("page123", job_details, str(folder),
+                                         str(folder / "cover_letter.docx"), str(folder / "cover_letter.pdf"))
+    properties = fake_notion_client.pages.last_update["properties"]
+    assert properties["Word Document"]["url"] == "https://jobs.example.org/artifacts/page123/docx"
+    assert properties["PDF Document"]["url"] == "https://jobs.example.org/artifacts/page123/pdf"
+    assert properties["Cover Letter Directory"]["url"].startswith("file:")
+
+def test_update_notion_database_invalid_date(monkeypatch, fake_notion_client, tmp_path, caplog):
+    """
+    When the Application Deadline is invalid, it should be omitted and a warning logged.
     """
     job_details = {
         "Company": "Test Company",
@@ -101,8 +116,7 @@ def test_update_notion_database_invalid_date(monkeypatch, fake_notion_client, tm
     properties = update_call["properties"]
     # "Application Deadline" should not be present because date parsing failed.
     assert "Application Deadline" not in properties
-    captured = capsys.readouterr().out
-    assert "Warning: Could not parse Application Deadline as date" in captured
+    assert "Could not parse Application Deadline as date" in caplog.text
 
 def test_update_notion_database_api_error(monkeypatch, fake_notion_client, tmp_path):
     """
@@ -189,3 +203,57 @@ def test_unarchive_page_permission_error(monkeypatch, fake_notion_client):
     monkeypatch.setattr(fake_notion_client.pages, "update", fake_update)
     with pytest.raises(Exception, match="You don't have permission to unarchive page"):
         notion_client.unarchive_page("page123")
+
+
+# ------------------
+# Tests for query_changed_pages and get_page_job_url
+# ------------------
+
+def make_page(page_id, edited, url="https://jobs.example/1"):
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "properties": {"Job URL": {"type": "url", "url": url}},
+    }
+
+def test_query_changed_pages_paginates_from_cursor(fake_notion_client):
+    """
+    query_changed_pages should follow next_cursor until has_more is False and
+    filter on last_edited_time when a cursor timestamp is given.
+    """
+    pages = [make_page(f"p{i}", f"2025-01-01T00:0{i}:00.000Z") for i in range(5)]
+    fake_notion_client.databases.results = pages
+
+    result = list(notion_client.query_changed_pages("db", since="2025-01-01T00:00:00.000Z"))
+
+    assert result == pages
+    queries = fake_notion_client.databases.queries
+    assert [q["start_cursor"] for q in queries] == [None, "2", "4"]
+    conditions = queries[0]["filter"]["and"]
+    assert {"timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": "2025-01-01T00:00:00.000Z"}} in conditions
+    assert queries[0]["sorts"][0]["direction"] == "ascending"
+
+def test_query_changed_pages_without_cursor(fake_notion_client):
+    list(notion_client.query_changed_pages("db"))
+    conditions = fake_notion_client.databases.queries[0]["filter"]["and"]
+    assert all("timestamp" not in condition for condition in conditions)
+
+def test_get_page_job_url():
+    assert notion_client.get_page_job_url(make_page("p", "t", "https://x.example")) == "https://x.example"
+    assert notion_client.get_page_job_url(make_page("p", "t", None)) == ""
+    assert notion_client.get_page_job_url({"properties": {}}) == ""
+
+
+def test_only_server_errors_and_timeouts_count_as_notion_outages():
+    class FakeAPIError(APIResponseError):
+        def __init__(self, status):
+            self.status = status
+
+    class RequestTimeoutError(Exception):
+        pass
+
+    assert notion_client.is_notion_outage(FakeAPIError(502))
+    assert notion_client.is_notion_outage(RequestTimeoutError())
+    assert not notion_client.is_notion_outage(FakeAPIError(404))
+    assert not notion_client.is_notion_outage(ValueError("bad property"))
@@ -0,0 +1,36 @@
+# tests/unit/test_pdf_text.py
+
+import pytest
+from fpdf import FPDF
+
+from src.core.pdf_text import extract_pdf_text
+from src.utils.metrics import metrics
+
+
+def make_pdf(pages):
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=12)
+    for lines in pages:
+        pdf.add_page()
+        for line in lines:
+            pdf.cell(0, 10, line, new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
+
+
+def test_extracts_cleaned_text_from_every_page():
+    content = make_pdf([["Assistant Professor of Biology"], ["Location: Some City"]])
+    assert extract_pdf_text(content, max_chars=10_000) == "Assistant Professor of Biology\nLocation: Some City"
+
+
+def test_stops_reading_pages_once_the_budget_is_filled():
+    content = make_pdf([[f"Page {number} " + "x" * 60] for number in range(10)])
+    before = metrics.counter("pdf.pages")
+    text = extract_pdf_text(content, max_chars=100)
+    assert len(text) == 100
+    assert text.startswith("Page 0")
+    assert metrics.counter("pdf.pages") - before == 2
+
+
+def test_rejects_content_that_is_not_a_pdf():
+    with pytest.raises(Exception):
+        extract_pdf_text(b"<html>not a pdf</html>")
@@ -0,0 +1,169 @@
+# tests/unit/test_pipeline.py
+
+import json
+import threading
+from datetime import date, timedelta
+import pytest
+
+from src.core import pipeline
+from src.core.job_store import JobStore
+from src.core.pipeline import STAGES, CheckpointLog, PipelineJob, parse_job_lines, run_pipeline
+
+
+POSTING_TEXT = " ".join(
+    f"Acme is hiring a data analyst to build reports, model churn and partner with finance team {i}."
+    for i in range(8)
+)
+
+# Page text served for posting URLs; the mirror is the same posting with an aggregator footer
+PAGE_TEXTS = {
+    "https://acme.example/careers/42": POSTING_TEXT,
+    "https://jobs-aggregator.example/view/9913": POSTING_TEXT + " Apply on Jobs Aggregator.",
+}
+
+
+@pytest.fixture
+def stage_calls(monkeypatch):
+    """Replace the pipeline's external calls with fakes that record what ran."""
+    calls = {"extract": [], "generate": [], "save": [], "notion": []}
+    lock = threading.Lock()
+
+    def record(stage, key):
+        with lock:
+            calls[stage].append(key)
+
+    def fake_extract(url, find_duplicate=None):
+        record("extract", url)
+        if find_duplicate is not None:
+            details = find_duplicate(PAGE_TEXTS.get(url.split("?")[0], ""))
+            if details:
+                return details
+        if "broken" in url:
+            raise RuntimeError("page not found")
+        return {"Job Title": "Analyst", "Company": url.rsplit("/", 1)[-1]}
+
+    def fake_generate(job_details):
+        record("generate", job_details["Job URL"])
+        return f"Letter for {job_details['Company']}"
+
+    def fake_save(job_details, cover_letter):
+        record("save", job_details["Job URL"])
+        return f"/out/{job_details['Company']}", "/out/doc.docx", "/out/doc.pdf"
+
+    def fake_update(page_id, job_details, folder_path, doc_path, pdf_path):
+        record("notion", page_id)
+
+    monkeypatch.setattr(pipeline, "extract_job_details", fake_extract)
+    monkeypatch.setattr(pipeline, "generate_cover_letter", fake_generate)
+    monkeypatch.setattr(pipeline, "save_cover_letter_documents", fake_save)
+    monkeypatch.setattr(pipeline, "update_notion_database", fake_update)
+    monkeypatch.setattr(pipeline, "is_page_archived", lambda page_id: False)
+    return calls
+
+
+def test_parse_job_lines():
+    jobs = parse_job_lines([
+        "# comment",
+        "https://a.example/job1 page-1",
+        "",
+        "https://a.example/job2,page-2",
+        "https://a.example/job3",
+        "https://a.example/job1 page-1",
+    ])
+    assert [(job.url, job.page_id) for job in jobs] == [
+        ("https://a.example/job1", "page-1"),
+        ("https://a.example/job2", "page-2"),
+        ("https://a.example/job3", None),
+    ]
+
+
+def test_run_pipeline_processes_every_stage(stage_calls, tmp_path):
+    jobs = [PipelineJob(f"https://a.example/job{i}", f"page-{i}") for i in range(5)]
+    results = run_pipeline(jobs, {"extract": 2, "generate": 3}, CheckpointLog(str(tmp_path / "cp.jsonl")))
+    assert all(job.completed == "notion" and job.error is None for job in results)
+    assert sorted(stage_calls["notion"]) == [f"page-{i}" for i in range(5)]
+    assert results[0].cover_letter == "Letter for job0"
+
+
+def test_run_pipeline_records_failures_and_continues(stage_calls, tmp_path):
+    jobs = [PipelineJob("https://a.example/broken"), PipelineJob("https://a.example/ok")]
+    results = run_pipeline(jobs, checkpoint=CheckpointLog(str(tmp_path / "cp.jsonl")))
+    assert results[0].error == "extract: page not found"
+    assert results[1].completed == "notion"
+    # Jobs without a Notion page skip the update
+    assert stage_calls["notion"] == []
+
+
+def test_run_pipeline_resumes_from_checkpoint(stage_calls, tmp_path):
+    path = tmp_path / "cp.jsonl"
+    done = PipelineJob("https://a.example/done", "page-done")
+    done.job_details = {"Company": "done"}
+    partial = PipelineJob("https://a.example/partial", "page-partial")
+    partial.job_details = {"Company": "partial", "Job URL": partial.url}
+    log = CheckpointLog(str(path))
+    log.record(done, "notion")
+    log.record(partial, "extract")
+    with open(path, "a") as f:
+        f.write('{"key": "truncat')
+
+    results = run_pipeline(
+        [PipelineJob("https://a.example/done", "page-done"), PipelineJob("https://a.example/partial", "page-partial")],
+        checkpoint=CheckpointLog(str(path)),
+    )
+
+    assert stage_calls["extract"] == []
+    assert stage_calls["generate"] == ["https://a.example/partial"]
+    assert stage_calls["notion"] == ["page-partial"]
+    assert all(job.completed == "notion" for job in results)
+    last = [json.loads(line) for line in path.read_text().splitlines()[-1:]]
+    assert last[0]["key"] == "page-partial" and last[0]["stage"] == "notion"
+
+
+def test_run_pipeline_reuses_job_store(stage_calls, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    run_pipeline([PipelineJob("https://a.example/acme?utm_source=x", "page-1")], store=store)
+
+    results = run_pipeline([
+        PipelineJob("https://www.a.example/acme/", "page-1"),
+        PipelineJob("https://a.example/acme", "page-2"),
+    ], store=store)
+
+    # The same posting is extracted, written and saved once; only the new page is updated
+    assert stage_calls["extract"] == ["https://a.example/acme?utm_source=x"]
+    assert stage_calls["generate"] == ["https://a.example/acme?utm_source=x"]
+    assert stage_calls["notion"] == ["page-1", "page-2"]
+    assert all(job.completed == "notion" for job in results)
+    assert results[1].cover_letter == "Letter for acme?utm_source=x"
+    assert store.status_counts() == {"notion:ok": 1}
+
+
+def test_run_pipeline_reuses_near_duplicate_posting(stage_calls, tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    run_pipeline([PipelineJob("https://acme.example/careers/42", "page-1")], store=store)
+
+    results = run_pipeline([PipelineJob("https://jobs-aggregator.example/view/9913", "page-2")], store=store)
+
+    # The mirror is fetched and fingerprinted but not written or rendered again
+    assert stage_calls["extract"] == ["https://acme.example/careers/42", "https://jobs-aggregator.example/view/9913"]
+    assert stage_calls["generate"] == ["https://acme.example/careers/42"]
+    assert stage_calls["save"] == ["https://acme.example/careers/42"]
+    assert stage_calls["notion"] == ["page-1", "page-2"]
+    mirror = results[0]
+    assert mirror.completed == "notion"
+    assert mirror.job_details["Job URL"] == "https://jobs-aggregator.example/view/9913"
+    assert mirror.cover_letter == "Letter for 42"
+    assert store.find_by_url(mirror.url)["signature"] == mirror.signature
+
+
+def test_run_pipeline_runs_urgent_jobs_first(stage_calls):
+    today = date.today()
+    jobs = [
+        PipelineJob("https://a.example/later", "page-later", deadline=today + timedelta(days=60)),
+        PipelineJob("https://a.example/open", "page-open"),
+        PipelineJob("https://a.example/soon", "page-soon", deadline=today + timedelta(days=1)),
+        PipelineJob("https://a.example/flagged", "page-flagged", priority=2),
+    ]
+    run_pipeline(jobs, concurrency={stage: 1 for stage in STAGES})
+    assert stage_calls["extract"] == [
+        "https://a.example/flagged", "https://a.example/soon", "https://a.example/open", "https://a.example/later",
+    ]
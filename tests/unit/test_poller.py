@@ -0,0 +1,104 @@
+# tests/unit/test_poller.py
+
+import json
+from datetime import date
+import pytest
+
+from src.core import poller
+from src.core.poller import CursorStore, poll_once
+
+
+def make_page(page_id, edited, url=None):
+    url = f"https://jobs.example/{page_id}" if url is None else url
+    return {"id": page_id, "last_edited_time": edited, "properties": {"Job URL": {"url": url}}}
+
+
+@pytest.fixture
+def pipeline_batches(monkeypatch):
+    """Record the batches handed to the pipeline instead of running it."""
+    batches = []
+
+    def fake_run_pipeline(jobs, concurrency=None, checkpoint=None, store=None):
+        batches.append([(job.url, job.page_id) for job in jobs])
+        return jobs
+
+    monkeypatch.setattr(poller, "run_pipeline", fake_run_pipeline)
+    return batches
+
+
+def test_poll_once_batches_rows_and_saves_cursor(fake_notion_client, pipeline_batches, tmp_path):
+    fake_notion_client.databases.results = [
+        make_page("a", "2025-01-01T00:00:00.000Z"),
+        make_page("b", "2025-01-01T00:01:00.000Z"),
+        make_page("no-url", "2025-01-01T00:01:00.000Z", url=""),
+        make_page("c", "2025-01-01T00:02:00.000Z"),
+    ]
+    cursor = CursorStore(str(tmp_path / "cursor.json"))
+
+    jobs = poll_once("db", cursor, batch_size=2)
+
+    assert pipeline_batches == [
+        [("https://jobs.example/a", "a"), ("https://jobs.example/b", "b")],
+        [("https://jobs.example/c", "c")],
+    ]
+    assert len(jobs) == 3
+    saved = json.loads((tmp_path / "cursor.json").read_text())
+    assert saved == {"last_edited_time": "2025-01-01T00:02:00.000Z", "seen": ["c"]}
+
+
+def test_poll_once_resumes_without_reprocessing(fake_notion_client, pipeline_batches, tmp_path):
+    path = tmp_path / "cursor.json"
+    path.write_text(json.dumps({"last_edited_time": "2025-01-01T00:02:00.000Z", "seen": ["c"]}))
+    # Notion returns rows edited at the cursor minute again; only the unseen one is new
+    fake_notion_client.databases.results = [
+        make_page("c", "2025-01-01T00:02:00.000Z"),
+        make_page("d", "2025-01-01T00:02:00.000Z"),
+    ]
+    cursor = CursorStore(str(path))
+
+    poll_once("db", cursor, batch_size=10)
+
+    assert fake_notion_client.databases.queries[0]["filter"]["and"][-1]["last_edited_time"] == {
+        "on_or_after": "2025-01-01T00:02:00.000Z"
+    }
+    assert pipeline_batches == [[("https://jobs.example/d", "d")]]
+    assert CursorStore(str(path)).seen == ["c", "d"]
+
+
+def test_poll_once_passes_priority_and_deadline(fake_notion_client, monkeypatch, tmp_path):
+    page = make_page("a", "2025-01-01T00:00:00.000Z")
+    page["properties"]["Priority"] = {"type": "select", "select": {"name": "High"}}
+    page["properties"]["Application Deadline"] = {"type": "date", "date": {"start": "2025-02-01"}}
+    fake_notion_client.databases.results = [page]
+    seen = []
+    monkeypatch.setattr(poller, "run_pipeline",
+                        lambda jobs, *args: seen.extend((job.priority, job.deadline) for job in jobs) or jobs)
+
+    poll_once("db", CursorStore(str(tmp_path / "cursor.json")))
+
+    assert seen == [(1, date(2025, 2, 1))]
+
+
+def test_poll_once_keeps_cursor_at_oldest_failed_row(fake_notion_client, monkeypatch, tmp_path):
+    fake_notion_client.databases.results = [
+        make_page("a", "2025-01-01T00:00:00.000Z"),
+        make_page("b", "2025-01-01T00:01:00.000Z"),
+        make_page("c", "2025-01-01T00:02:00.000Z"),
+        make_page("d", "2025-01-01T00:03:00.000Z"),
+    ]
+
+    def fake_run_pipeline(jobs, concurrency=None, checkpoint=None, store=None):
+        for job in jobs:
+            job.error = "fetch failed" if job.page_id == "b" else None
+        return jobs
+
+    monkeypatch.setattr(poller, "run_pipeline", fake_run_pipeline)
+    path = tmp_path / "cursor.json"
+
+    jobs = poll_once("db", CursorStore(str(path)), batch_size=2)
+
+    # Later batches run, but the cursor stays before the failed row so the next poll returns it
+    assert [job.page_id for job in jobs] == ["a", "b", "c", "d"]
+    cursor = CursorStore(str(path))
+    assert (cursor.since, cursor.seen) == ("2025-01-01T00:00:00.000Z", ["a"])
+    assert cursor.is_new(make_page("b", "2025-01-01T00:01:00.000Z"))
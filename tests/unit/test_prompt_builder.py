@@ -0,0 +1,108 @@
+# tests/unit/test_prompt_builder.py
+
+import sys
+
+from src.core.prompt_builder import (
+    JOB_DETAIL_FIELDS,
+    build_extraction_prompt,
+    count_tokens,
+    openai_tokenizer,
+    output_token_limit,
+    select_sections,
+    split_sections,
+)
+
+
+class FakeWordTokenizer:
+    """Tokenizer stub that counts whitespace-delimited words as tokens."""
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+        import re
+        offsets = [m.span() for m in re.finditer(r"\S+", text)]
+        return {"input_ids": list(range(len(offsets))), "offset_mapping": offsets}
+
+
+class FakeByteEncoding:
+    """tiktoken encoding stub with one token per UTF-8 byte."""
+
+    def encode_ordinary(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode_bytes(self, tokens):
+        return bytes(tokens)
+
+
+PAGE_TEXT = "\n".join([
+    "Senior Developer",
+    "ACME Corp",
+    "Our Culture",
+    "We love ping pong and free snacks every single day of the week.",
+    "Requirements:",
+    "Five years of experience with Python.",
+    "Compensation:",
+    "Salary range $100,000 - $120,000 per year.",
+    "Location:",
+    "Remote within the US.",
+])
+
+
+def test_count_tokens_uses_tokenizer():
+    assert count_tokens("one two three", FakeWordTokenizer()) == 3
+    assert count_tokens("", FakeWordTokenizer()) == 0
+
+
+def test_count_tokens_approximates_without_tokenizer():
+    assert count_tokens("abcdefgh") == 2
+
+
+def test_count_tokens_uses_tiktoken_encoding():
+    assert count_tokens("café", FakeByteEncoding()) == 5
+
+
+def test_openai_tokenizer_falls_back_without_tiktoken(monkeypatch):
+    openai_tokenizer.cache_clear()
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+    try:
+        assert openai_tokenizer("gpt-4o-mini") is None
+    finally:
+        openai_tokenizer.cache_clear()
+
+
+def test_select_sections_truncates_with_tiktoken_encoding():
+    # A single oversized section is cut at a token boundary, never inside a character
+    selected = select_sections("é" * 10, 5, FakeByteEncoding())
+    assert selected == "é" * 2
+
+
+def test_split_sections_starts_at_headings():
+    sections = [PAGE_TEXT[start:end] for start, end in split_sections(PAGE_TEXT)]
+    assert sections[0].startswith("Senior Developer")
+    assert any(section.startswith("Compensation:") for section in sections)
+    assert "".join(sections).replace("\n", "") == PAGE_TEXT.replace("\n", "")
+
+
+def test_select_sections_returns_whole_text_within_budget():
+    assert select_sections(PAGE_TEXT, 1000, FakeWordTokenizer()) == PAGE_TEXT
+
+
+def test_select_sections_drops_least_relevant_sections():
+    selected = select_sections(PAGE_TEXT, 25, FakeWordTokenizer())
+    assert count_tokens(selected, FakeWordTokenizer()) <= 25
+    assert "Senior Developer" in selected
+    assert "$100,000" in selected
+    assert "ping pong" not in selected
+    # Sections keep their page order
+    assert selected.index("Requirements:") < selected.index("Compensation:")
+
+
+def test_output_token_limit_scales_with_fields():
+    assert output_token_limit(["Company"]) < output_token_limit(JOB_DETAIL_FIELDS)
+
+
+def test_build_extraction_prompt_lists_only_requested_fields():
+    prompt = build_extraction_prompt("https://example.com/job", PAGE_TEXT, 1000,
+                                     fields=["Company", "Salary Range"])
+    assert "https://example.com/job" in prompt
+    assert "Company: [extracted company name]" in prompt
+    assert "Job Title:" not in prompt
+    assert "Senior Developer" in prompt
@@ -0,0 +1,44 @@
+# tests/unit/test_prompts.py
+
+import json
+
+from src.core.prompts import (
+    build_cover_letter_messages,
+    cover_letter_system_prompt,
+    load_candidate_profile,
+)
+
+
+def write_profile(path, **overrides):
+    profile = dict(load_candidate_profile(), **overrides)
+    path.write_text(json.dumps(profile))
+    return str(path)
+
+
+def test_default_profile_has_letterhead_and_biography():
+    profile = load_candidate_profile()
+    assert profile["first_name"] == "David"
+    assert "Chapman University" in profile["biography"]
+
+
+def test_system_prompt_is_byte_stable_and_job_independent(dummy_job_details):
+    first = build_cover_letter_messages(dummy_job_details)
+    second = build_cover_letter_messages(dict(dummy_job_details, Company="Other Corp"))
+    assert first[0] == second[0]
+    assert first[0]["role"] == "system"
+    assert "Guidelines:" in first[0]["content"]
+    assert dummy_job_details["Company"] not in first[0]["content"]
+    assert "Other Corp" in second[1]["content"]
+
+
+def test_user_prompt_defaults_for_missing_fields():
+    messages = build_cover_letter_messages({})
+    assert "Job Title: Unknown Position" in messages[1]["content"]
+    assert "Salary Range: N/A" in messages[1]["content"]
+
+
+def test_profiles_share_one_process(tmp_path):
+    other = write_profile(tmp_path / "other.json", biography="Jane Doe is a data engineer.")
+    assert "Jane Doe" in cover_letter_system_prompt(other)
+    assert "Jane Doe" not in cover_letter_system_prompt()
+    assert load_candidate_profile(other) is load_candidate_profile(other)
@@ -0,0 +1,171 @@
+# tests/unit/test_rate_governor.py
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.rate_governor import RateGovernor, RateLimitedError, estimate_tokens, parse_duration
+from src.utils.deadline import DeadlineExceeded, request_deadline
+from tests.fake_openai import FakeResponse
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def fake_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_parse_duration():
+    assert parse_duration("1s") == 1.0
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_duration("7") == 7.0
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+
+def test_estimate_tokens_counts_prompt_and_completion():
+    assert estimate_tokens([{"role": "user", "content": "x" * 40}], max_tokens=100) == 110
+
+
+def test_success_grows_concurrency_and_rate_limit_halves_it():
+    answers = [FakeAPIError(429, {"retry-after-ms": "10"}), FakeResponse("ok")]
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs["model"])
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    governor = RateGovernor(initial_concurrency=8, max_concurrency=16)
+    start = time.monotonic()
+    response = governor.create(fake_client(create), model="m", messages=[])
+
+    assert response.choices[0].message.content == "ok"
+    assert calls == ["m", "m"]
+    assert time.monotonic() - start >= 0.01  # waited for the retry hint
+    assert governor.limit == pytest.approx(4 + 1 / 4)
+    assert governor.in_flight == 0
+
+
+def test_persistent_rate_limit_raises_after_retries():
+    def create(**kwargs):
+        raise FakeAPIError(429, {"retry-after-ms": "1"})
+
+    governor = RateGovernor(initial_concurrency=4, max_retries=2)
+    with pytest.raises(RateLimitedError) as excinfo:
+        governor.create(fake_client(create), model="m", messages=[])
+    assert excinfo.value.retry_after == pytest.approx(0.001)
+    assert governor.limit == 1.0
+
+
+def test_other_errors_propagate_without_retry():
+    calls = []
+
+    def create(**kwargs):
+        calls.append(1)
+        raise FakeAPIError(400)
+
+    governor = RateGovernor(initial_concurrency=4)
+    with pytest.raises(FakeAPIError):
+        governor.create(fake_client(create), model="m", messages=[])
+    assert calls == [1]
+    assert governor.limit == 4.0
+    assert governor.in_flight == 0
+
+
+def test_callers_queue_for_a_concurrency_slot():
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def create(**kwargs):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+        return FakeResponse("ok")
+
+    governor = RateGovernor(initial_concurrency=2, max_concurrency=2)
+    threads = [threading.Thread(target=governor.create, args=(fake_client(create),), kwargs={"messages": []})
+               for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(peak) == 6
+    assert max(peak) == 2
+
+
+def test_reported_budget_delays_next_request():
+    class Completions:
+        @property
+        def with_raw_response(self):
+            headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "50ms",
+                       "x-ratelimit-remaining-tokens": "90000", "x-ratelimit-reset-tokens": "1s"}
+            return SimpleNamespace(create=lambda **kwargs: SimpleNamespace(
+                parse=lambda: FakeResponse("ok"), headers=headers))
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+    governor = RateGovernor()
+    governor.create(client, messages=[])
+    start = time.monotonic()
+    governor.create(client, messages=[])
+    assert time.monotonic() - start >= 0.04
+
+
+def test_request_timeout_is_cut_to_the_deadline():
+    timeouts = []
+
+    def create(**kwargs):
+        timeouts.append(kwargs["timeout"])
+        return FakeResponse("ok")
+
+    with request_deadline(5):
+        RateGovernor().create(fake_client(create), messages=[])
+    assert 4 < timeouts[0] <= 5
+
+
+def test_retry_pause_past_the_deadline_gives_up():
+    calls = []
+
+    def create(**kwargs):
+        calls.append(1)
+        raise FakeAPIError(429, {"retry-after": "30"})
+
+    with request_deadline(1), pytest.raises(RateLimitedError):
+        RateGovernor(max_retries=5).create(fake_client(create), messages=[])
+    assert len(calls) == 1
+
+
+def test_queued_request_stops_at_the_deadline():
+    governor = RateGovernor(initial_concurrency=1, max_concurrency=1)
+    governor.in_flight = 1
+    with request_deadline(0.05), pytest.raises(DeadlineExceeded):
+        governor.create(fake_client(lambda **kwargs: FakeResponse("ok")), messages=[])
+
+
+def test_window_counts_actual_usage_once_the_response_arrives():
+    def create(**kwargs):
+        response = FakeResponse("ok")
+        response.usage = SimpleNamespace(total_tokens=50)
+        return response
+
+    governor = RateGovernor(tokens_per_minute=1000, requests_per_minute=0)
+    governor.create(fake_client(create), messages=[], max_tokens=900)
+    assert [tokens for _, tokens in governor._window] == [50]
+    # With only the estimate counted this request would wait out the minute
+    with request_deadline(1):
+        governor.create(fake_client(create), messages=[], max_tokens=900)
@@ -0,0 +1,76 @@
+# tests/unit/test_scheduler.py
+
+from datetime import date, timedelta
+
+from src.core.pipeline import PipelineJob
+from src.core.scheduler import DAY_SECONDS, DeadlineQueue, parse_priority, schedule_key
+
+NOW = 1_700_000_000.0
+
+
+def make_job(name, deadline=None, priority=0, queued_at=NOW, details_deadline=None):
+    job = PipelineJob(f"https://jobs.example/{name}", priority=priority, deadline=deadline)
+    job.queued_at = queued_at
+    if details_deadline is not None:
+        job.job_details = {"Application Deadline": details_deadline}
+    return job
+
+
+def drain(jobs):
+    work = DeadlineQueue()
+    for job in jobs:
+        work.put(job)
+    work.put(None)
+    order = []
+    while (job := work.get()) is not None:
+        order.append(job.url.rsplit("/", 1)[-1])
+    return order
+
+
+def test_parse_priority():
+    assert parse_priority("High") == 1
+    assert parse_priority(" urgent ") == 2
+    assert parse_priority(3) == 3
+    assert parse_priority(None) == 0
+    assert parse_priority("Whenever") == 0
+
+
+def test_sooner_deadline_runs_first():
+    today = date.fromtimestamp(NOW)
+    jobs = [
+        make_job("two-months", deadline=today + timedelta(days=60)),
+        make_job("none"),
+        make_job("tomorrow", deadline=today + timedelta(days=1)),
+        make_job("extracted", details_deadline=(today + timedelta(days=5)).isoformat()),
+    ]
+    assert drain(jobs) == ["tomorrow", "extracted", "none", "two-months"]
+
+
+def test_priority_moves_job_forward():
+    today = date.fromtimestamp(NOW)
+    assert drain([
+        make_job("normal", deadline=today + timedelta(days=3)),
+        make_job("high", deadline=today + timedelta(days=8), priority=1),
+    ]) == ["high", "normal"]
+
+
+def test_waiting_jobs_age_ahead_of_newer_urgent_ones():
+    today = date.fromtimestamp(NOW)
+    old = make_job("old", queued_at=NOW - 2 * DAY_SECONDS)
+    new = make_job("new", deadline=today + timedelta(days=2), queued_at=NOW)
+    assert drain([new, old]) == ["old", "new"]
+    # Without the wait, the deadline wins
+    old.queued_at = NOW
+    assert drain([new, old]) == ["new", "old"]
+
+
+def test_urgent_jobs_preempt_everything():
+    today = date.fromtimestamp(NOW)
+    urgent = make_job("urgent", priority=2)
+    overdue = make_job("overdue", deadline=today - timedelta(days=10), queued_at=NOW - 30 * DAY_SECONDS)
+    assert schedule_key(urgent)[0] == 0
+    assert drain([overdue, urgent]) == ["urgent", "overdue"]
+
+
+def test_equal_keys_keep_arrival_order():
+    assert drain([make_job("a"), make_job("b"), make_job("c")]) == ["a", "b", "c"]
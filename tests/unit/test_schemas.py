@@ -0,0 +1,39 @@
+# tests/unit/test_schemas.py
+
+import json
+import pytest
+from pydantic import ValidationError
+
+from src.core.schemas import (
+    job_details_model,
+    job_details_response_format,
+    parse_job_details_json,
+)
+
+
+def test_response_format_is_strict_json_schema():
+    response_format = job_details_response_format(["Job Title", "Company"])
+    schema = response_format["json_schema"]["schema"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    assert set(schema["required"]) == {"job_title", "company"}
+    assert schema["additionalProperties"] is False
+
+
+def test_job_details_model_is_cached_per_field_set():
+    assert job_details_model(("Company",)) is job_details_model(("Company",))
+
+
+def test_parse_job_details_json_maps_display_keys():
+    content = json.dumps({"job_title": " Senior Developer ", "company": "ACME Corp"})
+    details = parse_job_details_json(content, ["Job Title", "Company"])
+    assert details == {"Job Title": "Senior Developer", "Company": "ACME Corp"}
+
+
+def test_parse_job_details_json_rejects_missing_and_extra_fields():
+    with pytest.raises(ValidationError):
+        parse_job_details_json(json.dumps({"job_title": "Dev"}), ["Job Title", "Company"])
+    with pytest.raises(ValidationError):
+        parse_job_details_json(json.dumps({"company": "ACME", "notes": "x"}), ["Company"])
+    with pytest.raises(ValidationError):
+        parse_job_details_json("Company: ACME", ["Company"])
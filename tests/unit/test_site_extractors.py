@@ -0,0 +1,65 @@
+# tests/unit/test_site_extractors.py
+
+from bs4 import BeautifulSoup
+
+from src.core.site_extractors import (
+    SiteExtractor,
+    extract_site_job_details,
+    get_site_extractor,
+    site_extractor_stats,
+)
+from src.utils.metrics import metrics
+
+GREENHOUSE_HTML = """
+<div id="header">
+  <h1 class="app-title">Quantitative Researcher</h1>
+  <span class="company-name">at ACME Capital</span>
+  <div class="location">New York, NY</div>
+</div>
+"""
+
+
+def test_get_site_extractor_matches_host_and_subdomains():
+    assert get_site_extractor("https://boards.greenhouse.io/acme/jobs/1").name == "greenhouse"
+    assert get_site_extractor("https://www.linkedin.com/jobs/view/123").name == "linkedin"
+    assert get_site_extractor("https://acme.wd5.myworkdayjobs.com/en-US/jobs/job/1").name == "workday"
+    assert get_site_extractor("https://example.com/careers/1") is None
+    assert get_site_extractor("https://notgreenhouse.io/job") is None
+
+
+def test_greenhouse_extractor_applies_transforms():
+    details = extract_site_job_details("https://boards.greenhouse.io/acme/jobs/1",
+                                       BeautifulSoup(GREENHOUSE_HTML, "html.parser"))
+    assert details == {
+        "Job Title": "Quantitative Researcher",
+        "Company": "ACME Capital",
+        "Location": "New York, NY",
+    }
+
+
+def test_extractor_uses_first_matching_rule_and_attributes():
+    extractor = SiteExtractor("test", ["example.com"], {
+        "Job Title": ["h1.missing", "h2.title"],
+        "Company": [("img.logo", "alt")],
+    })
+    soup = BeautifulSoup('<h2 class="title"> Data  Analyst </h2><img class="logo" alt="ACME">', "html.parser")
+    assert extractor.extract(soup) == {"Job Title": "Data Analyst", "Company": "ACME"}
+
+
+def test_academic_extractors_ignore_bare_headings():
+    # Headings outside the posting markup (site banners, sidebars) must not fill fields
+    soup = BeautifulSoup("<h1>HigherEdJobs</h1><h2>Featured Employers</h2><h3><a>Sponsored</a></h3>",
+                         "html.parser")
+    assert extract_site_job_details("https://www.higheredjobs.com/details.cfm?JobCode=1", soup) == {}
+    assert extract_site_job_details("https://academicjobsonline.org/ajo/jobs/1", soup) == {}
+
+
+def test_site_extractor_stats_report_coverage():
+    metrics.reset()
+    soup = BeautifulSoup(GREENHOUSE_HTML, "html.parser")
+    extract_site_job_details("https://boards.greenhouse.io/acme/jobs/1", soup)
+    extract_site_job_details("https://example.com/unknown", soup)
+    stats = site_extractor_stats()
+    assert list(stats) == ["greenhouse"]
+    assert stats["greenhouse"]["calls"] == 1
+    assert stats["greenhouse"]["coverage"] == 3 / 6
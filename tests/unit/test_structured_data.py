@@ -0,0 +1,94 @@
+# tests/unit/test_structured_data.py
+
+import json
+from bs4 import BeautifulSoup
+
+from src.core.structured_data import (
+    extract_json_ld,
+    extract_microdata,
+    extract_open_graph,
+    extract_structured_job_details,
+    job_posting_to_details,
+)
+
+JOB_POSTING = {
+    "@context": "https://schema.org/",
+    "@type": "JobPosting",
+    "title": "Assistant Professor of Finance",
+    "hiringOrganization": {"@type": "Organization", "name": "Example University"},
+    "jobLocation": {
+        "@type": "Place",
+        "address": {"@type": "PostalAddress", "addressLocality": "Orange", "addressRegion": "CA", "addressCountry": "US"},
+    },
+    "validThrough": "2025-03-01T23:59:00-08:00",
+    "baseSalary": {
+        "@type": "MonetaryAmount",
+        "currency": "USD",
+        "value": {"@type": "QuantitativeValue", "minValue": 150000, "maxValue": 180000, "unitText": "YEAR"},
+    },
+}
+
+
+def soup_for(html):
+    return BeautifulSoup(html, "html.parser")
+
+
+def test_job_posting_to_details_maps_all_fields():
+    details = job_posting_to_details(JOB_POSTING)
+    assert details == {
+        "Job Title": "Assistant Professor of Finance",
+        "Company": "Example University",
+        "Location": "Orange, CA, US",
+        "Application Deadline": "2025-03-01",
+        "Salary Range": "$150,000 - $180,000 per year",
+    }
+
+
+def test_extract_json_ld_finds_postings_in_graph():
+    html = '<script type="application/ld+json">%s</script>' % json.dumps(
+        {"@graph": [{"@type": "WebPage"}, JOB_POSTING]}
+    )
+    assert extract_json_ld(soup_for(html)) == [JOB_POSTING]
+
+
+def test_extract_json_ld_skips_malformed_blocks():
+    html = '<script type="application/ld+json">{not json</script>'
+    assert extract_json_ld(soup_for(html)) == []
+
+
+def test_extract_microdata_reads_nested_items():
+    html = """
+    <div itemscope itemtype="https://schema.org/JobPosting">
+      <h1 itemprop="title">Data Scientist</h1>
+      <div itemprop="hiringOrganization" itemscope itemtype="https://schema.org/Organization">
+        <span itemprop="name">ACME Corp</span>
+      </div>
+      <div itemprop="jobLocation" itemscope itemtype="https://schema.org/Place">
+        <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
+          <span itemprop="addressLocality">Boston</span>, <span itemprop="addressRegion">MA</span>
+        </div>
+      </div>
+      <meta itemprop="validThrough" content="2025-06-30">
+    </div>
+    """
+    postings = extract_microdata(soup_for(html))
+    assert job_posting_to_details(postings[0]) == {
+        "Job Title": "Data Scientist",
+        "Company": "ACME Corp",
+        "Location": "Boston, MA",
+        "Application Deadline": "2025-06-30",
+    }
+
+
+def test_extract_open_graph():
+    html = '<meta property="og:title" content="Data Scientist"><meta property="og:site_name" content="ACME">'
+    assert extract_open_graph(soup_for(html)) == {"Job Title": "Data Scientist", "Company": "ACME"}
+
+
+def test_extract_structured_job_details_prefers_json_ld():
+    html = """
+    <script type="application/ld+json">%s</script>
+    <div itemscope itemtype="http://schema.org/JobPosting"><span itemprop="title">Other Title</span></div>
+    """ % json.dumps(JOB_POSTING)
+    details = extract_structured_job_details(soup_for(html))
+    assert details["Job Title"] == "Assistant Professor of Finance"
@@ -1,10 +1,16 @@
+import pytest
+
 from src.utils.text_processing import (
     expand_job_title_acronyms,
     split_text,
+    iter_token_spans,
+    iter_text_chunks,
     escape_latex,
     clean_job_title,
-    clean_text
+    clean_text,
+    parse_application_deadline,
 )
+from datetime import date
 
 def test_expand_job_title_acronyms_single():
     # unit
@@ -54,6 +60,59 @@ def test_split_text_long_text():
     assert chunks[1] == " ".join(f"word{i}" for i in range(8, 18))   # words8..17
     assert chunks[2] == " ".join(f"word{i}" for i in range(15, 21))  # words15..20
 
+class FakeCharTokenizer:
+    """Tokenizer stub that treats every non-space character as one token."""
+
+    def __call__(self, text, add_special_tokens=True, return_offsets_mapping=False):
+        offsets = [(i, i + 1) for i, char in enumerate(text) if not char.isspace()]
+        return {"input_ids": list(range(len(offsets))), "offset_mapping": offsets}
+
+def test_iter_token_spans_index_original_text():
+    # unit
+    text = "alpha  beta\ngamma delta epsilon"
+    spans = list(iter_token_spans(text, max_tokens=3, stride=1))
+    assert spans == [(0, 17), (12, 31)]
+    assert text[spans[0][0]:spans[0][1]] == "alpha  beta\ngamma"
+
+def test_iter_token_spans_uses_tokenizer_budget():
+    # unit
+    text = "abcdefghij"
+    spans = list(iter_token_spans(text, max_tokens=4, stride=2, tokenizer=FakeCharTokenizer()))
+    assert spans == [(0, 4), (2, 6), (4, 8), (6, 10)]
+    assert all(end - start <= 4 for start, end in spans)
+
+def test_iter_token_spans_consumes_offsets_lazily(monkeypatch):
+    # unit
+    from src.utils import text_processing
+    consumed = []
+    real_word_offsets = text_processing._word_offsets
+
+    def counting_word_offsets(text):
+        for offset in real_word_offsets(text):
+            consumed.append(offset)
+            yield offset
+
+    monkeypatch.setattr(text_processing, "_word_offsets", counting_word_offsets)
+    spans = iter_token_spans("word " * 10000, max_tokens=4, stride=1)
+    assert next(spans) == (0, 19)
+    # Only the first span's tokens have been read
+    assert len(consumed) == 4
+
+def test_iter_token_spans_empty_text():
+    # unit
+    assert list(iter_token_spans("   ", max_tokens=4, stride=1)) == []
+
+def test_iter_token_spans_rejects_stride_not_below_max():
+    # unit
+    with pytest.raises(ValueError):
+        list(iter_token_spans("a b c", max_tokens=2, stride=2))
+
+def test_iter_text_chunks_is_lazy():
+    # unit
+    chunks = iter_text_chunks("one two three four", max_tokens=2, stride=0)
+    assert next(chunks) == "one two"
+    assert list(chunks) == ["three four"]
+
 def test_escape_latex_no_special_chars():
     # unit
     text = "Hello World"
@@ -105,4 +164,11 @@ def test_clean_text_regular_text():
     # unit
     text = "Just normal text with spaces   and tabs\t"
     cleaned = clean_text(text)
-    assert cleaned == "Just normal text with spaces and tabs"
\ No newline at end of file
+    assert cleaned == "Just normal text with spaces and tabs"
+
+def test_parse_application_deadline():
+    # unit
+    assert parse_application_deadline("March 1, 2025") == date(2025, 3, 1)
+    assert parse_application_deadline("2025-03-01") == date(2025, 3, 1)
+    assert parse_application_deadline("Open until filled") is None
+    assert parse_application_deadline("") is None